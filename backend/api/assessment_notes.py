@@ -1,21 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Response
 from sqlalchemy.orm import Session
 from backend.config import get_db
+from backend.services.note_batch_service import NoteBatchService
+from backend.services.note_update_service import NoteUpdateService, StaleNoteError
 from backend.services.assessment_note_service import AssessmentNoteService
-from backend.schemas.assessment_note import AssessmentNoteCreate, AssessmentNoteUpdate, AssessmentNoteResponse
-from typing import List
+from backend.schemas.assessment_note import AssessmentNoteCreate, AssessmentNoteUpdate, AssessmentNoteResponse, AssessmentNoteBatchUpdate
+from backend.schemas.note_batch import NotePaidUpdate, NotePaidResult
+from typing import List, Optional
 
 router = APIRouter()
+MAX_BATCH_SIZE = NoteBatchService.MAX_BATCH_SIZE
 
 @router.get("/client/{client_id}", response_model=List[AssessmentNoteResponse])
 def get_assessments(client_id: int, db: Session = Depends(get_db)):
     return AssessmentNoteService.get_client_assessments(db, client_id)
 
+@router.post("/batch", response_model=List[AssessmentNoteResponse])
+def create_assessments_batch(
+    notes: List[AssessmentNoteCreate] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE),
+    db: Session = Depends(get_db)
+):
+    try:
+        return AssessmentNoteService.create_assessments(db, notes)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+@router.put("/batch", response_model=List[AssessmentNoteResponse])
+def update_assessments_batch(
+    updates: List[AssessmentNoteBatchUpdate] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE),
+    db: Session = Depends(get_db)
+):
+    try:
+        return AssessmentNoteService.update_assessments(db, updates)
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+@router.post("/mark-paid", response_model=NotePaidResult)
+def mark_assessments_paid(request: NotePaidUpdate, db: Session = Depends(get_db)):
+    return {"updated": AssessmentNoteService.set_assessments_paid(db, request.ids, request.is_paid)}
+
 @router.get("/{assessment_id}", response_model=AssessmentNoteResponse)
-def get_assessment(assessment_id: int, db: Session = Depends(get_db)):
+def get_assessment(assessment_id: int, response: Response, db: Session = Depends(get_db)):
     note = AssessmentNoteService.get_assessment_by_id(db, assessment_id)
     if not note:
         raise HTTPException(status_code=404, detail="Assessment not found")
+    response.headers["ETag"] = NoteUpdateService.etag(note.version)
     return note
 
 @router.post("/", response_model=AssessmentNoteResponse)
@@ -23,10 +54,23 @@ def create_assessment(note: AssessmentNoteCreate, db: Session = Depends(get_db))
     return AssessmentNoteService.create_assessment(db, note)
 
 @router.put("/{assessment_id}", response_model=AssessmentNoteResponse)
-def update_assessment(assessment_id: int, update: AssessmentNoteUpdate, db: Session = Depends(get_db)):
-    note = AssessmentNoteService.update_assessment(db, assessment_id, update)
+def update_assessment(
+    assessment_id: int,
+    update: AssessmentNoteUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None, description="ETag of the version being edited; 409 if it is stale"),
+    db: Session = Depends(get_db)
+):
+    try:
+        expected_version = NoteUpdateService.parse_if_match(if_match)
+        note = AssessmentNoteService.update_assessment(db, assessment_id, update, expected_version)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except StaleNoteError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
     if not note:
         raise HTTPException(status_code=404, detail="Assessment not found")
+    response.headers["ETag"] = NoteUpdateService.etag(note.version)
     return note
 
 @router.delete("/{assessment_id}")
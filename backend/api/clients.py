@@ -5,13 +5,22 @@ This module defines the FastAPI routes for CRUD operations on clients,
 including listing, creating, retrieving, updating, deleting,
 and managing the archive status of clients.
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from backend.config import get_db
 from backend.services.client_service import ClientService
-from backend.schemas.client import ClientCreate, ClientUpdate, ClientResponse
-from typing import List
-from pydantic import BaseModel
+from backend.services.client_import_service import ClientImportService
+from backend.services.note_batch_service import NoteBatchService
+from backend.services.client_stats_service import ClientStatsService
+from backend.models.client import ClientStatus
+from backend.schemas.client import (
+    ClientCreate, ClientUpdate, ClientResponse, ClientSummary, ClientOverview, ClientImportResult
+)
+from typing import List, Optional
+from datetime import date
+from pydantic import BaseModel, Field
 from backend import constants # Import constants
 
 router = APIRouter()
@@ -20,20 +29,207 @@ class ArchiveRequest(BaseModel):
     """Request model for archiving or unarchiving a client."""
     archive: bool
 
+class MarkPaidRequest(BaseModel):
+    """Request model for marking the notes of many clients as paid."""
+    client_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    start: Optional[date] = None
+    end: Optional[date] = None
+    is_paid: bool = True
+
+class BulkStatusRequest(BaseModel):
+    """Request model for changing the status of many clients at once."""
+    client_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    status: ClientStatus
+
 @router.get("/", response_model=List[ClientResponse])
-def get_clients(filter: str = "active", db: Session = Depends(get_db)):
+def get_clients(
+    response: Response,
+    filter: str = "active",
+    fields: Optional[str] = Query(None, description="Comma-separated ClientSummary fields to return, e.g. id,first_name,last_name,client_code,status"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; enables keyset pagination"),
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    sort: str = Query("name", description="Sort order: name, last_seen or unpaid"),
+    has_unpaid: Optional[bool] = Query(None, description="Only clients with (true) or without (false) unpaid notes"),
+    db: Session = Depends(get_db)
+):
     """
     Retrieve a list of clients.
 
+    Without `fields` the full client records are returned. With `fields` only
+    the requested ClientSummary fields are loaded and returned. When `limit`
+    is set and more clients may follow, the cursor for the next page is sent
+    in the `X-Next-Cursor` response header (name sort only).
+
     Args:
         filter: Filter clients by status ("active", "waiting_list", "archived", "all").
                 Defaults to "active".
+        fields: Optional comma-separated field projection.
+        limit: Optional page size.
+        after: Optional cursor of the page to continue from.
+        sort: Optional order ("name", "last_seen", "unpaid"). Defaults to "name".
+        has_unpaid: Optional filter on whether clients have unpaid notes.
         db: Database session dependency.
 
+    Raises:
+        HTTPException: If `fields`, `after` or `sort` is invalid (400).
+
     Returns:
         A list of client objects.
     """
-    return ClientService.get_clients(db, filter)
+    selected = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    try:
+        cursor = ClientService.decode_cursor(after) if after else None
+        clients = ClientService.get_clients(
+            db, filter, fields=selected, limit=limit, after=cursor, sort=sort, has_unpaid=has_unpaid
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    headers = {}
+    if limit is not None and len(clients) == limit and sort == "name":
+        headers["X-Next-Cursor"] = ClientService.encode_cursor(clients[-1])
+
+    if selected is None:
+        response.headers.update(headers)
+        return clients
+
+    # Only the projected attributes are loaded, so read exactly those.
+    content = [
+        ClientSummary.model_validate({field: getattr(client, field) for field in ["id", *selected]}).model_dump(
+            mode="json", include={"id", *selected}
+        )
+        for client in clients
+    ]
+    return JSONResponse(content=jsonable_encoder(content), headers=headers)
+
+@router.get("/search", response_model=List[ClientResponse])
+def search_clients(
+    q: str = Query(..., min_length=1),
+    filter: str = "active",
+    limit: int = Query(20, ge=1, le=ClientService.SEARCH_MAX_LIMIT),
+    db: Session = Depends(get_db)
+):
+    """
+    Search clients by name, client code, email or phone.
+
+    Args:
+        q: Search text; every word must match.
+        filter: Filter clients by status ("active", "waiting_list", "archived", "all").
+                Defaults to "active".
+        limit: Maximum number of clients to return.
+        db: Database session dependency.
+
+    Returns:
+        A ranked list of matching client objects.
+    """
+    return ClientService.search_clients(db, q, filter, limit)
+
+@router.post("/import", response_model=ClientImportResult)
+def import_clients(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv, json or jsonl; inferred from the file name if omitted"),
+    db: Session = Depends(get_db)
+):
+    """
+    Bulk-create clients from an uploaded CSV, JSON or JSON Lines file.
+
+    Each row is validated like a single client creation. Valid rows are
+    inserted in batches; invalid or duplicate rows are skipped and reported
+    with their row number.
+
+    Raises:
+        HTTPException: If the format is unsupported or the file cannot be parsed (400).
+
+    Returns:
+        The number of created clients and the per-row errors.
+    """
+    try:
+        import_format = format or ClientImportService.detect_format(file.filename)
+        rows = ClientImportService.parse_rows(file.file, import_format)
+        return ClientImportService.import_clients(db, rows)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+@router.get("/export")
+def export_clients(
+    format: str = Query("csv", description="csv, json or jsonl"),
+    filter: str = "all",
+    db: Session = Depends(get_db)
+):
+    """
+    Stream clients in a format accepted by the import endpoint.
+
+    Raises:
+        HTTPException: If the format is unsupported (400).
+    """
+    try:
+        chunks = ClientImportService.export_clients(db, format, filter)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    media_types = {"csv": "text/csv", "json": "application/json", "jsonl": "application/x-ndjson"}
+    return StreamingResponse(
+        chunks,
+        media_type=media_types[format],
+        headers={"Content-Disposition": f'attachment; filename="clients.{format}"'},
+    )
+
+@router.post("/bulk-status")
+def set_status_bulk(request: BulkStatusRequest, db: Session = Depends(get_db)):
+    """
+    Change the status of many clients in one transaction.
+
+    Archiving also deactivates every appointment series of those clients.
+
+    Args:
+        request: Client IDs and the new status.
+        db: Database session dependency.
+
+    Returns:
+        {"updated": int, "deactivated_appointments": int, "missing_ids": [int]}
+    """
+    return ClientService.set_status_bulk(db, request.client_ids, request.status)
+
+@router.post("/mark-paid")
+def mark_clients_paid(request: MarkPaidRequest, db: Session = Depends(get_db)):
+    """
+    Mark the session and assessment notes of many clients as paid (or unpaid).
+
+    Args:
+        request: Client IDs, optional inclusive date range and the paid flag.
+        db: Database session dependency.
+
+    Raises:
+        HTTPException: If the date range is invalid (400).
+
+    Returns:
+        {"session_notes": int, "assessment_notes": int} counts of changed notes.
+    """
+    try:
+        return NoteBatchService.set_paid_in_range(db, request.client_ids, request.start, request.end, request.is_paid)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+@router.get("/stats/consistency")
+def check_client_stats(db: Session = Depends(get_db)):
+    """
+    Compare the denormalized client counters with the note tables.
+
+    Returns:
+        {"consistent": bool, "mismatches": [...]} listing clients whose stored
+        counters differ from the recomputed values.
+    """
+    mismatches = ClientStatsService.check_consistency(db)
+    return {"consistent": not mismatches, "mismatches": jsonable_encoder(mismatches)}
+
+@router.post("/stats/rebuild")
+def rebuild_client_stats(db: Session = Depends(get_db)):
+    """
+    Recompute the denormalized client counters from the note tables.
+
+    Returns:
+        {"rebuilt": <number of clients>}.
+    """
+    return {"rebuilt": ClientStatsService.rebuild(db)}
 
 @router.get("/{client_id}", response_model=ClientResponse)
 def get_client(client_id: int, db: Session = Depends(get_db)):
@@ -55,6 +251,26 @@ def get_client(client_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail=constants.MSG_CLIENT_NOT_FOUND)
     return client
 
+@router.get("/{client_id}/overview", response_model=ClientOverview)
+def get_client_overview(client_id: int, db: Session = Depends(get_db)):
+    """
+    Retrieve a client together with note summaries, totals and upcoming appointments.
+
+    Args:
+        client_id: The ID of the client.
+        db: Database session dependency.
+
+    Raises:
+        HTTPException: If the client is not found (404).
+
+    Returns:
+        The client overview, with note summaries that omit note bodies.
+    """
+    overview = ClientService.get_client_overview(db, client_id)
+    if not overview:
+        raise HTTPException(status_code=404, detail=constants.MSG_CLIENT_NOT_FOUND)
+    return overview
+
 @router.post("/", response_model=ClientResponse)
 def create_client(client: ClientCreate, db: Session = Depends(get_db)):
     """
@@ -72,6 +288,29 @@ def create_client(client: ClientCreate, db: Session = Depends(get_db)):
     except ValueError as exc:
         raise HTTPException(status_code=409, detail=str(exc))
 
+@router.put("/upsert", response_model=ClientResponse)
+def upsert_client(client: ClientCreate, db: Session = Depends(get_db)):
+    """
+    Create or update a client keyed by `client_code`.
+
+    Safe to retry: sending the same payload again returns the same client
+    without modifying it.
+
+    Args:
+        client: Full client data; `client_code` identifies the record.
+        db: Database session dependency.
+
+    Raises:
+        HTTPException: If the client data is invalid (400).
+
+    Returns:
+        The created or updated client object.
+    """
+    try:
+        return ClientService.upsert_client(db, client)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
 @router.put("/{client_id}", response_model=ClientResponse)
 def update_client(client_id: int, update: ClientUpdate, db: Session = Depends(get_db)):
     """
@@ -123,6 +362,37 @@ def set_archive_status(
         raise HTTPException(status_code=404, detail=constants.MSG_CLIENT_NOT_FOUND)
     return client
 
+@router.post("/{client_id}/mark-paid")
+def mark_client_paid(
+    client_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    is_paid: bool = True,
+    db: Session = Depends(get_db)
+):
+    """
+    Mark a client's session and assessment notes in a date range as paid.
+
+    Args:
+        client_id: The ID of the client.
+        start: Optional first note date (inclusive).
+        end: Optional last note date (inclusive).
+        is_paid: Set to false to mark the notes unpaid instead.
+        db: Database session dependency.
+
+    Raises:
+        HTTPException: If the client is not found (404) or the range is invalid (400).
+
+    Returns:
+        {"session_notes": int, "assessment_notes": int} counts of changed notes.
+    """
+    if not ClientService.get_client_by_id(db, client_id):
+        raise HTTPException(status_code=404, detail=constants.MSG_CLIENT_NOT_FOUND)
+    try:
+        return NoteBatchService.set_paid_in_range(db, [client_id], start, end, is_paid)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
 @router.delete("/{client_id}", response_model=ClientResponse)
 def delete_client(client_id: int, db: Session = Depends(get_db)):
     """
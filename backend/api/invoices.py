@@ -1,15 +1,46 @@
+import asyncio
 import os
+from datetime import date
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from backend.config import get_db
-from backend.schemas.invoice import InvoiceResponse
+from backend.models.invoice import InvoiceStatus
+from backend.schemas.invoice import InvoiceBatchResult, InvoiceResponse, InvoiceSummary
+from backend.services.invoice_archive_service import InvoiceArchiveService
+from backend.services.invoice_index_service import InvoiceIndexService
 from backend.services.invoice_service import InvoiceService
 
 router = APIRouter()
 
+# PDF files are content-addressed, so a versioned URL always serves the same bytes.
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def _pdf_version(invoice) -> Optional[str]:
+    return invoice.content_hash[:16] if invoice.content_hash else None
+
+
+def _pdf_url(invoice) -> str:
+    """PDF URL pinned to the current rendering, so it changes whenever the invoice does."""
+    version = _pdf_version(invoice)
+    if invoice.status != InvoiceStatus.READY or not version:
+        return f"/api/invoices/{invoice.id}/pdf"
+    return f"/api/invoices/{invoice.id}/pdf?v={version}"
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so a W/ prefix is ignored.
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
 
 def _build_invoice_response(invoice, was_created: bool) -> InvoiceResponse:
     return InvoiceResponse(
@@ -18,12 +49,55 @@ def _build_invoice_response(invoice, was_created: bool) -> InvoiceResponse:
         source_type=invoice.source_type,
         source_id=invoice.source_id,
         pdf_path=invoice.pdf_path,
-        pdf_url=f"/api/invoices/{invoice.id}/pdf",
+        pdf_url=_pdf_url(invoice),
         created_at=invoice.created_at,
         was_created=was_created,
+        status=invoice.status.value,
+        render_error=invoice.render_error,
     )
 
 
+@router.get("/", response_model=List[InvoiceSummary])
+def list_invoices(
+    response: Response,
+    year: Optional[int] = Query(None, description="Invoice year"),
+    client_id: Optional[int] = Query(None, description="Only this client's invoices"),
+    is_paid: Optional[bool] = Query(None, description="Only paid (true) or unpaid (false) invoices"),
+    number_from: Optional[str] = Query(None, description="First invoice number, e.g. INV-2025-0001"),
+    number_to: Optional[str] = Query(None, description="Last invoice number, e.g. INV-2025-0100"),
+    limit: int = Query(50, ge=1, le=500, description="Page size"),
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    db: Session = Depends(get_db),
+):
+    """
+    Lists invoices newest first. When more invoices may follow, the cursor for
+    the next page is sent in the `X-Next-Cursor` response header.
+    """
+    try:
+        invoices = InvoiceIndexService.list_invoices(
+            db, year=year, client_id=client_id, is_paid=is_paid,
+            number_from=number_from, number_to=number_to, limit=limit, after=after,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if len(invoices) == limit:
+        response.headers["X-Next-Cursor"] = invoices[-1].invoice_number
+    return [
+        InvoiceSummary(
+            id=invoice.id,
+            invoice_number=invoice.invoice_number,
+            year=invoice.year,
+            client_id=invoice.client_id,
+            invoice_date=invoice.invoice_date,
+            amount=InvoiceIndexService.format_amount(invoice.amount_minor),
+            is_paid=invoice.is_paid,
+            status=invoice.status.value,
+            pdf_url=_pdf_url(invoice),
+        )
+        for invoice in invoices
+    ]
+
+
 @router.post("/from-session/{session_id}", response_model=InvoiceResponse)
 def create_invoice_from_session(session_id: int, db: Session = Depends(get_db)):
     try:
@@ -46,21 +120,100 @@ def create_invoice_from_assessment(assessment_id: int, db: Session = Depends(get
         raise HTTPException(status_code=422, detail=str(exc))
 
 
-@router.get("/{invoice_id}/pdf")
-def get_invoice_pdf(invoice_id: int, db: Session = Depends(get_db)):
+@router.post("/batch", response_model=InvoiceBatchResult)
+def create_invoices_for_period(
+    start: date = Query(..., description="First note date to invoice (inclusive)"),
+    end: date = Query(..., description="Last note date to invoice (inclusive)"),
+    client_id: Optional[int] = Query(None, description="Only invoice this client's notes"),
+    consolidate: bool = Query(False, description="One invoice per client listing all of their notes"),
+    db: Session = Depends(get_db),
+):
+    """Invoices every uninvoiced session and assessment note in the billing period."""
+    try:
+        result = InvoiceService.create_for_period(db, start, end, client_id, consolidate)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return InvoiceBatchResult(
+        created=[_build_invoice_response(invoice, True) for invoice in result["created"]],
+        errors=result["errors"],
+    )
+
+
+@router.get("/archive")
+def download_invoice_archive(
+    year: int = Query(..., description="Invoice year to archive"),
+    db: Session = Depends(get_db),
+):
+    """Streams a ZIP of the year's invoice PDFs with a CSV manifest, re-rendering stale PDFs first."""
+    try:
+        chunks = InvoiceArchiveService.stream_archive(db, year)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return StreamingResponse(
+        chunks,
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="invoices-{year}.zip"'},
+    )
+
+
+def _load_invoice(db: Session, invoice_id: int):
     invoice = InvoiceService.get_invoice_by_id(db, invoice_id)
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found.")
+    db.refresh(invoice)
+    try:
+        InvoiceService.resume_pending_render(db, invoice)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return invoice
+
+
+@router.get("/{invoice_id}", response_model=InvoiceResponse)
+async def get_invoice(
+    invoice_id: int,
+    wait: float = Query(0, ge=0, le=30, description="Seconds to wait for a pending PDF to finish (long poll)"),
+    db: Session = Depends(get_db),
+):
+    """Returns the invoice and the status of its PDF; poll until it is no longer pending."""
+    # get_db hands out a blocking session, so the reads run off the event loop.
+    invoice = await run_in_threadpool(_load_invoice, db, invoice_id)
+    future = InvoiceService.get_render_future(invoice_id)
+    if future is not None and wait:
+        await asyncio.wait({asyncio.wrap_future(future)}, timeout=wait)
+        invoice = await run_in_threadpool(_load_invoice, db, invoice_id)
+    return _build_invoice_response(invoice, False)
+
+
+@router.get("/{invoice_id}/pdf")
+def get_invoice_pdf(
+    invoice_id: int,
+    v: Optional[str] = Query(None, description="PDF version from pdf_url; pins the URL so it can be cached"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Serves the invoice PDF with a strong ETag and byte-range support.
+
+    Versioned URLs (as returned in `pdf_url`) are cacheable forever; the bare
+    URL must be revalidated, which costs a 304 while the PDF is unchanged.
+    """
+    invoice = _load_invoice(db, invoice_id)
+    if invoice.status == InvoiceStatus.PENDING:
+        raise HTTPException(status_code=409, detail="Invoice PDF is still being generated.")
+    if invoice.status == InvoiceStatus.FAILED:
+        raise HTTPException(status_code=500, detail=f"Invoice PDF could not be generated: {invoice.render_error}")
     if not os.path.exists(invoice.pdf_path):
         raise HTTPException(status_code=404, detail="Invoice PDF file not found.")
 
-    return FileResponse(
-        invoice.pdf_path,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f'inline; filename="{invoice.invoice_number}.pdf"',
-            "Cache-Control": "no-store, no-cache, must-revalidate, max-age=0",
-            "Pragma": "no-cache",
-            "Expires": "0",
-        },
-    )
+    version = _pdf_version(invoice)
+    headers = {
+        "Content-Disposition": f'inline; filename="{invoice.invoice_number}.pdf"',
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if version and v == version else REVALIDATE_CACHE_CONTROL,
+    }
+    if invoice.content_hash:
+        headers["ETag"] = f'"{invoice.content_hash}"'
+        if _etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
+    # FileResponse answers Range / If-Range requests against the ETag above.
+    return FileResponse(invoice.pdf_path, media_type="application/pdf", headers=headers)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from backend.config import get_db
+from backend.services.client_stats_service import ClientStatsService
 from backend.services.report_service import ReportService
 from typing import List, Dict, Optional
 from datetime import date
@@ -141,51 +142,8 @@ def get_totals(filter: str = "active", db: Session = Depends(get_db)):
 @router.get("/client/{client_id}/totals")
 def get_client_totals(client_id: int, db: Session = Depends(get_db)):
     try:
-        from backend.models.session_note import SessionNote
-        from backend.models.assessment_note import AssessmentNote
-        from backend.models.supervision_note import SupervisionNote
-
-        logger.info(f"Calculating totals for client {client_id}")
-
-        # Query for session notes time (includes assessment notes)
-        session_total = (
-            db.query(func.sum(SessionNote.duration_minutes))
-            .filter(SessionNote.client_id == client_id)
-            .scalar() or 0
-        ) + (
-            db.query(func.sum(AssessmentNote.duration_minutes))
-            .filter(AssessmentNote.client_id == client_id)
-            .scalar() or 0
-        )
-
-        # Query for supervision notes time
-        supervision_total = db.query(func.sum(SupervisionNote.duration_minutes))\
-            .filter(SupervisionNote.client_id == client_id)\
-            .scalar() or 0
-        
-        # Query for counts
-        session_count = (
-            db.query(func.count(SessionNote.id))
-            .filter(SessionNote.client_id == client_id)
-            .scalar() or 0
-        ) + (
-            db.query(func.count(AssessmentNote.id))
-            .filter(AssessmentNote.client_id == client_id)
-            .scalar() or 0
-        )
-        
-        supervision_count = db.query(func.count(SupervisionNote.id))\
-            .filter(SupervisionNote.client_id == client_id)\
-            .scalar() or 0
-
-        logger.info(f"Calculated totals for client {client_id} - Session: {session_total} minutes ({session_count} sessions), Supervision: {supervision_total} minutes ({supervision_count} sessions)")
-
-        return {
-            "session_total": session_total,
-            "supervision_total": supervision_total,
-            "session_count": session_count,
-            "supervision_count": supervision_count
-        }
+        # One indexed read of the counters the note services maintain.
+        return ClientStatsService.get_totals(db, client_id)
     except Exception as e:
         logger.error(f"Error calculating client totals: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error calculating client totals: {str(e)}")
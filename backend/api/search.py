@@ -0,0 +1,24 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from backend.config import get_db
+from backend.schemas.search import NoteSearchResult
+from backend.services.note_search_service import NoteSearchService
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[NoteSearchResult])
+def search_notes(
+    q: str = Query(..., min_length=1, description="Words to search for in note content and personal notes"),
+    limit: int = Query(20, ge=1, le=NoteSearchService.MAX_LIMIT),
+    note_type: Optional[str] = Query(None, pattern="^(session|assessment|supervision|cpd)$"),
+    client_id: Optional[int] = Query(None, description="Filter by client ID"),
+    db: Session = Depends(get_db),
+):
+    try:
+        return NoteSearchService.search(db, q, limit=limit, note_type=note_type, client_id=client_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
@@ -1,21 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Response
 from sqlalchemy.orm import Session
 from backend.config import get_db
+from backend.services.note_batch_service import NoteBatchService
+from backend.services.note_update_service import NoteUpdateService, StaleNoteError
 from backend.services.session_note_service import SessionNoteService
-from backend.schemas.session_note import SessionNoteCreate, SessionNoteUpdate, SessionNoteResponse
-from typing import List
+from backend.schemas.session_note import SessionNoteCreate, SessionNoteUpdate, SessionNoteResponse, SessionNoteBatchUpdate
+from backend.schemas.note_batch import NotePaidUpdate, NotePaidResult
+from typing import List, Optional
 
 router = APIRouter()
+MAX_BATCH_SIZE = NoteBatchService.MAX_BATCH_SIZE
 
 @router.get("/client/{client_id}", response_model=List[SessionNoteResponse])
 def get_sessions(client_id: int, db: Session = Depends(get_db)):
     return SessionNoteService.get_client_sessions(db, client_id)
 
+@router.post("/batch", response_model=List[SessionNoteResponse])
+def create_sessions_batch(
+    notes: List[SessionNoteCreate] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE),
+    db: Session = Depends(get_db)
+):
+    try:
+        return SessionNoteService.create_sessions(db, notes)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+@router.put("/batch", response_model=List[SessionNoteResponse])
+def update_sessions_batch(
+    updates: List[SessionNoteBatchUpdate] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE),
+    db: Session = Depends(get_db)
+):
+    try:
+        return SessionNoteService.update_sessions(db, updates)
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+@router.post("/mark-paid", response_model=NotePaidResult)
+def mark_sessions_paid(request: NotePaidUpdate, db: Session = Depends(get_db)):
+    return {"updated": SessionNoteService.set_sessions_paid(db, request.ids, request.is_paid)}
+
 @router.get("/{session_id}", response_model=SessionNoteResponse)
-def get_session(session_id: int, db: Session = Depends(get_db)):
+def get_session(session_id: int, response: Response, db: Session = Depends(get_db)):
     session = SessionNoteService.get_session_by_id(db, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
+    response.headers["ETag"] = NoteUpdateService.etag(session.version)
     return session
 
 @router.post("/", response_model=SessionNoteResponse)
@@ -23,10 +54,23 @@ def create_session(session: SessionNoteCreate, db: Session = Depends(get_db)):
     return SessionNoteService.create_session(db, session)
 
 @router.put("/{session_id}", response_model=SessionNoteResponse)
-def update_session(session_id: int, update: SessionNoteUpdate, db: Session = Depends(get_db)):
-    session = SessionNoteService.update_session(db, session_id, update)
+def update_session(
+    session_id: int,
+    update: SessionNoteUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None, description="ETag of the version being edited; 409 if it is stale"),
+    db: Session = Depends(get_db)
+):
+    try:
+        expected_version = NoteUpdateService.parse_if_match(if_match)
+        session = SessionNoteService.update_session(db, session_id, update, expected_version)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except StaleNoteError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
+    response.headers["ETag"] = NoteUpdateService.etag(session.version)
     return session
 
 @router.delete("/{session_id}")
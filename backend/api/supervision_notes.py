@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Response
 from sqlalchemy.orm import Session
 from backend.config import get_db
+from backend.services.note_batch_service import NoteBatchService
+from backend.services.note_update_service import NoteUpdateService, StaleNoteError
 from backend.services.supervision_note_service import SupervisionNoteService
-from backend.schemas.supervision_note import SupervisionNoteCreate, SupervisionNoteUpdate, SupervisionNoteResponse
-from typing import List
+from backend.schemas.supervision_note import SupervisionNoteCreate, SupervisionNoteUpdate, SupervisionNoteResponse, SupervisionNoteBatchUpdate
+from typing import List, Optional
 
 router = APIRouter()
+MAX_BATCH_SIZE = NoteBatchService.MAX_BATCH_SIZE
 
 @router.get("/", response_model=List[SupervisionNoteResponse])
 def get_supervision_notes(db: Session = Depends(get_db)):
@@ -15,11 +18,46 @@ def get_supervision_notes(db: Session = Depends(get_db)):
 def create_supervision(note: SupervisionNoteCreate, db: Session = Depends(get_db)):
     return SupervisionNoteService.create_supervision_note(db, note)
 
+@router.post("/batch", response_model=List[SupervisionNoteResponse])
+def create_supervision_notes_batch(
+    notes: List[SupervisionNoteCreate] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE),
+    db: Session = Depends(get_db)
+):
+    try:
+        return SupervisionNoteService.create_supervision_notes(db, notes)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+@router.put("/batch", response_model=List[SupervisionNoteResponse])
+def update_supervision_notes_batch(
+    updates: List[SupervisionNoteBatchUpdate] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE),
+    db: Session = Depends(get_db)
+):
+    try:
+        return SupervisionNoteService.update_supervision_notes(db, updates)
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
 @router.put("/{note_id}", response_model=SupervisionNoteResponse)
-def update_supervision(note_id: int, update: SupervisionNoteUpdate, db: Session = Depends(get_db)):
-    note = SupervisionNoteService.update_supervision_note(db, note_id, update)
+def update_supervision(
+    note_id: int,
+    update: SupervisionNoteUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None, description="ETag of the version being edited; 409 if it is stale"),
+    db: Session = Depends(get_db)
+):
+    try:
+        expected_version = NoteUpdateService.parse_if_match(if_match)
+        note = SupervisionNoteService.update_supervision_note(db, note_id, update, expected_version)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except StaleNoteError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
     if not note:
         raise HTTPException(status_code=404, detail="Supervision note not found")
+    response.headers["ETag"] = NoteUpdateService.etag(note.version)
     return note
 
 @router.delete("/{note_id}")
@@ -0,0 +1,196 @@
+"""
+Benchmark for invoice PDF rendering.
+
+Measures `InvoiceService._generate_pdf` on its own and the full invoice path
+(number allocation, database writes and the background render) for
+single-line and many-line invoices, sequentially and on a process pool.
+Reports PDFs per second, mean PDF size and peak Python memory per render.
+
+The full path is driven through `get_or_create_from_session` (one note at a
+time, as the preview button does) and through `create_for_period` for the
+pooled and consolidated cases, since `_get_or_create` itself only ever renders
+one invoice. Pooled timings include process start-up, as month-end batches
+pay it too.
+
+Everything runs offline against a temporary invoice directory and SQLite
+database; the app's own data is not touched.
+
+Run with: python -m backend.benchmarks.invoice_rendering
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.models.appointment_exception import AppointmentException  # noqa: F401 - registers mapper for Appointment
+from backend.models.base import Base
+from backend.models.client import Client, ClientStatus
+from backend.models.session_note import SessionNote
+from backend.models.therapist_detail import TherapistDetail
+from backend.services.invoice_service import InvoiceContext, InvoiceLineItem, InvoiceService, _render_invoice_job
+
+INVOICES = 40
+MANY_LINES = 60
+FIRST_DATE = date(2025, 1, 6)
+# Single-line sequential `_generate_pdf` throughput below this fails the run.
+TARGET_PDFS_PER_SECOND = 100
+
+THERAPIST_DETAILS = dict(
+    business_name="Benchmark Practice", therapist_name="Terry Bench", therapy_type="Counselling",
+    email="bench@example.com", bank="Bank", session_hourly_rate="60", sort_code="00-00-00",
+    account_number="12345678", currency="GBP",
+)
+
+
+def _context(source_id: int, line_count: int) -> InvoiceContext:
+    lines = [
+        InvoiceLineItem("session", source_id + offset, FIRST_DATE + timedelta(days=7 * offset), offset % 2 == 0)
+        for offset in range(line_count)
+    ]
+    return InvoiceContext(
+        source_type="session", source_id=source_id, session_date=FIRST_DATE, client_name="Bench Client",
+        client_session_rate_raw="60", paid=False, lines=lines,
+    )
+
+
+def _render_jobs(directory: str, line_count: int) -> list:
+    therapist = InvoiceService._build_therapist_payload(TherapistDetail(**THERAPIST_DETAILS))
+    return [
+        (
+            SimpleNamespace(invoice_number=f"INV-2025-{index:04d}", pdf_path=os.path.join(directory, f"{index}.pdf")),
+            _context(index * 1000, line_count),
+            therapist,
+            "60.00",
+        )
+        for index in range(1, INVOICES + 1)
+    ]
+
+
+def _peak_memory(render) -> float:
+    """Peak traced allocation, in KiB, while running `render` once."""
+    tracemalloc.start()
+    try:
+        render()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def _report(stage: str, line_count: int, mode: str, elapsed: float, paths: list, memory_kib=None) -> float:
+    rate = len(paths) / elapsed
+    size_kib = sum(os.path.getsize(path) for path in paths) / len(paths) / 1024
+    memory = f"{memory_kib:8.0f}" if memory_kib is not None else f"{'-':>8}"
+    print(f"{stage:>14} {line_count:>5} {mode:>10} {rate:10.1f} {size_kib:9.1f} {memory}")
+    return rate
+
+
+def bench_generate_pdf(directory: str, line_count: int, pooled: bool) -> float:
+    jobs = _render_jobs(directory, line_count)
+    if pooled:
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as pool:
+            errors = [error for error in pool.map(_render_invoice_job, jobs, chunksize=4) if error]
+        elapsed = time.perf_counter() - started
+        assert not errors, errors
+        return _report("generate_pdf", line_count, "pool", elapsed, [job[0].pdf_path for job in jobs])
+
+    # The traced render also warms the font and static-layer caches before timing.
+    memory_kib = _peak_memory(lambda: InvoiceService._generate_pdf(*jobs[0]))
+    started = time.perf_counter()
+    for job in jobs:
+        InvoiceService._generate_pdf(*job)
+    elapsed = time.perf_counter() - started
+    return _report("generate_pdf", line_count, "sequential", elapsed, [job[0].pdf_path for job in jobs], memory_kib)
+
+
+def _seed_database(directory: str, clients: int, notes_per_client: int):
+    engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    db.add(TherapistDetail(**THERAPIST_DETAILS))
+    note_ids = []
+    for index in range(clients):
+        client = Client(first_name="Bench", last_name=f"Client {index}", client_code=f"B-{index}",
+                        session_hourly_rate="60", status=ClientStatus.ACTIVE)
+        db.add(client)
+        db.flush()
+        notes = [
+            SessionNote(client_id=client.id, session_date=FIRST_DATE + timedelta(days=offset), duration_minutes=50)
+            for offset in range(notes_per_client)
+        ]
+        db.add_all(notes)
+        db.flush()
+        note_ids.extend(note.id for note in notes)
+    db.commit()
+    return engine, db, note_ids
+
+
+def _wait_for_renders(db, invoices) -> list:
+    futures = {InvoiceService.get_render_future(invoice.id) for invoice in invoices} - {None}
+    for future in futures:
+        future.result()
+    for invoice in invoices:
+        db.refresh(invoice)
+    failed = [invoice.render_error for invoice in invoices if invoice.render_error]
+    assert not failed, failed
+    return [invoice.pdf_path for invoice in invoices]
+
+
+def bench_full_path(directory: str, line_count: int, pooled: bool) -> float:
+    # One extra client is invoiced under tracemalloc first, outside the timing.
+    engine, db, note_ids = _seed_database(directory, INVOICES + 1, line_count)
+    last_date = FIRST_DATE + timedelta(days=line_count - 1)
+    original_dir, original_min_batch = InvoiceService.INVOICE_DIR, InvoiceService.POOL_MIN_BATCH
+    InvoiceService.INVOICE_DIR = os.path.join(directory, "invoices")
+    InvoiceService.POOL_MIN_BATCH = original_min_batch if pooled else sys.maxsize
+    try:
+        memory_kib = None
+        if not pooled:
+            memory_kib = _peak_memory(lambda: _wait_for_renders(db, InvoiceService.create_for_period(
+                db, FIRST_DATE, last_date, client_id=1, consolidate=line_count > 1)["created"]))
+
+        started = time.perf_counter()
+        if line_count == 1 and not pooled:
+            invoices = []
+            for note_id in note_ids[1:]:
+                invoice, _ = InvoiceService.get_or_create_from_session(db, note_id)
+                _wait_for_renders(db, [invoice])
+                invoices.append(invoice)
+        else:
+            invoices = InvoiceService.create_for_period(
+                db, FIRST_DATE, last_date, consolidate=line_count > 1
+            )["created"]
+        paths = _wait_for_renders(db, invoices)
+        elapsed = time.perf_counter() - started
+    finally:
+        InvoiceService.INVOICE_DIR, InvoiceService.POOL_MIN_BATCH = original_dir, original_min_batch
+        db.close()
+        engine.dispose()
+    return _report("full path", line_count, "pool" if pooled else "sequential", elapsed, paths, memory_kib)
+
+
+def main():
+    print(f"{INVOICES} invoices per run, {os.cpu_count()} CPUs")
+    print(f"{'stage':>14} {'lines':>5} {'mode':>10} {'PDFs/s':>10} {'KiB/PDF':>9} {'peak KiB':>8}")
+    results = {}
+    for bench in (bench_generate_pdf, bench_full_path):
+        for line_count in (1, MANY_LINES):
+            for pooled in (False, True):
+                with tempfile.TemporaryDirectory(prefix="invoice-bench-") as directory:
+                    results[bench.__name__, line_count, pooled] = bench(directory, line_count, pooled)
+
+    baseline = results["bench_generate_pdf", 1, False]
+    print(f"target: {TARGET_PDFS_PER_SECOND} single-line PDFs/s sequential, measured {baseline:.1f}")
+    if baseline < TARGET_PDFS_PER_SECOND:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Microbenchmark for the monthly merge step of the notes reports.
+
+Compares the previous dict-per-month merge against the array buffers used by
+`ReportService` on a 10-year range, using synthetic grouped query rows so
+only the Python merge is measured.
+
+Run with: python -m backend.benchmarks.monthly_buckets
+"""
+import random
+import timeit
+from array import array
+from datetime import date
+from types import SimpleNamespace
+
+from backend.services.report_service import ReportService
+
+START_DATE = date(2015, 1, 1)
+END_DATE = date(2024, 12, 31)
+REPEAT = 5
+NUMBER = 200
+
+
+def _synthetic_rows(seed: int):
+    rng = random.Random(seed)
+    return [
+        SimpleNamespace(year=year, month=month, total_minutes=rng.randint(0, 3000), session_count=rng.randint(0, 60))
+        for year in range(START_DATE.year, END_DATE.year + 1)
+        for month in range(1, 13)
+        if rng.random() < 0.9
+    ]
+
+
+def legacy_merge(session_rows, assessment_rows, start_date: date, end_date: date):
+    monthly_dict = {}
+    for rows, minutes_key, count_key in (
+        (session_rows, "session_minutes", "session_count"),
+        (assessment_rows, "assessment_minutes", "assessment_count"),
+    ):
+        for row in rows:
+            month_key = f"{int(row.year)}-{int(row.month):02d}"
+            if month_key not in monthly_dict:
+                monthly_dict[month_key] = {
+                    "session_minutes": 0,
+                    "assessment_minutes": 0,
+                    "session_count": 0,
+                    "assessment_count": 0
+                }
+            monthly_dict[month_key][minutes_key] = row.total_minutes or 0
+            monthly_dict[month_key][count_key] = row.session_count or 0
+
+    all_months = []
+    current = start_date.replace(day=1)
+    end_month = end_date.replace(day=1)
+    while current <= end_month:
+        month_key = f"{current.year}-{current.month:02d}"
+        data = monthly_dict.get(month_key, {"session_minutes": 0, "assessment_minutes": 0, "session_count": 0, "assessment_count": 0})
+        all_months.append({
+            "month_key": month_key,
+            "month_name": current.strftime("%B %Y"),
+            "session_hours": data["session_minutes"] / 60.0,
+            "assessment_hours": data["assessment_minutes"] / 60.0,
+            "total_hours": (data["session_minutes"] + data["assessment_minutes"]) / 60.0,
+            "session_count": data["session_count"],
+            "assessment_count": data["assessment_count"]
+        })
+        if current.month == 12:
+            current = current.replace(year=current.year + 1, month=1)
+        else:
+            current = current.replace(month=current.month + 1)
+    return all_months
+
+
+def bucketed_merge(session_rows, assessment_rows, start_date: date, end_date: date):
+    first, count = ReportService._month_range(start_date, end_date)
+    fields = {"minutes": ("total_minutes", "d"), "count": ("session_count", "q")}
+    sessions = ReportService._bucket_by_month(session_rows, first, count, fields)
+    assessments = ReportService._bucket_by_month(assessment_rows, first, count, fields)
+    return ReportService._monthly_rows(first, count, {
+        "session_hours": array("d", (minutes / 60.0 for minutes in sessions["minutes"])),
+        "assessment_hours": array("d", (minutes / 60.0 for minutes in assessments["minutes"])),
+        "total_hours": array("d", ((session_minutes + assessment_minutes) / 60.0
+                                   for session_minutes, assessment_minutes in zip(sessions["minutes"], assessments["minutes"]))),
+        "session_count": sessions["count"],
+        "assessment_count": assessments["count"]
+    })
+
+
+def main():
+    session_rows = _synthetic_rows(1)
+    assessment_rows = _synthetic_rows(2)
+    assert legacy_merge(session_rows, assessment_rows, START_DATE, END_DATE) == \
+        bucketed_merge(session_rows, assessment_rows, START_DATE, END_DATE)
+
+    results = {}
+    for name, merge in (("legacy dict merge", legacy_merge), ("array buckets", bucketed_merge)):
+        timings = timeit.repeat(
+            lambda: merge(session_rows, assessment_rows, START_DATE, END_DATE),
+            repeat=REPEAT,
+            number=NUMBER,
+        )
+        results[name] = min(timings) / NUMBER * 1e6
+        print(f"{name:>18}: {results[name]:8.1f} us per 10-year merge")
+
+    speedup = results["legacy dict merge"] / results["array buckets"]
+    print(f"{'speedup':>18}: {speedup:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 import os
 from datetime import datetime
-from sqlalchemy import create_engine, inspect, text
+import logging
+from sqlalchemy import MetaData, create_engine, event, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateTable
 from sqlalchemy.orm import sessionmaker
 from backend.models.base import Base
 from backend.models.client import Client  # noqa: F401
@@ -12,6 +15,9 @@ from backend.models.appointment import Appointment  # noqa: F401
 from backend.models.appointment_exception import AppointmentException  # noqa: F401
 from backend.models.therapist_detail import TherapistDetail  # noqa: F401
 from backend.models.invoice import Invoice  # noqa: F401
+from backend.models.invoice_line import InvoiceLine  # noqa: F401
+from backend.models.invoice_sequence import InvoiceSequence  # noqa: F401
+from backend.models.client_stats import ClientStats  # noqa: F401
 
 # Get the user's home directory
 HOME_DIR = os.path.expanduser("~")
@@ -29,15 +35,37 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+logger = logging.getLogger(__name__)
+
+# SQLite only enforces foreign keys (and their ON DELETE CASCADE actions)
+# when enabled on each connection.
+@event.listens_for(Engine, "connect")
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    if type(dbapi_connection).__module__.startswith("sqlite3"):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 # Create tables
 def create_tables():
     Base.metadata.create_all(bind=engine)
     _ensure_client_columns()
+    _ensure_client_code_unique_index()
     _ensure_personal_notes_columns()
+    _ensure_note_version_columns()
+    _ensure_cascading_foreign_keys()
     _ensure_appointment_indexes()
     _deactivate_stale_appointments()
     _ensure_therapist_details_columns()
+    _ensure_invoice_columns()
     _ensure_invoice_indexes()
+    _ensure_invoice_sequences()
+    _ensure_invoice_lines()
+    _ensure_invoice_list_fields()
+    _ensure_note_search_index()
+    _ensure_client_search_index()
+    _ensure_note_client_indexes()
+    _ensure_client_stats()
 
 def _ensure_client_columns():
     inspector = inspect(engine)
@@ -55,6 +83,23 @@ def _ensure_client_columns():
                 text("ALTER TABLE clients ADD COLUMN therapy_modality VARCHAR(255)")
             )
 
+def _ensure_client_code_unique_index():
+    # ClientService relies on this constraint for duplicate detection and the
+    # ON CONFLICT upsert; databases created before it existed lack it.
+    inspector = inspect(engine)
+    if "clients" not in inspector.get_table_names():
+        return
+    unique_columns = [constraint["column_names"] for constraint in inspector.get_unique_constraints("clients")]
+    unique_columns += [index["column_names"] for index in inspector.get_indexes("clients") if index["unique"]]
+    if ["client_code"] in unique_columns:
+        return
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_clients_client_code "
+            "ON clients(client_code)"
+        ))
+
 def _ensure_personal_notes_columns():
     inspector = inspect(engine)
     text_column_specs = [
@@ -81,6 +126,66 @@ def _ensure_personal_notes_columns():
                 default_value = "Online" if column_name == "session_type" else ""
                 conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} VARCHAR({size}) NOT NULL DEFAULT '{default_value}'"))
 
+def _ensure_note_version_columns():
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table_name in ("session_notes", "assessment_notes", "supervision_notes"):
+            existing_columns = {col["name"] for col in inspector.get_columns(table_name)}
+            if "version" not in existing_columns:
+                conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+
+def _ensure_cascading_foreign_keys():
+    # SQLite cannot alter a foreign key, so tables created before the
+    # ON DELETE CASCADE clauses were added are rebuilt from the models. Their
+    # triggers are dropped with them and recreated by the ensure helpers below.
+    inspector = inspect(engine)
+    tables = [
+        table for table in Base.metadata.sorted_tables
+        if table.name in inspector.get_table_names()
+        and any(
+            foreign_key.ondelete == "CASCADE"
+            and (foreign_key.column.table.name, "CASCADE") not in {
+                (existing["referred_table"], (existing.get("options") or {}).get("ondelete", "").upper())
+                for existing in inspector.get_foreign_keys(table.name)
+            }
+            for foreign_key in table.foreign_keys
+        )
+    ]
+    if not tables:
+        return
+
+    with engine.connect() as conn:
+        # Must be switched off outside a transaction, or dropping the old
+        # parent tables would cascade into their children.
+        conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        conn.commit()
+        try:
+            conn.exec_driver_sql("BEGIN")
+            for table in tables:
+                logger.info(f"Rebuilding {table.name} with cascading foreign keys")
+                existing_columns = {col["name"] for col in inspector.get_columns(table.name)}
+                columns = ", ".join(column.name for column in table.columns if column.name in existing_columns)
+                rebuild_metadata = MetaData()
+                for foreign_key in table.foreign_keys:
+                    foreign_key.column.table.to_metadata(rebuild_metadata)
+                rebuilt = table.to_metadata(rebuild_metadata, name=f"{table.name}_rebuild")
+                conn.execute(CreateTable(rebuilt))
+                conn.execute(text(f"INSERT INTO {rebuilt.name} ({columns}) SELECT {columns} FROM {table.name}"))
+                conn.execute(text(f"DROP TABLE {table.name}"))
+                conn.execute(text(f"ALTER TABLE {rebuilt.name} RENAME TO {table.name}"))
+                for index in table.indexes:
+                    index.create(conn, checkfirst=True)
+            orphans = conn.exec_driver_sql("PRAGMA foreign_key_check").fetchall()
+            if orphans:
+                logger.warning(f"{len(orphans)} rows reference missing parents after the foreign key migration")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+            conn.commit()
+
 def _ensure_appointment_indexes():
     with engine.begin() as conn:
         conn.execute(text("DROP INDEX IF EXISTS idx_appointments_active_client"))
@@ -145,6 +250,31 @@ def _ensure_therapist_details_columns():
                     text(f"ALTER TABLE therapist_details ADD COLUMN {column_name} {column_definition}")
                 )
 
+def _ensure_invoice_columns():
+    inspector = inspect(engine)
+    if "invoices" not in inspector.get_table_names():
+        return
+
+    with engine.begin() as conn:
+        existing_columns = {col["name"] for col in inspector.get_columns("invoices")}
+        if "content_hash" not in existing_columns:
+            conn.execute(text("ALTER TABLE invoices ADD COLUMN content_hash VARCHAR(64)"))
+        if "status" not in existing_columns:
+            # Invoices from before background rendering were rendered synchronously.
+            conn.execute(text("ALTER TABLE invoices ADD COLUMN status VARCHAR(7) NOT NULL DEFAULT 'READY'"))
+        if "render_error" not in existing_columns:
+            conn.execute(text("ALTER TABLE invoices ADD COLUMN render_error TEXT"))
+        if "client_id" not in existing_columns:
+            conn.execute(text(
+                "ALTER TABLE invoices ADD COLUMN client_id INTEGER REFERENCES clients(id) ON DELETE SET NULL"
+            ))
+        if "invoice_date" not in existing_columns:
+            conn.execute(text("ALTER TABLE invoices ADD COLUMN invoice_date DATE"))
+        if "amount_minor" not in existing_columns:
+            conn.execute(text("ALTER TABLE invoices ADD COLUMN amount_minor INTEGER"))
+        if "is_paid" not in existing_columns:
+            conn.execute(text("ALTER TABLE invoices ADD COLUMN is_paid BOOLEAN NOT NULL DEFAULT 0"))
+
 def _ensure_invoice_indexes():
     inspector = inspect(engine)
     if "invoices" not in inspector.get_table_names():
@@ -163,6 +293,70 @@ def _ensure_invoice_indexes():
             "CREATE UNIQUE INDEX IF NOT EXISTS idx_invoices_number "
             "ON invoices(invoice_number)"
         ))
+        for column in ("client_id", "invoice_date", "is_paid"):
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_invoices_{column} ON invoices({column})"))
+
+def _ensure_invoice_sequences():
+    # Seed (or catch up) the per-year counters from invoices numbered before
+    # the counter table existed.
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO invoice_sequences (year, last_value) "
+            "SELECT year, MAX(sequence_number) FROM invoices WHERE true GROUP BY year "
+            "ON CONFLICT(year) DO UPDATE SET last_value = MAX(last_value, excluded.last_value)"
+        ))
+
+def _ensure_invoice_lines():
+    # Invoices from before invoice_lines existed bill exactly their source note.
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO invoice_lines (invoice_id, position, source_type, source_id) "
+            "SELECT id, 1, source_type, source_id FROM invoices "
+            "WHERE NOT EXISTS (SELECT 1 FROM invoice_lines WHERE invoice_lines.invoice_id = invoices.id)"
+        ))
+
+# The helpers below bootstrap data owned by the services. They import them
+# lazily because the services depend on this module, not the other way round.
+def _ensure_invoice_list_fields():
+    from backend.services.invoice_service import InvoiceService
+
+    db = SessionLocal()
+    try:
+        InvoiceService.backfill_list_fields(db)
+    finally:
+        db.close()
+
+def _ensure_note_search_index():
+    from backend.services.note_search_service import NoteSearchService
+
+    with engine.begin() as conn:
+        NoteSearchService.ensure_index(conn)
+
+def _ensure_client_search_index():
+    from backend.services.client_service import ClientService
+
+    with engine.begin() as conn:
+        ClientService.ensure_search_index(conn)
+
+def _ensure_note_client_indexes():
+    with engine.begin() as conn:
+        for table_name in ("session_notes", "assessment_notes", "supervision_notes"):
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS idx_{table_name}_client "
+                f"ON {table_name}(client_id)"
+            ))
+
+def _ensure_client_stats():
+    from backend.services.client_stats_service import ClientStatsService
+
+    # Notes written outside the services (e.g. the migration scripts) leave the
+    # counters stale, so rebuild them whenever they disagree with the notes.
+    db = SessionLocal()
+    try:
+        if ClientStatsService.check_consistency(db):
+            ClientStatsService.rebuild(db)
+    finally:
+        db.close()
 
 # Dependency for FastAPI routes
 def get_db():
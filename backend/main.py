@@ -2,18 +2,23 @@ from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
+import multiprocessing
 import os
 import sys
 import traceback
 import time
 
+# Frozen builds re-launch this executable for invoice-rendering worker processes.
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+
 # Ensure errors are printed to stderr
 def print_error(msg):
     print(msg, file=sys.stderr, flush=True)
 
 try:
     from backend.config import create_tables
-    from backend.api import clients, session_notes, assessment_notes, supervision_notes, cpd_notes, reports, system, calendar, therapist_details, invoices
+    from backend.api import clients, session_notes, assessment_notes, supervision_notes, cpd_notes, reports, system, calendar, therapist_details, invoices, search
 except Exception as e:
     print_error(f"ERROR: Failed to import modules: {e}")
     print_error(traceback.format_exc())
@@ -22,9 +27,10 @@ except Exception as e:
 app = FastAPI(title="Therapy Session Manager", version="1.0")
 ASSET_VERSION = str(int(time.time()))
 
-# Create tables on startup
+# Create tables on startup (worker processes re-import this module and skip it)
 try:
-    create_tables() # Re-enable for Alembic to recognize existing schema
+    if multiprocessing.parent_process() is None:
+        create_tables() # Re-enable for Alembic to recognize existing schema
 except Exception as e:
     print_error(f"ERROR: Failed to create tables: {e}")
     print_error(traceback.format_exc())
@@ -104,6 +110,7 @@ app.include_router(system.router, prefix="/api/system", tags=["System"])
 app.include_router(calendar.router, prefix="/api/calendar", tags=["Calendar"])
 app.include_router(therapist_details.router, prefix="/api/therapist-details", tags=["Therapist Details"])
 app.include_router(invoices.router, prefix="/api/invoices", tags=["Invoices"])
+app.include_router(search.router, prefix="/api/search", tags=["Search"])
 
 if __name__ == "__main__":
     try:
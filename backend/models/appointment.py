@@ -7,7 +7,7 @@ from backend.models.base import BaseModel
 class Appointment(BaseModel):
     __tablename__ = "appointments"
 
-    client_id = Column(Integer, ForeignKey("clients.id"), nullable=False, index=True)
+    client_id = Column(Integer, ForeignKey("clients.id", ondelete="CASCADE"), nullable=False, index=True)
     title = Column(String(255), nullable=True)
     start_datetime = Column(DateTime, nullable=False)
     end_datetime = Column(DateTime, nullable=False)
@@ -17,4 +17,4 @@ class Appointment(BaseModel):
     is_active = Column(Boolean, nullable=False, default=True)
 
     client = relationship("Client", back_populates="appointments")
-    exceptions = relationship("AppointmentException", back_populates="appointment", cascade="all, delete-orphan")
+    exceptions = relationship("AppointmentException", back_populates="appointment", cascade="all, delete-orphan", passive_deletes=True)
@@ -10,7 +10,7 @@ class AppointmentException(BaseModel):
         UniqueConstraint("appointment_id", "occurrence_start_datetime", name="uq_appointment_occurrence_exception"),
     )
 
-    appointment_id = Column(Integer, ForeignKey("appointments.id"), nullable=False, index=True)
+    appointment_id = Column(Integer, ForeignKey("appointments.id", ondelete="CASCADE"), nullable=False, index=True)
     occurrence_start_datetime = Column(DateTime, nullable=False)
     action = Column(String(16), nullable=False)
     new_start_datetime = Column(DateTime, nullable=True)
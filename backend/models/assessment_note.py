@@ -5,12 +5,14 @@ from backend.models.base import BaseModel
 class AssessmentNote(BaseModel):
     __tablename__ = "assessment_notes"
 
-    client_id = Column(Integer, ForeignKey("clients.id"), nullable=False)
+    client_id = Column(Integer, ForeignKey("clients.id", ondelete="CASCADE"), nullable=False)
     assessment_date = Column(Date, nullable=False)
     duration_minutes = Column(Integer, nullable=False)
     is_paid = Column(Boolean, default=False)
     content = Column(Text)
     personal_notes = Column(Text)
     session_type = Column(String(20), nullable=False, default="Online")
+    # Incremented on every write; used for optimistic concurrency (ETag / If-Match).
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     client = relationship("Client", back_populates="assessment_notes")
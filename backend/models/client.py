@@ -12,6 +12,7 @@ from backend.models.base import BaseModel
 from backend.models.session_note import SessionNote
 from backend.models.assessment_note import AssessmentNote
 from backend.models.appointment import Appointment
+from backend.models.client_stats import ClientStats
 import enum
 
 class ClientStatus(enum.Enum):
@@ -50,6 +51,7 @@ class Client(BaseModel):
         updated_at (datetime): Timestamp of when the client record was last updated.
         session_notes (List[SessionNote]): Related session notes for this client.
         assessment_notes (List[AssessmentNote]): Related assessment notes for this client.
+        stats (Optional[ClientStats]): Denormalized note totals for this client.
     """
     __tablename__ = "clients"
 
@@ -74,9 +76,12 @@ class Client(BaseModel):
     gp_phone = Column(String(50), nullable=True)
     status = Column(Enum(ClientStatus), default=ClientStatus.ACTIVE)
 
-    session_notes = relationship("SessionNote", back_populates="client", cascade="all, delete")
-    assessment_notes = relationship("AssessmentNote", back_populates="client", cascade="all, delete")
-    appointments = relationship("Appointment", back_populates="client", cascade="all, delete")
+    # Child rows are removed by ON DELETE CASCADE foreign keys, so deleting a
+    # client never loads its notes or appointments.
+    session_notes = relationship("SessionNote", back_populates="client", cascade="all, delete", passive_deletes=True)
+    assessment_notes = relationship("AssessmentNote", back_populates="client", cascade="all, delete", passive_deletes=True)
+    appointments = relationship("Appointment", back_populates="client", cascade="all, delete", passive_deletes=True)
+    stats = relationship("ClientStats", back_populates="client", uselist=False, cascade="all, delete", passive_deletes=True)
 
     @property
     def full_name(self):
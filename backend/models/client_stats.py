@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey
+from sqlalchemy.orm import relationship
+
+from backend.models.base import BaseModel
+
+
+class ClientStats(BaseModel):
+    """
+    Denormalized per-client note totals, maintained by the note services.
+
+    Session figures combine session and assessment notes, matching the
+    client totals shown in the UI. Rows can be verified and rebuilt from the
+    note tables with `ClientStatsService`.
+    """
+    __tablename__ = "client_stats"
+
+    client_id = Column(Integer, ForeignKey("clients.id", ondelete="CASCADE"), nullable=False, unique=True)
+    session_minutes = Column(Integer, nullable=False, default=0)
+    session_count = Column(Integer, nullable=False, default=0)
+    unpaid_count = Column(Integer, nullable=False, default=0, index=True)
+    last_session_date = Column(Date, nullable=True, index=True)
+    supervision_minutes = Column(Integer, nullable=False, default=0)
+    supervision_count = Column(Integer, nullable=False, default=0)
+
+    client = relationship("Client", back_populates="stats")
@@ -1,17 +1,46 @@
-from sqlalchemy import Column, Integer, String, UniqueConstraint
+import enum
+
+from sqlalchemy import Boolean, Column, Date, Enum, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import relationship
 
 from backend.models.base import BaseModel
 
 
+class InvoiceStatus(enum.Enum):
+    """State of an invoice's PDF, which is rendered in the background."""
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+
+
 class Invoice(BaseModel):
     __tablename__ = "invoices"
 
+    # The first line's note; consolidated invoices list the rest in `lines`.
     invoice_number = Column(String(32), nullable=False, unique=True, index=True)
     source_type = Column(String(20), nullable=False)
     source_id = Column(Integer, nullable=False)
     year = Column(Integer, nullable=False, index=True)
     sequence_number = Column(Integer, nullable=False)
     pdf_path = Column(String(1024), nullable=False)
+    # SHA-256 of the inputs the current PDF was rendered from.
+    content_hash = Column(String(64), nullable=True)
+    status = Column(Enum(InvoiceStatus), nullable=False, default=InvoiceStatus.PENDING)
+    render_error = Column(Text, nullable=True)
+    # Denormalized from the invoice's notes so the invoice list needs no joins;
+    # kept current by InvoiceService (on render) and InvoiceIndexService.sync_paid.
+    client_id = Column(Integer, ForeignKey("clients.id", ondelete="SET NULL"), nullable=True, index=True)
+    invoice_date = Column(Date, nullable=True, index=True)
+    amount_minor = Column(Integer, nullable=True)  # total in pence/cents
+    is_paid = Column(Boolean, nullable=False, default=False, index=True)
+
+    lines = relationship(
+        "InvoiceLine",
+        back_populates="invoice",
+        order_by="InvoiceLine.position",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
     __table_args__ = (
         UniqueConstraint("source_type", "source_id", name="uq_invoices_source"),
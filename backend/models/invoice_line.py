@@ -0,0 +1,26 @@
+from sqlalchemy import Column, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import relationship
+
+from backend.models.base import BaseModel
+
+
+class InvoiceLine(BaseModel):
+    """
+    One billed session or assessment note on an invoice.
+
+    Each note can appear on at most one invoice. The date, paid state and
+    price of a line are read from the note and its client when the PDF is
+    rendered.
+    """
+    __tablename__ = "invoice_lines"
+
+    invoice_id = Column(Integer, ForeignKey("invoices.id", ondelete="CASCADE"), nullable=False, index=True)
+    position = Column(Integer, nullable=False)
+    source_type = Column(String(20), nullable=False)
+    source_id = Column(Integer, nullable=False)
+
+    invoice = relationship("Invoice", back_populates="lines")
+
+    __table_args__ = (
+        UniqueConstraint("source_type", "source_id", name="uq_invoice_lines_source"),
+    )
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer
+
+from backend.models.base import Base
+
+
+class InvoiceSequence(Base):
+    """
+    Last invoice sequence number issued per year.
+
+    Incremented in the same transaction that inserts the invoice, so a
+    rolled-back invoice also releases its number and the sequence stays
+    gap-free.
+    """
+    __tablename__ = "invoice_sequences"
+
+    year = Column(Integer, primary_key=True, autoincrement=False)
+    last_value = Column(Integer, nullable=False, default=0)
@@ -5,12 +5,14 @@ from backend.models.base import BaseModel
 class SessionNote(BaseModel):
     __tablename__ = "session_notes"
 
-    client_id = Column(Integer, ForeignKey("clients.id"), nullable=False)
+    client_id = Column(Integer, ForeignKey("clients.id", ondelete="CASCADE"), nullable=False)
     session_date = Column(Date, nullable=False)
     duration_minutes = Column(Integer, nullable=False)
     is_paid = Column(Boolean, default=False)
     content = Column(Text)
     personal_notes = Column(Text)
     session_type = Column(String(20), nullable=False, default="In-Person")
+    # Incremented on every write; used for optimistic concurrency (ETag / If-Match).
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     client = relationship("Client", back_populates="session_notes")
@@ -4,7 +4,7 @@ from backend.models.base import BaseModel
 class SupervisionNote(BaseModel):
     __tablename__ = "supervision_notes"
 
-    client_id = Column(Integer, ForeignKey("clients.id"), nullable=False)
+    client_id = Column(Integer, ForeignKey("clients.id", ondelete="CASCADE"), nullable=False)
     supervision_date = Column(Date, nullable=False)
     duration_minutes = Column(Integer, nullable=False, default=50)
     content = Column(Text)
@@ -12,3 +12,5 @@ class SupervisionNote(BaseModel):
     summary = Column(String(100), nullable=False, default="")
     supervisor_details = Column(String(255), nullable=False, default="")
     session_type = Column(String(20), nullable=False, default="Online")
+    # Incremented on every write; used for optimistic concurrency (ETag / If-Match).
+    version = Column(Integer, nullable=False, default=1, server_default="1")
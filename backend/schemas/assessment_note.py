@@ -21,11 +21,27 @@ class AssessmentNoteUpdate(AssessmentNoteBase):
     personal_notes: Optional[str] = None
     session_type: Optional[str] = None
 
+class AssessmentNoteBatchUpdate(AssessmentNoteUpdate):
+    id: int
+
 class AssessmentNoteResponse(AssessmentNoteBase):
     id: int
     client_id: int
+    version: int = 1
     created_at: datetime
     updated_at: Optional[datetime]
 
     class Config:
         from_attributes = True
+
+class AssessmentNoteSummary(BaseModel):
+    id: int
+    client_id: int
+    assessment_date: date
+    duration_minutes: int
+    is_paid: Optional[bool] = None
+    session_type: str = "Online"
+    updated_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
@@ -2,6 +2,8 @@ from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 from datetime import datetime, date
 from backend.models.client import ClientStatus
+from backend.schemas.session_note import SessionNoteSummary
+from backend.schemas.assessment_note import AssessmentNoteSummary
 
 class ClientBase(BaseModel):
     first_name: str
@@ -53,6 +55,53 @@ class ClientResponse(ClientBase):
     class Config:
         from_attributes = True
 
+class ClientSummary(BaseModel):
+    """Compact client projection for list views; only requested fields are populated."""
+    id: int
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    full_name: Optional[str] = None
+    client_code: Optional[str] = None
+    status: Optional[ClientStatus] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    date_of_birth: Optional[date] = None
+    initial_assessment_date: Optional[date] = None
+    session_hourly_rate: Optional[str] = None
+    therapy_modality: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
 class ClientWithNotes(ClientResponse):
     session_notes: List["SessionNoteResponse"] = []
     assessment_notes: List["AssessmentNoteResponse"] = []
+
+class ClientTotals(BaseModel):
+    session_total: int
+    supervision_total: int
+    session_count: int
+    supervision_count: int
+
+class UpcomingAppointment(BaseModel):
+    appointment_id: int
+    title: Optional[str] = None
+    start: datetime
+    end: datetime
+    is_exception: bool
+
+class ClientOverview(BaseModel):
+    client: ClientResponse
+    session_notes: List[SessionNoteSummary]
+    assessment_notes: List[AssessmentNoteSummary]
+    totals: ClientTotals
+    upcoming_appointments: List[UpcomingAppointment]
+
+class ClientImportError(BaseModel):
+    row: int
+    client_code: Optional[str] = None
+    errors: List[str]
+
+class ClientImportResult(BaseModel):
+    created: int
+    errors: List[ClientImportError]
@@ -1,4 +1,5 @@
-from datetime import datetime
+from datetime import date, datetime
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -12,3 +13,28 @@ class InvoiceResponse(BaseModel):
     pdf_url: str
     created_at: datetime
     was_created: bool
+    status: str
+    render_error: Optional[str] = None
+
+
+class InvoiceBatchError(BaseModel):
+    source_type: str
+    source_id: int
+    error: str
+
+
+class InvoiceBatchResult(BaseModel):
+    created: List[InvoiceResponse]
+    errors: List[InvoiceBatchError]
+
+
+class InvoiceSummary(BaseModel):
+    id: int
+    invoice_number: str
+    year: int
+    client_id: Optional[int] = None
+    invoice_date: Optional[date] = None
+    amount: Optional[str] = None
+    is_paid: bool
+    status: str
+    pdf_url: str
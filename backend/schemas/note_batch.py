@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+class NotePaidUpdate(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=500)
+    is_paid: bool = True
+
+class NotePaidResult(BaseModel):
+    updated: int
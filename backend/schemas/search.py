@@ -0,0 +1,15 @@
+from datetime import date
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class NoteSearchResult(BaseModel):
+    note_type: str
+    note_id: int
+    client_id: Optional[int] = None
+    client_name: Optional[str] = None
+    date: date
+    title: str = ""
+    snippet: str
+    rank: float
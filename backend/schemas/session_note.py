@@ -21,11 +21,27 @@ class SessionNoteUpdate(SessionNoteBase):
     personal_notes: Optional[str] = None
     session_type: Optional[str] = None
 
+class SessionNoteBatchUpdate(SessionNoteUpdate):
+    id: int
+
 class SessionNoteResponse(SessionNoteBase):
     id: int
     client_id: int
+    version: int = 1
     created_at: datetime
     updated_at: Optional[datetime]
 
     class Config:
         from_attributes = True
+
+class SessionNoteSummary(BaseModel):
+    id: int
+    client_id: int
+    session_date: date
+    duration_minutes: int
+    is_paid: Optional[bool] = None
+    session_type: str = "In-Person"
+    updated_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
@@ -17,6 +17,7 @@ class SupervisionNoteCreate(SupervisionNoteBase):
 
 class SupervisionNoteResponse(SupervisionNoteBase):
     id: int
+    version: int = 1
     created_at: datetime
     updated_at: Optional[datetime]
 
@@ -32,3 +33,6 @@ class SupervisionNoteUpdate(BaseModel):
     duration_minutes: Optional[int] = None
     client_id: Optional[int] = None
     session_type: Optional[str] = None
+
+class SupervisionNoteBatchUpdate(SupervisionNoteUpdate):
+    id: int
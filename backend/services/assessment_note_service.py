@@ -1,6 +1,9 @@
 from sqlalchemy.orm import Session
 from backend.models.assessment_note import AssessmentNote
-from backend.schemas.assessment_note import AssessmentNoteCreate, AssessmentNoteUpdate
+from backend.services.client_stats_service import ClientStatsService
+from backend.services.note_batch_service import NoteBatchService
+from backend.services.note_update_service import NoteUpdateService
+from backend.schemas.assessment_note import AssessmentNoteCreate, AssessmentNoteUpdate, AssessmentNoteBatchUpdate
 from typing import List, Optional
 
 class AssessmentNoteService:
@@ -19,18 +22,23 @@ class AssessmentNoteService:
     def create_assessment(db: Session, note: AssessmentNoteCreate) -> AssessmentNote:
         db_note = AssessmentNote(**note.dict())
         db.add(db_note)
+        db.flush()
+        ClientStatsService.refresh_clients(db, [db_note.client_id])
         db.commit()
         db.refresh(db_note)
         return db_note
 
     @staticmethod
-    def update_assessment(db: Session, assessment_id: int, update_data: AssessmentNoteUpdate) -> Optional[AssessmentNote]:
+    def update_assessment(db: Session, assessment_id: int, update_data: AssessmentNoteUpdate, expected_version: Optional[int] = None) -> Optional[AssessmentNote]:
+        """
+        Applies a partial update, writing only fields whose values changed.
+
+        Raises:
+            StaleNoteError: If `expected_version` is given and the note has moved on.
+        """
         db_note = db.query(AssessmentNote).filter(AssessmentNote.id == assessment_id).first()
         if db_note:
-            for field, value in update_data.dict(exclude_unset=True).items():
-                setattr(db_note, field, value)
-            db.commit()
-            db.refresh(db_note)
+            NoteUpdateService.apply_update(db, db_note, update_data.dict(exclude_unset=True), expected_version)
         return db_note
 
     @staticmethod
@@ -38,6 +46,20 @@ class AssessmentNoteService:
         db_note = db.query(AssessmentNote).filter(AssessmentNote.id == assessment_id).first()
         if db_note:
             db.delete(db_note)
+            db.flush()
+            ClientStatsService.refresh_clients(db, [db_note.client_id])
             db.commit()
             return True
         return False
+
+    @staticmethod
+    def create_assessments(db: Session, notes: List[AssessmentNoteCreate]) -> List[AssessmentNote]:
+        return NoteBatchService.create_many(db, AssessmentNote, notes)
+
+    @staticmethod
+    def update_assessments(db: Session, updates: List[AssessmentNoteBatchUpdate]) -> List[AssessmentNote]:
+        return NoteBatchService.update_many(db, AssessmentNote, updates)
+
+    @staticmethod
+    def set_assessments_paid(db: Session, note_ids: List[int], is_paid: bool = True) -> int:
+        return NoteBatchService.set_paid(db, AssessmentNote, note_ids, is_paid)
@@ -0,0 +1,197 @@
+"""
+Bulk client import and export.
+
+Imports validate every row with the same `ClientCreate` schema and
+normalisation as `ClientService.create_client`, but check client codes
+against an in-memory set and insert in batched transactions instead of
+one query and one commit per client.
+"""
+import codecs
+import csv
+import io
+import json
+import logging
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.models.client import Client
+from backend.schemas.client import ClientCreate
+from backend.services.client_service import ClientService
+
+logger = logging.getLogger(__name__)
+
+
+class ClientImportService:
+    """Streams clients in and out as CSV, JSON or JSON Lines."""
+
+    FORMATS = ("csv", "json", "jsonl")
+    BATCH_SIZE = 500
+    EXPORT_BATCH_SIZE = 1000
+    EXPORT_FIELDS = tuple(ClientCreate.model_fields)
+
+    @staticmethod
+    def detect_format(filename: str) -> str:
+        """Infers the import format from a file name's extension."""
+        extension = filename.rsplit(".", 1)[-1].lower() if filename and "." in filename else ""
+        if extension == "ndjson":
+            return "jsonl"
+        if extension not in ClientImportService.FORMATS:
+            raise ValueError(f"Unsupported import format. Allowed formats: {', '.join(ClientImportService.FORMATS)}.")
+        return extension
+
+    @staticmethod
+    def parse_rows(stream: BinaryIO, format: str) -> Iterator[Tuple[int, object]]:
+        """
+        Yields (row number, raw row) pairs from an uploaded file.
+
+        CSV and JSON Lines are read incrementally; a JSON document must be a
+        single array of client objects. CSV row numbers count the header as
+        row 1 so they match what a spreadsheet shows.
+
+        Raises:
+            ValueError: If the format is unknown or the document cannot be parsed.
+        """
+        text_stream = codecs.getreader("utf-8-sig")(stream)
+        if format == "csv":
+            for row_number, row in enumerate(csv.DictReader(text_stream), start=2):
+                # Spreadsheets export missing values as empty cells.
+                yield row_number, {key: (value if value != "" else None) for key, value in row.items() if key}
+        elif format == "jsonl":
+            for row_number, line in enumerate(text_stream, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield row_number, json.loads(line)
+                except json.JSONDecodeError as exc:
+                    yield row_number, exc
+        elif format == "json":
+            try:
+                document = json.load(text_stream)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"Invalid JSON document: {exc}")
+            if not isinstance(document, list):
+                raise ValueError("JSON imports must contain an array of clients.")
+            yield from enumerate(document, start=1)
+        else:
+            raise ValueError(f"Unsupported import format. Allowed formats: {', '.join(ClientImportService.FORMATS)}.")
+
+    @staticmethod
+    def _flush_batch(db: Session, batch: List[Tuple[int, Client]], errors: List[Dict]) -> int:
+        db.add_all(client for _, client in batch)
+        try:
+            db.commit()
+            return len(batch)
+        except IntegrityError:
+            # A concurrent writer took one of the codes; retry row by row so
+            # only the conflicting rows are reported.
+            db.rollback()
+        created = 0
+        for row_number, client in batch:
+            db.add(ClientImportService._copy(client))
+            try:
+                db.commit()
+                created += 1
+            except IntegrityError:
+                db.rollback()
+                errors.append({"row": row_number, "client_code": client.client_code, "errors": ["Client code already exists."]})
+        return created
+
+    @staticmethod
+    def _copy(client: Client) -> Client:
+        return Client(**{column.key: getattr(client, column.key) for column in Client.__table__.columns if column.key != "id"})
+
+    @staticmethod
+    def import_clients(db: Session, rows: Iterable[Tuple[int, object]]) -> Dict:
+        """
+        Validates and inserts clients, committing every `BATCH_SIZE` valid rows.
+
+        Invalid rows and rows whose client code already exists (in the
+        database or earlier in the file) are skipped and reported; all other
+        rows are imported.
+
+        Returns:
+            {"created": <count>, "errors": [{"row", "client_code", "errors"}, ...]}
+        """
+        existing_codes = {code for (code,) in db.query(Client.client_code).filter(Client.client_code.isnot(None))}
+        errors: List[Dict] = []
+        batch: List[Tuple[int, Client]] = []
+        created = 0
+
+        for row_number, raw in rows:
+            if isinstance(raw, Exception):
+                errors.append({"row": row_number, "client_code": None, "errors": [f"Invalid JSON: {raw}"]})
+                continue
+            client_code = raw.get("client_code") if isinstance(raw, dict) else None
+            try:
+                db_client = ClientService.build_client(ClientCreate.model_validate(raw))
+            except ValidationError as exc:
+                messages = [
+                    f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+                    for error in exc.errors()
+                ]
+                errors.append({"row": row_number, "client_code": client_code, "errors": messages})
+                continue
+            except ValueError as exc:
+                errors.append({"row": row_number, "client_code": client_code, "errors": [str(exc)]})
+                continue
+
+            if db_client.client_code in existing_codes:
+                errors.append({"row": row_number, "client_code": db_client.client_code, "errors": ["Client code already exists."]})
+                continue
+            existing_codes.add(db_client.client_code)
+            batch.append((row_number, db_client))
+            if len(batch) >= ClientImportService.BATCH_SIZE:
+                created += ClientImportService._flush_batch(db, batch, errors)
+                batch = []
+
+        if batch:
+            created += ClientImportService._flush_batch(db, batch, errors)
+        errors.sort(key=lambda error: error["row"])
+        logger.info(f"Imported {created} clients with {len(errors)} rejected rows")
+        return {"created": created, "errors": errors}
+
+    @staticmethod
+    def _export_records(db: Session, filter: str) -> Iterator[Dict]:
+        query = ClientService._apply_status_filter(db.query(Client), filter)
+        query = query.order_by(Client.first_name, Client.last_name, Client.id)
+        for client in query.yield_per(ClientImportService.EXPORT_BATCH_SIZE):
+            record = ClientCreate.model_construct(**{field: getattr(client, field) for field in ClientImportService.EXPORT_FIELDS})
+            yield record.model_dump(mode="json")
+
+    @staticmethod
+    def export_clients(db: Session, format: str = "csv", filter: str = "all") -> Iterator[str]:
+        """
+        Yields the selected clients as text chunks in an importable format.
+
+        Raises:
+            ValueError: If the format is unknown.
+        """
+        if format not in ClientImportService.FORMATS:
+            raise ValueError(f"Unsupported export format. Allowed formats: {', '.join(ClientImportService.FORMATS)}.")
+        return ClientImportService._export_chunks(db, format, filter)
+
+    @staticmethod
+    def _export_chunks(db: Session, format: str, filter: str) -> Iterator[str]:
+        records = ClientImportService._export_records(db, filter)
+        if format == "csv":
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=ClientImportService.EXPORT_FIELDS)
+            writer.writeheader()
+            for index, record in enumerate(records, start=1):
+                writer.writerow(record)
+                if index % ClientImportService.EXPORT_BATCH_SIZE == 0:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            yield buffer.getvalue()
+        elif format == "jsonl":
+            for record in records:
+                yield json.dumps(record) + "\n"
+        else:
+            yield "["
+            for index, record in enumerate(records):
+                yield ("," if index else "") + json.dumps(record)
+            yield "]"
@@ -6,11 +6,25 @@ such as retrieving, creating, updating, and deleting client records,
 as well as managing their archive status. It interacts with the
 database session and uses SQLAlchemy models and Pydantic schemas.
 """
-from sqlalchemy.orm import Session
+from sqlalchemy import Float, Integer, func, or_, text, tuple_, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, load_only, selectinload
+from backend.models.appointment import Appointment
+from backend.models.assessment_note import AssessmentNote
 from backend.models.client import Client, ClientStatus
-from backend.schemas.client import ClientCreate, ClientUpdate
-from typing import List, Optional
+from backend.models.client_stats import ClientStats
+from backend.models.session_note import SessionNote
+from backend.schemas.client import ClientCreate, ClientUpdate, ClientSummary
+from backend.services.calendar_service import CalendarService
+from backend.services.client_stats_service import ClientStatsService
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+import base64
+import json
 import logging
+import re
 from backend import constants # Import constants
 
 # Set up logging
@@ -20,11 +34,49 @@ logger = logging.getLogger(__name__)
 class ClientService:
     """Provides all business logic for client management."""
 
+    SEARCH_TABLE = "clients_fts"
+    SEARCH_COLUMNS = ("first_name", "last_name", "client_code", "email", "phone")
+    SEARCH_MAX_LIMIT = 100
+    # The trigram tokenizer cannot match terms shorter than three characters.
+    TRIGRAM_MIN_LENGTH = 3
+    _SEARCH_TERM_RE = re.compile(r"[^\s\"]+")
+    PROJECTABLE_FIELDS = tuple(ClientSummary.model_fields)
+    # Columns every projection loads: the keyset sort key and the parts of full_name.
+    _PROJECTION_BASE_COLUMNS = ("id", "first_name", "last_name")
+    OVERVIEW_UPCOMING_WINDOW = timedelta(days=28)
+    OVERVIEW_UPCOMING_LIMIT = 5
+    SORT_OPTIONS = ("name", "last_seen", "unpaid")
+
     @staticmethod
-    def get_clients(db: Session, filter: str = "active") -> List[Client]:
+    def _apply_status_filter(query, filter: str):
+        if filter == "active":
+            return query.filter(Client.status == ClientStatus.ACTIVE)
+        if filter == "waiting_list":
+            return query.filter(Client.status == ClientStatus.WAITING_LIST)
+        if filter == "archived":
+            return query.filter(Client.status == ClientStatus.ARCHIVED)
+        # if filter == "all", do not apply any filter
+        return query
+
+    @staticmethod
+    def get_clients(
+        db: Session,
+        filter: str = "active",
+        fields: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str, int]] = None,
+        sort: str = "name",
+        has_unpaid: Optional[bool] = None,
+    ) -> List[Client]:
         """
         Retrieves a list of clients based on the specified filter.
 
+        By default clients are ordered by (first_name, last_name, id), which
+        doubles as the keyset for pagination: pass the sort key of the last
+        client of a page as `after` to fetch the next one. The "last_seen" and
+        "unpaid" orders read the indexed `client_stats` counters instead of
+        aggregating the note tables.
+
         Args:
             db: The database session.
             filter: A string indicating how to filter clients.
@@ -32,19 +84,170 @@ class ClientService:
                 "waiting_list": Returns only waiting list clients.
                 "archived": Returns only archived clients.
                 "all": Returns all clients.
+            fields: Optional subset of `PROJECTABLE_FIELDS`; only those columns
+                (plus the sort key) are loaded from the database.
+            limit: Optional maximum number of clients to return.
+            after: Optional (first_name, last_name, id) keyset cursor; only
+                supported with the "name" sort.
+            sort: One of `SORT_OPTIONS`: "name" (default), "last_seen" (most
+                recent session or assessment first) or "unpaid" (most unpaid
+                notes first).
+            has_unpaid: If set, keep only clients with (True) or without
+                (False) unpaid session or assessment notes.
 
         Returns:
             A list of Client model instances.
+
+        Raises:
+            ValueError: If `fields` contains an unknown field name, `sort` is
+                unknown, or `after` is combined with a non-name sort.
         """
-        query = db.query(Client)
-        if filter == "active":
-            query = query.filter(Client.status == ClientStatus.ACTIVE)
-        elif filter == "waiting_list":
-            query = query.filter(Client.status == ClientStatus.WAITING_LIST)
-        elif filter == "archived":
-            query = query.filter(Client.status == ClientStatus.ARCHIVED)
-        # if filter == "all", do not apply any filter
-        return query.order_by(Client.first_name, Client.last_name).all()
+        if sort not in ClientService.SORT_OPTIONS:
+            raise ValueError(f"Unknown sort: {sort}. Allowed sorts: {', '.join(ClientService.SORT_OPTIONS)}.")
+        if after is not None and sort != "name":
+            raise ValueError("Cursor pagination is only supported when sorting by name.")
+
+        query = ClientService._apply_status_filter(db.query(Client), filter)
+        if sort != "name" or has_unpaid is not None:
+            # Clients without notes have no stats row yet.
+            query = query.outerjoin(ClientStats, ClientStats.client_id == Client.id)
+            unpaid_count = func.coalesce(ClientStats.unpaid_count, 0)
+            if has_unpaid is not None:
+                query = query.filter(unpaid_count > 0 if has_unpaid else unpaid_count == 0)
+        if fields is not None:
+            unknown = [field for field in fields if field not in ClientService.PROJECTABLE_FIELDS]
+            if unknown:
+                raise ValueError(
+                    f"Unknown client field(s): {', '.join(unknown)}. "
+                    f"Allowed fields: {', '.join(ClientService.PROJECTABLE_FIELDS)}."
+                )
+            columns = dict.fromkeys(ClientService._PROJECTION_BASE_COLUMNS + tuple(f for f in fields if f != "full_name"))
+            query = query.options(load_only(*(getattr(Client, column) for column in columns)))
+        if after is not None:
+            query = query.filter(tuple_(Client.first_name, Client.last_name, Client.id) > tuple_(*after))
+        if sort == "last_seen":
+            query = query.order_by(ClientStats.last_session_date.desc().nulls_last())
+        elif sort == "unpaid":
+            query = query.order_by(unpaid_count.desc())
+        query = query.order_by(Client.first_name, Client.last_name, Client.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    @staticmethod
+    def encode_cursor(client: Client) -> str:
+        """Encodes the keyset position of `client` as an opaque cursor string."""
+        raw = json.dumps([client.first_name, client.last_name, client.id]).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[str, str, int]:
+        """
+        Decodes a cursor produced by `encode_cursor`.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        try:
+            first_name, last_name, client_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        except (ValueError, TypeError, UnicodeError) as exc:
+            raise ValueError("Invalid pagination cursor.") from exc
+        if not isinstance(client_id, int):
+            raise ValueError("Invalid pagination cursor.")
+        return first_name, last_name, client_id
+
+    @staticmethod
+    def ensure_search_index(conn: Connection) -> None:
+        """
+        Creates the trigram FTS5 index over client names and contact details.
+
+        The index is kept in sync by triggers on the clients table and is
+        backfilled from existing rows the first time it is created. Each index
+        row uses the client ID as its rowid.
+
+        Args:
+            conn: An open connection inside a transaction.
+        """
+        table = ClientService.SEARCH_TABLE
+        columns = ", ".join(ClientService.SEARCH_COLUMNS)
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": table},
+        ).first()
+        if not exists:
+            conn.execute(text(f"CREATE VIRTUAL TABLE {table} USING fts5({columns}, tokenize = 'trigram')"))
+
+        def values(row: str) -> str:
+            return ", ".join([f"{row}.id"] + [f"coalesce({row}.{column}, '')" for column in ClientService.SEARCH_COLUMNS])
+
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS clients_fts_insert AFTER INSERT ON clients BEGIN "
+            f"INSERT INTO {table} (rowid, {columns}) VALUES ({values('new')}); END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS clients_fts_delete AFTER DELETE ON clients BEGIN "
+            f"DELETE FROM {table} WHERE rowid = old.id; END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS clients_fts_update AFTER UPDATE OF {columns} ON clients BEGIN "
+            f"DELETE FROM {table} WHERE rowid = old.id; "
+            f"INSERT INTO {table} (rowid, {columns}) VALUES ({values('new')}); END"
+        ))
+        if not exists:
+            conn.execute(text(f"INSERT INTO {table} (rowid, {columns}) SELECT {values('clients')} FROM clients"))
+
+    @staticmethod
+    def search_clients(db: Session, query: str, filter: str = "active", limit: int = 20) -> List[Client]:
+        """
+        Searches clients by name, client code, email or phone.
+
+        Terms of three or more characters are matched as substrings through the
+        trigram index and ranked by bm25; shorter terms are applied as prefix
+        filters on name and client code.
+
+        Args:
+            db: The database session.
+            query: Free-text search input.
+            filter: Status filter, as accepted by `get_clients`.
+            limit: Maximum number of clients to return.
+
+        Returns:
+            Up to `limit` matching Client model instances, best matches first.
+        """
+        terms = ClientService._SEARCH_TERM_RE.findall(query or "")
+        if not terms:
+            return []
+        limit = max(1, min(limit, ClientService.SEARCH_MAX_LIMIT))
+
+        trigram_terms = [term for term in terms if len(term) >= ClientService.TRIGRAM_MIN_LENGTH]
+        prefix_terms = [term for term in terms if len(term) < ClientService.TRIGRAM_MIN_LENGTH]
+
+        client_query = ClientService._apply_status_filter(db.query(Client), filter)
+        for term in prefix_terms:
+            pattern = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            client_query = client_query.filter(or_(
+                Client.first_name.like(pattern, escape="\\"),
+                Client.last_name.like(pattern, escape="\\"),
+                Client.client_code.like(pattern, escape="\\"),
+            ))
+
+        if not trigram_terms:
+            return client_query.order_by(Client.first_name, Client.last_name).limit(limit).all()
+
+        table = ClientService.SEARCH_TABLE
+        match = " AND ".join(f'"{term}"' for term in trigram_terms)
+        matches = (
+            text(f"SELECT rowid AS client_id, bm25({table}) AS score FROM {table} WHERE {table} MATCH :match")
+            .bindparams(match=match)
+            .columns(client_id=Integer, score=Float)
+            .subquery("client_matches")
+        )
+        return (
+            client_query.join(matches, matches.c.client_id == Client.id)
+            .order_by(matches.c.score, Client.first_name, Client.last_name)
+            .limit(limit)
+            .all()
+        )
 
     @staticmethod
     def get_client_by_id(db: Session, client_id: int) -> Optional[Client]:
@@ -60,6 +263,128 @@ class ClientService:
         """
         return db.query(Client).filter(Client.id == client_id).first()
 
+    @staticmethod
+    def get_client_overview(db: Session, client_id: int, reference_time: Optional[datetime] = None) -> Optional[Dict]:
+        """
+        Gathers everything the client view needs in one call.
+
+        Note summaries are loaded without their content or personal notes, and
+        totals are read from the client's `client_stats` row instead of
+        re-aggregating. The whole overview costs six SELECTs regardless of how
+        many notes or appointments the client has.
+
+        Args:
+            db: The database session.
+            client_id: The ID of the client.
+            reference_time: Start of the upcoming-appointments window; defaults to now.
+
+        Returns:
+            A dict matching the ClientOverview schema, or None if the client does not exist.
+        """
+        client = db.query(Client).filter(Client.id == client_id).first()
+        if not client:
+            return None
+
+        session_notes = (
+            db.query(SessionNote)
+            .options(load_only(
+                SessionNote.id, SessionNote.client_id, SessionNote.session_date, SessionNote.duration_minutes,
+                SessionNote.is_paid, SessionNote.session_type, SessionNote.updated_at
+            ))
+            .filter(SessionNote.client_id == client_id)
+            .order_by(SessionNote.session_date.desc())
+            .all()
+        )
+        assessment_notes = (
+            db.query(AssessmentNote)
+            .options(load_only(
+                AssessmentNote.id, AssessmentNote.client_id, AssessmentNote.assessment_date,
+                AssessmentNote.duration_minutes, AssessmentNote.is_paid, AssessmentNote.session_type,
+                AssessmentNote.updated_at
+            ))
+            .filter(AssessmentNote.client_id == client_id)
+            .order_by(AssessmentNote.assessment_date.desc())
+            .all()
+        )
+        totals = ClientStatsService.get_totals(db, client_id)
+
+        now = reference_time or datetime.now()
+        window_end = now + ClientService.OVERVIEW_UPCOMING_WINDOW
+        appointments = (
+            db.query(Appointment)
+            .options(selectinload(Appointment.exceptions))
+            .filter(Appointment.client_id == client_id, Appointment.is_active.is_(True))
+            .all()
+        )
+        upcoming = []
+        for appointment in appointments:
+            occurrences = CalendarService._expand_occurrences_for_appointment(appointment, now, window_end)
+            for occurrence in CalendarService._apply_exceptions(appointment, occurrences):
+                if occurrence["status"] == "CANCELLED" or occurrence["end"] <= now:
+                    continue
+                upcoming.append({
+                    "appointment_id": appointment.id,
+                    "title": appointment.title,
+                    "start": occurrence["start"],
+                    "end": occurrence["end"],
+                    "is_exception": occurrence["is_exception"],
+                })
+        upcoming.sort(key=lambda item: item["start"])
+
+        return {
+            "client": client,
+            "session_notes": session_notes,
+            "assessment_notes": assessment_notes,
+            "totals": totals,
+            "upcoming_appointments": upcoming[:ClientService.OVERVIEW_UPCOMING_LIMIT],
+        }
+
+    @staticmethod
+    def _raise_for_duplicate_code(exc: IntegrityError):
+        """Re-raises a client_code unique violation as the user-facing ValueError."""
+        if "client_code" in str(exc.orig):
+            raise ValueError("Client code already exists.") from exc
+        raise exc
+
+    @staticmethod
+    def build_client(client: ClientCreate) -> Client:
+        """
+        Builds an unsaved Client from creation data, normalising the client
+        code, rate and modality the same way for single and bulk creation.
+
+        Raises:
+            ValueError: If the client code or session rate is blank.
+        """
+        client_code = client.client_code.strip() if client.client_code else None
+        if not client_code:
+            raise ValueError("Client code is required.")
+        session_hourly_rate = client.session_hourly_rate.strip() if client.session_hourly_rate else ""
+        if not session_hourly_rate:
+            raise ValueError("Session/Hourly Rate is required.")
+
+        return Client(
+            first_name=client.first_name,
+            last_name=client.last_name,
+            client_code=client_code,
+            email=client.email,
+            phone=client.phone,
+            date_of_birth=client.date_of_birth,
+            initial_assessment_date=client.initial_assessment_date,
+            session_hourly_rate=session_hourly_rate,
+            therapy_modality=(client.therapy_modality.strip() if client.therapy_modality else None),
+            address1=client.address1,
+            address2=client.address2,
+            city=client.city,
+            postcode=client.postcode,
+            emergency_contact_name=client.emergency_contact_name,
+            emergency_contact_relationship=client.emergency_contact_relationship,
+            emergency_contact_phone=client.emergency_contact_phone,
+            gp_name=client.gp_name,
+            gp_practice=client.gp_practice,
+            gp_phone=client.gp_phone,
+            status=client.status or ClientStatus.ACTIVE
+        )
+
     @staticmethod
     def create_client(db: Session, client: ClientCreate) -> Client:
         """
@@ -78,41 +403,12 @@ class ClientService:
         try:
             # Using .model_dump() as .dict() is deprecated in Pydantic v2
             logger.info(f"Creating new client: {client.model_dump()}")
-            client_code = client.client_code.strip() if client.client_code else None
-            if not client_code:
-                raise ValueError("Client code is required.")
-            session_hourly_rate = client.session_hourly_rate.strip() if client.session_hourly_rate else ""
-            if not session_hourly_rate:
-                raise ValueError("Session/Hourly Rate is required.")
-
-            existing_client = db.query(Client).filter(Client.client_code == client_code).first()
-            if existing_client:
-                raise ValueError("Client code already exists.")
-
-            db_client = Client(
-                first_name=client.first_name,
-                last_name=client.last_name,
-                client_code=client_code,
-                email=client.email,
-                phone=client.phone,
-                date_of_birth=client.date_of_birth,
-                initial_assessment_date=client.initial_assessment_date,
-                session_hourly_rate=session_hourly_rate,
-                therapy_modality=(client.therapy_modality.strip() if client.therapy_modality else None),
-                address1=client.address1,
-                address2=client.address2,
-                city=client.city,
-                postcode=client.postcode,
-                emergency_contact_name=client.emergency_contact_name,
-                emergency_contact_relationship=client.emergency_contact_relationship,
-                emergency_contact_phone=client.emergency_contact_phone,
-                gp_name=client.gp_name,
-                gp_practice=client.gp_practice,
-                gp_phone=client.gp_phone,
-                status=client.status or ClientStatus.ACTIVE
-            )
+            db_client = ClientService.build_client(client)
             db.add(db_client)
-            db.commit()
+            try:
+                db.commit()
+            except IntegrityError as exc:
+                ClientService._raise_for_duplicate_code(exc)
             db.refresh(db_client)
             logger.info(f"{constants.LOG_MSG_SUCCESSFULLY_CREATED_CLIENT}: {db_client.id}")
             return db_client
@@ -121,6 +417,57 @@ class ClientService:
             db.rollback()
             raise
 
+    @staticmethod
+    def upsert_client(db: Session, client: ClientCreate) -> Client:
+        """
+        Creates or updates the client identified by `client.client_code`.
+
+        Runs as a single INSERT ... ON CONFLICT(client_code) DO UPDATE, so
+        concurrent sync requests cannot create duplicates. On conflict only the
+        fields present in the payload are written, and only when one of them
+        differs; repeating a request leaves the row (and `updated_at`) untouched.
+
+        Args:
+            db: The database session.
+            client: A ClientCreate schema object; `client_code` is the sync key.
+
+        Returns:
+            The created or updated Client model instance.
+
+        Raises:
+            ValueError: If the client code or session rate is blank.
+        """
+        try:
+            db_client = ClientService.build_client(client)
+            values = {
+                column.key: getattr(db_client, column.key)
+                for column in Client.__table__.columns
+                if column.key not in ("id", "created_at", "updated_at")
+            }
+            updated_fields = [field for field in client.model_fields_set if field != "client_code"]
+            statement = insert(Client).values(**values)
+            statement = statement.on_conflict_do_update(
+                index_elements=[Client.client_code],
+                set_={
+                    **{field: statement.excluded[field] for field in updated_fields},
+                    "updated_at": func.now(),
+                },
+                where=or_(*(getattr(Client, field).is_not(statement.excluded[field]) for field in updated_fields)),
+            )
+            db.execute(statement)
+            db.commit()
+            logger.info(f"Upserted client with code {db_client.client_code}")
+            return (
+                db.query(Client)
+                .filter(Client.client_code == db_client.client_code)
+                .populate_existing()
+                .one()
+            )
+        except Exception as e:
+            logger.error(f"{constants.LOG_MSG_ERROR_CREATING_CLIENT}: {str(e)}")
+            db.rollback()
+            raise
+
     @staticmethod
     def update_client(db: Session, client_id: int, update_data: ClientUpdate) -> Optional[Client]:
         """
@@ -148,14 +495,6 @@ class ClientService:
                     if client_code is not None:
                         client_code = client_code.strip()
                         update_dict["client_code"] = client_code or None
-                    if client_code:
-                        existing_client = (
-                            db.query(Client)
-                            .filter(Client.client_code == client_code, Client.id != client_id)
-                            .first()
-                        )
-                        if existing_client:
-                            raise ValueError("Client code already exists.")
                 if "session_hourly_rate" in update_dict:
                     session_hourly_rate = update_dict["session_hourly_rate"]
                     session_hourly_rate = session_hourly_rate.strip() if session_hourly_rate is not None else ""
@@ -168,7 +507,10 @@ class ClientService:
                 for field, value in update_dict.items():
                     if field != 'id':
                         setattr(db_client, field, value)
-                db.commit()
+                try:
+                    db.commit()
+                except IntegrityError as exc:
+                    ClientService._raise_for_duplicate_code(exc)
                 db.refresh(db_client)
                 logger.info(f"{constants.LOG_MSG_SUCCESSFULLY_UPDATED_CLIENT} {client_id}")
                 return db_client
@@ -182,7 +524,8 @@ class ClientService:
     @staticmethod
     def set_archive_status(db: Session, client_id: int, archive: bool) -> Optional[Client]:
         """
-        Sets the archive status of a client.
+        Sets the archive status of a client. Archiving also deactivates the
+        client's appointment series.
 
         Args:
             db: The database session.
@@ -200,6 +543,8 @@ class ClientService:
             db_client = db.query(Client).filter(Client.id == client_id).first()
             if db_client:
                 db_client.status = ClientStatus.ARCHIVED if archive else ClientStatus.ACTIVE
+                if archive:
+                    ClientService._deactivate_appointments(db, [client_id])
                 db.commit()
                 db.refresh(db_client)
                 logger.info(f"{constants.LOG_MSG_SUCCESSFULLY_UPDATED_ARCHIVE_STATUS} {client_id}")
@@ -211,6 +556,59 @@ class ClientService:
             db.rollback()
             raise
 
+    @staticmethod
+    def _deactivate_appointments(db: Session, client_ids: Sequence[int]) -> int:
+        """Deactivates all active appointments of the given clients with one UPDATE."""
+        result = db.execute(
+            update(Appointment)
+            .where(Appointment.client_id.in_(client_ids), Appointment.is_active.is_(True))
+            .values(is_active=False, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    @staticmethod
+    def set_status_bulk(db: Session, client_ids: Sequence[int], status: ClientStatus) -> Dict:
+        """
+        Sets the status of many clients in one transaction.
+
+        Uses set-based UPDATE statements: one for the clients and, when
+        archiving, one deactivating all of their appointment series.
+
+        Args:
+            db: The database session.
+            client_ids: IDs of the clients to update.
+            status: The new status.
+
+        Returns:
+            {"updated": <clients changed>, "deactivated_appointments": <count>,
+             "missing_ids": [ids that do not exist]}
+
+        Raises:
+            Exception: If there's an error during the status update.
+        """
+        client_ids = sorted(set(client_ids))
+        try:
+            logger.info(f"Setting status {status.value} for {len(client_ids)} clients")
+            found_ids = {client_id for (client_id,) in db.query(Client.id).filter(Client.id.in_(client_ids))}
+            updated = db.execute(
+                update(Client)
+                .where(Client.id.in_(client_ids), Client.status.is_distinct_from(status))
+                .values(status=status, updated_at=func.now())
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            deactivated = ClientService._deactivate_appointments(db, client_ids) if status == ClientStatus.ARCHIVED else 0
+            db.commit()
+            return {
+                "updated": updated,
+                "deactivated_appointments": deactivated,
+                "missing_ids": [client_id for client_id in client_ids if client_id not in found_ids],
+            }
+        except Exception as e:
+            logger.error(f"{constants.LOG_MSG_ERROR_UPDATING_ARCHIVE_STATUS} {client_ids}: {str(e)}")
+            db.rollback()
+            raise
+
     @staticmethod
     def delete_client(db: Session, client_id: int) -> Optional[Client]:
         """
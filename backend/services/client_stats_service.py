@@ -0,0 +1,144 @@
+import logging
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from backend.models.assessment_note import AssessmentNote
+from backend.models.client import Client
+from backend.models.client_stats import ClientStats
+from backend.models.session_note import SessionNote
+from backend.models.supervision_note import SupervisionNote
+
+logger = logging.getLogger(__name__)
+
+
+class ClientStatsService:
+    """Maintains the denormalized `client_stats` rows from the note tables."""
+
+    STAT_COLUMNS = (
+        "session_minutes",
+        "session_count",
+        "unpaid_count",
+        "last_session_date",
+        "supervision_minutes",
+        "supervision_count",
+    )
+
+    @staticmethod
+    def _stat_expressions(client_id) -> Dict:
+        """Scalar subqueries computing every stat for `client_id` (a literal or a correlated column)."""
+        def scalar(column, model, *conditions):
+            return select(column).where(model.client_id == client_id, *conditions).scalar_subquery()
+
+        last_session = scalar(func.max(SessionNote.session_date), SessionNote)
+        last_assessment = scalar(func.max(AssessmentNote.assessment_date), AssessmentNote)
+        return {
+            "session_minutes": (
+                scalar(func.coalesce(func.sum(SessionNote.duration_minutes), 0), SessionNote)
+                + scalar(func.coalesce(func.sum(AssessmentNote.duration_minutes), 0), AssessmentNote)
+            ),
+            "session_count": scalar(func.count(SessionNote.id), SessionNote) + scalar(func.count(AssessmentNote.id), AssessmentNote),
+            "unpaid_count": (
+                scalar(func.count(SessionNote.id), SessionNote, SessionNote.is_paid == False)
+                + scalar(func.count(AssessmentNote.id), AssessmentNote, AssessmentNote.is_paid == False)
+            ),
+            # SQLite's multi-argument max() is NULL if any argument is NULL.
+            "last_session_date": func.max(
+                func.coalesce(last_session, last_assessment),
+                func.coalesce(last_assessment, last_session),
+            ),
+            "supervision_minutes": scalar(func.coalesce(func.sum(SupervisionNote.duration_minutes), 0), SupervisionNote),
+            "supervision_count": scalar(func.count(SupervisionNote.id), SupervisionNote),
+        }
+
+    @staticmethod
+    def get_totals(db: Session, client_id: int) -> Dict[str, int]:
+        """
+        Returns the client's note totals from its stats row: session figures
+        (session + assessment notes) and supervision figures. Clients without
+        a row (no notes yet) get zeros.
+        """
+        row = (
+            db.query(
+                ClientStats.session_minutes, ClientStats.session_count,
+                ClientStats.supervision_minutes, ClientStats.supervision_count,
+            )
+            .filter(ClientStats.client_id == client_id)
+            .first()
+        )
+        if row is None:
+            return {"session_total": 0, "supervision_total": 0, "session_count": 0, "supervision_count": 0}
+        return {
+            "session_total": row.session_minutes,
+            "supervision_total": row.supervision_minutes,
+            "session_count": row.session_count,
+            "supervision_count": row.supervision_count,
+        }
+
+    @staticmethod
+    def refresh_clients(db: Session, client_ids: Iterable[Optional[int]]) -> None:
+        """
+        Recomputes the stats rows of the given clients inside the caller's transaction.
+
+        Each client costs a single upsert that reads only that client's notes.
+        Call it after flushing note changes and before committing.
+        """
+        for client_id in sorted({cid for cid in client_ids if cid is not None}):
+            values = ClientStatsService._stat_expressions(literal(client_id))
+            statement = insert(ClientStats).values(client_id=client_id, **values)
+            statement = statement.on_conflict_do_update(
+                index_elements=[ClientStats.client_id],
+                set_={
+                    **{column: statement.excluded[column] for column in ClientStatsService.STAT_COLUMNS},
+                    "updated_at": func.now(),
+                },
+            )
+            db.execute(statement)
+
+    @staticmethod
+    def _expected_rows():
+        values = ClientStatsService._stat_expressions(Client.id)
+        return select(Client.id.label("client_id"), *(values[column].label(column) for column in ClientStatsService.STAT_COLUMNS))
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """Recomputes every client's stats from the note tables. Returns the number of rows written."""
+        db.query(ClientStats).delete(synchronize_session=False)
+        result = db.execute(
+            insert(ClientStats).from_select(("client_id", *ClientStatsService.STAT_COLUMNS), ClientStatsService._expected_rows())
+        )
+        db.commit()
+        logger.info(f"Rebuilt client stats for {result.rowcount} clients")
+        return result.rowcount
+
+    @staticmethod
+    def check_consistency(db: Session) -> List[Dict]:
+        """
+        Compares stored stats with values recomputed from the note tables.
+
+        Returns:
+            One entry per client whose stored totals differ, with the
+            `expected` and `stored` values of the mismatching columns.
+        """
+        stored = {row.client_id: row for row in db.query(ClientStats).all()}
+        mismatches = []
+        for expected in db.execute(ClientStatsService._expected_rows()):
+            row = stored.get(expected.client_id)
+            differences = {}
+            for column in ClientStatsService.STAT_COLUMNS:
+                expected_value = getattr(expected, column)
+                if column == "last_session_date" and isinstance(expected_value, str):
+                    expected_value = date.fromisoformat(expected_value)
+                if row is not None:
+                    stored_value = getattr(row, column)
+                else:
+                    # Clients without notes have no row yet; that reads as all-zero totals.
+                    stored_value = None if column == "last_session_date" else 0
+                if expected_value != stored_value:
+                    differences[column] = {"expected": expected_value, "stored": stored_value}
+            if differences:
+                mismatches.append({"client_id": expected.client_id, "differences": differences})
+        return mismatches
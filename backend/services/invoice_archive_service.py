@@ -0,0 +1,95 @@
+import csv
+import io
+import os
+import zipfile
+from typing import Iterator, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.models.client import Client
+from backend.models.invoice import Invoice
+from backend.services.invoice_index_service import InvoiceIndexService
+from backend.services.invoice_service import InvoiceService
+
+
+class _ZipSink(io.RawIOBase):
+    """Unseekable write target that hands zipfile's output back in chunks."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class InvoiceArchiveService:
+    """Builds a streamed ZIP of a year's invoice PDFs plus a CSV manifest."""
+
+    MANIFEST_NAME = "manifest.csv"
+    MANIFEST_FIELDS = ["invoice_number", "invoice_date", "client_id", "client_name", "amount", "is_paid", "status", "file"]
+
+    @staticmethod
+    def stream_archive(db: Session, year: int) -> Iterator[bytes]:
+        """
+        Returns the ZIP archive for `year` as a byte-chunk iterator.
+
+        Missing, failed or stale PDFs are queued for re-rendering (in a process
+        pool for larger sets) before streaming starts; PDFs that are already
+        current are streamed while the others render. Only one PDF is held in
+        memory at a time.
+
+        Raises:
+            ValueError: If the therapist details are missing or incomplete.
+        """
+        rows = (
+            db.query(Invoice, Client.first_name, Client.last_name)
+            .outerjoin(Client, Client.id == Invoice.client_id)
+            .filter(Invoice.year == year)
+            .order_by(Invoice.sequence_number)
+            .all()
+        )
+        InvoiceService.refresh_pdfs(db, [invoice for invoice, _, _ in rows])
+        # Current PDFs first, so the download starts before any re-render finishes.
+        rows.sort(key=lambda row: InvoiceService.get_render_future(row[0].id) is not None)
+        return InvoiceArchiveService._archive_chunks(db, rows)
+
+    @staticmethod
+    def _archive_chunks(db: Session, rows: List[Tuple[Invoice, str, str]]) -> Iterator[bytes]:
+        sink = _ZipSink()
+        entries = []
+        with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for invoice, first_name, last_name in rows:
+                future = InvoiceService.get_render_future(invoice.id)
+                if future is not None:
+                    future.result()
+                    db.refresh(invoice)
+                file_name = f"{invoice.invoice_number}.pdf" if os.path.exists(invoice.pdf_path) else ""
+                if file_name:
+                    archive.write(invoice.pdf_path, arcname=file_name)
+                    yield sink.take()
+                entries.append((invoice.sequence_number, {
+                    "invoice_number": invoice.invoice_number,
+                    "invoice_date": invoice.invoice_date.isoformat() if invoice.invoice_date else "",
+                    "client_id": invoice.client_id or "",
+                    "client_name": f"{first_name} {last_name}" if first_name is not None else "",
+                    "amount": InvoiceIndexService.format_amount(invoice.amount_minor) or "",
+                    "is_paid": "yes" if invoice.is_paid else "no",
+                    "status": invoice.status.value,
+                    "file": file_name,
+                }))
+            # The manifest lists invoices in number order, whatever order the PDFs were written in.
+            manifest = io.StringIO()
+            writer = csv.DictWriter(manifest, fieldnames=InvoiceArchiveService.MANIFEST_FIELDS)
+            writer.writeheader()
+            writer.writerows(entry for _, entry in sorted(entries, key=lambda item: item[0]))
+            archive.writestr(InvoiceArchiveService.MANIFEST_NAME, manifest.getvalue())
+        yield sink.take()
@@ -0,0 +1,113 @@
+import re
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, exists, or_, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from backend.models.assessment_note import AssessmentNote
+from backend.models.invoice import Invoice
+from backend.models.invoice_line import InvoiceLine
+from backend.models.session_note import SessionNote
+
+
+class InvoiceIndexService:
+    """
+    Listing of invoices from the denormalized columns on `invoices`, and upkeep
+    of the paid flag when the underlying notes are marked paid or unpaid.
+    """
+
+    SOURCE_TYPES = {SessionNote: "session", AssessmentNote: "assessment"}
+    INVOICE_NUMBER_PATTERN = re.compile(r"^INV-(\d{4})-(\d+)$")
+
+    @staticmethod
+    def format_amount(amount_minor: Optional[int]) -> Optional[str]:
+        """Formats a stored total in minor units as e.g. "60.00"."""
+        if amount_minor is None:
+            return None
+        return f"{amount_minor // 100}.{amount_minor % 100:02d}"
+
+    @staticmethod
+    def parse_invoice_number(invoice_number: str) -> Tuple[int, int]:
+        """
+        Returns the (year, sequence_number) of an invoice number such as INV-2025-0042.
+
+        Raises:
+            ValueError: If the value is not an invoice number.
+        """
+        match = InvoiceIndexService.INVOICE_NUMBER_PATTERN.match((invoice_number or "").strip().upper())
+        if not match:
+            raise ValueError(f"Invalid invoice number: {invoice_number}")
+        return int(match.group(1)), int(match.group(2))
+
+    @staticmethod
+    def list_invoices(
+        db: Session,
+        year: Optional[int] = None,
+        client_id: Optional[int] = None,
+        is_paid: Optional[bool] = None,
+        number_from: Optional[str] = None,
+        number_to: Optional[str] = None,
+        limit: int = 50,
+        after: Optional[str] = None,
+    ) -> List[Invoice]:
+        """
+        Returns invoices newest first (by year and sequence number).
+
+        Args:
+            db: The database session.
+            year: Optional invoice year.
+            client_id: Optional client.
+            is_paid: If set, keep only paid (True) or unpaid (False) invoices.
+            number_from: Optional first invoice number of the range (inclusive).
+            number_to: Optional last invoice number of the range (inclusive).
+            limit: Page size.
+            after: Invoice number of the last invoice of the previous page.
+
+        Raises:
+            ValueError: If an invoice number argument is invalid.
+        """
+        number = tuple_(Invoice.year, Invoice.sequence_number)
+        query = db.query(Invoice)
+        if year is not None:
+            query = query.filter(Invoice.year == year)
+        if client_id is not None:
+            query = query.filter(Invoice.client_id == client_id)
+        if is_paid is not None:
+            query = query.filter(Invoice.is_paid == is_paid)
+        if number_from:
+            query = query.filter(number >= InvoiceIndexService.parse_invoice_number(number_from))
+        if number_to:
+            query = query.filter(number <= InvoiceIndexService.parse_invoice_number(number_to))
+        if after:
+            query = query.filter(number < InvoiceIndexService.parse_invoice_number(after))
+        return (
+            query.order_by(Invoice.year.desc(), Invoice.sequence_number.desc())
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def sync_paid(db: Session, model, note_ids: Sequence[int]) -> None:
+        """
+        Recomputes `is_paid` (all lines paid) for the invoices billing the given
+        notes. Runs in the caller's transaction; notes of other models are ignored.
+        """
+        source_type = InvoiceIndexService.SOURCE_TYPES.get(model)
+        if source_type is None or not note_ids:
+            return
+        unpaid_line = or_(*(
+            and_(
+                InvoiceLine.source_type == line_type,
+                exists().where(line_model.id == InvoiceLine.source_id, line_model.is_paid.is_not(True)),
+            )
+            for line_model, line_type in InvoiceIndexService.SOURCE_TYPES.items()
+        ))
+        affected = select(InvoiceLine.invoice_id).where(
+            InvoiceLine.source_type == source_type, InvoiceLine.source_id.in_(set(note_ids))
+        )
+        db.execute(
+            update(Invoice)
+            .where(Invoice.id.in_(affected))
+            .values(is_paid=~exists().where(InvoiceLine.invoice_id == Invoice.id, unpaid_line))
+            .execution_options(synchronize_session=False)
+        )
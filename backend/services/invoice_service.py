@@ -1,23 +1,53 @@
+import functools
+import hashlib
+import json
+import logging
 import os
 import re
-from dataclasses import dataclass
+import threading
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from datetime import date
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
-from typing import Tuple
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
-from sqlalchemy import func
+from sqlalchemy import and_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, sessionmaker
 
 from backend.config import APP_DATA_DIR
 from backend.models.assessment_note import AssessmentNote
-from backend.models.invoice import Invoice
+from backend.models.client import Client
+from backend.models.invoice import Invoice, InvoiceStatus
+from backend.models.invoice_line import InvoiceLine
+from backend.models.invoice_sequence import InvoiceSequence
 from backend.models.session_note import SessionNote
 from backend.services.therapist_detail_service import TherapistDetailService
 
+logger = logging.getLogger(__name__)
+
+# PDFs render off the request thread; in-flight jobs are tracked per invoice id.
+_render_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="invoice-render")
+_render_futures: Dict[int, Future] = {}
+_render_lock = threading.Lock()
+
+# Validated therapist payload per engine, tagged with TherapistDetailService.generation().
+_therapist_payloads: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+@dataclass
+class InvoiceLineItem:
+    source_type: str
+    source_id: int
+    line_date: date
+    paid: bool
+
 
 @dataclass
 class InvoiceContext:
@@ -27,12 +57,28 @@ class InvoiceContext:
     client_name: str
     client_session_rate_raw: str
     paid: bool
+    # Billed notes in invoice order; defaults to the single source note.
+    lines: List[InvoiceLineItem] = field(default_factory=list)
+    # Stored on the invoice for listing; not printed, so not part of the render hash.
+    client_id: Optional[int] = None
+
+    def __post_init__(self):
+        if not self.lines:
+            self.lines = [InvoiceLineItem(self.source_type, self.source_id, self.session_date, self.paid)]
 
 
 class InvoiceService:
     INVOICE_DIR = os.path.join(APP_DATA_DIR, "invoices")
     DESCRIPTION = "Counselling session — 50 minutes"
-    MAX_NUMBERING_RETRIES = 8
+    # Bump when _generate_pdf's layout changes so existing PDFs are re-rendered.
+    RENDER_VERSION = 2
+    # Batches smaller than this render in-process; process start-up would dominate.
+    POOL_MIN_BATCH = 8
+    # note type: (model, date column)
+    BILLABLE_SOURCES = {
+        "session": (SessionNote, SessionNote.session_date),
+        "assessment": (AssessmentNote, AssessmentNote.assessment_date),
+    }
 
     @staticmethod
     def get_or_create_from_session(db: Session, session_id: int) -> Tuple[Invoice, bool]:
@@ -54,6 +100,7 @@ class InvoiceService:
             client_name=session_note.client.full_name,
             client_session_rate_raw=(session_note.client.session_hourly_rate or "").strip(),
             paid=bool(session_note.is_paid),
+            client_id=session_note.client_id,
         )
         return InvoiceService._get_or_create(db, context)
 
@@ -77,6 +124,7 @@ class InvoiceService:
             client_name=assessment_note.client.full_name,
             client_session_rate_raw=(assessment_note.client.session_hourly_rate or "").strip(),
             paid=bool(assessment_note.is_paid),
+            client_id=assessment_note.client_id,
         )
         return InvoiceService._get_or_create(db, context)
 
@@ -86,71 +134,365 @@ class InvoiceService:
 
     @staticmethod
     def _get_or_create(db: Session, context: InvoiceContext) -> Tuple[Invoice, bool]:
-        details = TherapistDetailService.get_therapist_details(db)
-        if not details:
-            raise ValueError("Therapist details are missing. Please complete Therapist Details first.")
-
-        therapist = InvoiceService._build_therapist_payload(details)
+        therapist = InvoiceService._get_therapist_payload(db)
         rate_decimal = InvoiceService._parse_rate(context.client_session_rate_raw)
         display_amount = InvoiceService._format_decimal(rate_decimal)
         year = context.session_date.year
 
-        existing = (
-            db.query(Invoice)
-            .filter(Invoice.source_type == context.source_type, Invoice.source_id == context.source_id)
-            .first()
-        )
+        existing = InvoiceService._find_invoice_for_note(db, context.source_type, context.source_id)
         if existing:
-            InvoiceService._ensure_pdf(existing, context, therapist, display_amount)
+            # The note may be one line of a consolidated invoice.
+            InvoiceService._ensure_pdf(db, existing, InvoiceService._context_for_invoice(db, existing), therapist, display_amount)
             return existing, False
 
         os.makedirs(InvoiceService.INVOICE_DIR, exist_ok=True)
 
-        for _ in range(InvoiceService.MAX_NUMBERING_RETRIES):
-            max_seq = db.query(func.max(Invoice.sequence_number)).filter(Invoice.year == year).scalar() or 0
-            sequence_number = int(max_seq) + 1
-            invoice_number = f"INV-{year}-{sequence_number:04d}"
-            pdf_path = os.path.join(InvoiceService.INVOICE_DIR, f"{invoice_number}.pdf")
+        InvoiceService._begin_immediate(db)
+        sequence_number = InvoiceService._reserve_sequence_numbers(db, year)
+        invoice_number = f"INV-{year}-{sequence_number:04d}"
+        invoice = Invoice(
+            invoice_number=invoice_number,
+            source_type=context.source_type,
+            source_id=context.source_id,
+            year=year,
+            sequence_number=sequence_number,
+            pdf_path=os.path.join(InvoiceService.INVOICE_DIR, f"{invoice_number}.pdf"),
+            lines=[InvoiceLine(position=1, source_type=context.source_type, source_id=context.source_id)],
+        )
+        InvoiceService._set_list_fields(invoice, context, display_amount)
+        db.add(invoice)
+        try:
+            db.commit()
+            db.refresh(invoice)
+        except IntegrityError:
+            # Another request invoiced this note first; the rollback also returns the number.
+            db.rollback()
+            existing = InvoiceService._find_invoice_for_note(db, context.source_type, context.source_id)
+            if not existing:
+                raise
+            InvoiceService._ensure_pdf(db, existing, InvoiceService._context_for_invoice(db, existing), therapist, display_amount)
+            return existing, False
+
+        # A failed render leaves the invoice (and its number) in place as FAILED
+        # and is retried the next time the invoice is requested.
+        InvoiceService._schedule_render(db, [(invoice, context, therapist, display_amount)])
+        return invoice, True
+
+    @staticmethod
+    def _find_invoice_for_note(db: Session, source_type: str, source_id: int) -> Optional[Invoice]:
+        return (
+            db.query(Invoice)
+            .join(InvoiceLine, InvoiceLine.invoice_id == Invoice.id)
+            .filter(InvoiceLine.source_type == source_type, InvoiceLine.source_id == source_id)
+            .populate_existing()
+            .first()
+        )
+
+    @staticmethod
+    def _context_for_invoice(db: Session, invoice: Invoice) -> InvoiceContext:
+        """
+        Builds the render context of an existing invoice from its lines' notes.
+
+        Lines whose note has since been deleted are left off the PDF.
+
+        Raises:
+            LookupError: If none of the invoice's notes exist any more.
+        """
+        notes = {}
+        client = None
+        for source_type, (model, date_column) in InvoiceService.BILLABLE_SOURCES.items():
+            source_ids = [line.source_id for line in invoice.lines if line.source_type == source_type]
+            if not source_ids:
+                continue
+            rows = db.execute(
+                select(
+                    model.id, date_column, model.is_paid, Client.id,
+                    Client.first_name, Client.last_name, Client.session_hourly_rate,
+                )
+                .join(Client, Client.id == model.client_id)
+                .where(model.id.in_(source_ids))
+            )
+            for note_id, note_date, is_paid, client_id, first_name, last_name, rate in rows:
+                notes[(source_type, note_id)] = InvoiceLineItem(source_type, note_id, note_date, bool(is_paid))
+                client = client or (client_id, f"{first_name} {last_name}", (rate or "").strip())
+        lines = [notes[key] for key in ((line.source_type, line.source_id) for line in invoice.lines) if key in notes]
+        if not lines:
+            raise LookupError("Invoice notes not found.")
+        return InvoiceContext(
+            source_type=invoice.source_type,
+            source_id=invoice.source_id,
+            session_date=max(line.line_date for line in lines),
+            client_name=client[1],
+            client_session_rate_raw=client[2],
+            paid=all(line.paid for line in lines),
+            lines=lines,
+            client_id=client[0],
+        )
+
+    @staticmethod
+    def get_render_future(invoice_id: int) -> Optional[Future]:
+        """Returns the in-flight render job for an invoice, if any."""
+        future = _render_futures.get(invoice_id)
+        return future if future is not None and not future.done() else None
+
+    @staticmethod
+    def resume_pending_render(db: Session, invoice: Invoice) -> bool:
+        """
+        Re-queues the render of an invoice left PENDING with no job in flight,
+        as happens when the app stops mid-render. Returns True if one was queued.
+
+        Raises:
+            ValueError: If the therapist details are missing or incomplete.
+        """
+        if invoice.status != InvoiceStatus.PENDING or InvoiceService.get_render_future(invoice.id) is not None:
+            return False
+        # The job records its result before its future completes, so re-read the row.
+        db.refresh(invoice)
+        if invoice.status != InvoiceStatus.PENDING:
+            return False
+        return InvoiceService.refresh_pdfs(db, [invoice]) > 0
+
+    @staticmethod
+    def _schedule_render(db: Session, renders: Sequence[Tuple[Invoice, InvoiceContext, dict, str]]) -> None:
+        """
+        Marks the invoices PENDING and renders their PDFs on the background pool.
+
+        Each entry is (invoice, context, therapist, amount_text). Invoices that
+        already have a render in flight are skipped.
+        """
+        # The lock only guards _render_futures. A placeholder future claims the
+        # invoices, so the commit (and SQLite's busy timeout) runs unlocked.
+        claim = Future()
+        with _render_lock:
+            renders = [entry for entry in renders if InvoiceService.get_render_future(entry[0].id) is None]
+            invoice_ids = [invoice.id for invoice, _, _, _ in renders]
+            for invoice_id in invoice_ids:
+                _render_futures[invoice_id] = claim
+        if not renders:
+            return
+        claim.add_done_callback(lambda _: _release_render_claims(invoice_ids, claim))
+
+        try:
+            hashes = [InvoiceService._render_hash(*entry) for entry in renders]
+            previous_paths = [invoice.pdf_path for invoice, _, _, _ in renders]
+            for (invoice, _, _, _), content_hash in zip(renders, hashes):
+                # Each rendering gets its own file, so a served PDF never changes under its URL.
+                invoice.pdf_path = InvoiceService._pdf_path(invoice.invoice_number, content_hash)
+                invoice.status = InvoiceStatus.PENDING
+                invoice.render_error = None
+            db.commit()
+
+            jobs = [
+                (SimpleNamespace(invoice_number=invoice.invoice_number, pdf_path=invoice.pdf_path), context, therapist, amount_text)
+                for invoice, context, therapist, amount_text in renders
+            ]
+            future = _render_executor.submit(
+                _render_in_background, sessionmaker(bind=db.get_bind()), invoice_ids, jobs, hashes, previous_paths
+            )
+        except BaseException as exc:
+            claim.set_exception(exc)
+            raise
+        future.add_done_callback(lambda done: _settle_render_claim(claim, done))
+
+    @staticmethod
+    def _pdf_path(invoice_number: str, content_hash: str) -> str:
+        """Content-addressed location of the PDF rendered from the given inputs hash."""
+        return os.path.join(InvoiceService.INVOICE_DIR, f"{invoice_number}-{content_hash[:16]}.pdf")
+
+    @staticmethod
+    def _begin_immediate(db: Session) -> None:
+        """
+        Starts the transaction with SQLite's write lock held, so concurrent
+        allocators wait on the busy timeout instead of failing to upgrade a
+        read lock.
+        """
+        dbapi_connection = db.connection().connection.dbapi_connection
+        if type(dbapi_connection).__module__.startswith("sqlite3") and not dbapi_connection.in_transaction:
+            dbapi_connection.execute("BEGIN IMMEDIATE")
+
+    @staticmethod
+    def _reserve_sequence_numbers(db: Session, year: int, count: int = 1) -> int:
+        """
+        Advances the year's counter by `count` in the current transaction and
+        returns the last number reserved.
+        """
+        return db.execute(
+            sqlite_insert(InvoiceSequence)
+            .values(year=year, last_value=count)
+            .on_conflict_do_update(
+                index_elements=[InvoiceSequence.year],
+                set_={"last_value": InvoiceSequence.last_value + count},
+            )
+            .returning(InvoiceSequence.last_value)
+        ).scalar_one()
+
+    @staticmethod
+    def _uninvoiced_contexts(
+        db: Session, start_date: date, end_date: date, client_id: Optional[int]
+    ) -> List[Tuple[int, InvoiceContext]]:
+        """Returns (client_id, single-note context) for each uninvoiced note, in date order."""
+        contexts = []
+        for source_type, (model, date_column) in InvoiceService.BILLABLE_SOURCES.items():
+            query = (
+                select(
+                    model.id, date_column, model.is_paid, Client.id,
+                    Client.first_name, Client.last_name, Client.session_hourly_rate,
+                )
+                .join(Client, Client.id == model.client_id)
+                .outerjoin(InvoiceLine, and_(InvoiceLine.source_type == source_type, InvoiceLine.source_id == model.id))
+                .where(InvoiceLine.id.is_(None), date_column >= start_date, date_column <= end_date)
+            )
+            if client_id is not None:
+                query = query.where(model.client_id == client_id)
+            for note_id, note_date, is_paid, note_client_id, first_name, last_name, rate in db.execute(query):
+                contexts.append((note_client_id, InvoiceContext(
+                    source_type=source_type,
+                    source_id=note_id,
+                    session_date=note_date,
+                    client_name=f"{first_name} {last_name}",
+                    client_session_rate_raw=(rate or "").strip(),
+                    paid=bool(is_paid),
+                    client_id=note_client_id,
+                )))
+        contexts.sort(key=lambda item: (item[1].session_date, item[1].source_type, item[1].source_id))
+        return contexts
 
-            invoice = Invoice(
+    @staticmethod
+    def _consolidate(contexts: List[Tuple[int, InvoiceContext]]) -> List[Tuple[int, InvoiceContext]]:
+        """Merges date-ordered single-note contexts into one context per client."""
+        by_client: Dict[int, List[InvoiceContext]] = {}
+        for client_id, context in contexts:
+            by_client.setdefault(client_id, []).append(context)
+        merged = []
+        for client_id, client_contexts in by_client.items():
+            first, last = client_contexts[0], client_contexts[-1]
+            merged.append((client_id, InvoiceContext(
+                source_type=first.source_type,
+                source_id=first.source_id,
+                session_date=last.session_date,
+                client_name=first.client_name,
+                client_session_rate_raw=first.client_session_rate_raw,
+                paid=all(context.paid for context in client_contexts),
+                lines=[line for context in client_contexts for line in context.lines],
+                client_id=client_id,
+            )))
+        merged.sort(key=lambda item: (item[1].session_date, item[1].client_name, item[0]))
+        return merged
+
+    @staticmethod
+    def _allocate_invoices(db: Session, billable: List[Tuple[InvoiceContext, str]]) -> List[Invoice]:
+        """Creates invoice rows for (context, amount_text) pairs with consecutive per-year numbers, committing once."""
+        counts: Dict[int, int] = {}
+        for context, _ in billable:
+            counts[context.session_date.year] = counts.get(context.session_date.year, 0) + 1
+        next_sequence = {
+            year: InvoiceService._reserve_sequence_numbers(db, year, count) - count
+            for year, count in counts.items()
+        }
+        invoices = []
+        for context, amount_text in billable:
+            year = context.session_date.year
+            next_sequence[year] += 1
+            invoice_number = f"INV-{year}-{next_sequence[year]:04d}"
+            invoices.append(Invoice(
                 invoice_number=invoice_number,
                 source_type=context.source_type,
                 source_id=context.source_id,
                 year=year,
-                sequence_number=sequence_number,
-                pdf_path=pdf_path,
-            )
-            db.add(invoice)
+                sequence_number=next_sequence[year],
+                pdf_path=os.path.join(InvoiceService.INVOICE_DIR, f"{invoice_number}.pdf"),
+                lines=[
+                    InvoiceLine(position=position, source_type=line.source_type, source_id=line.source_id)
+                    for position, line in enumerate(context.lines, start=1)
+                ],
+            ))
+            InvoiceService._set_list_fields(invoices[-1], context, amount_text)
+        db.add_all(invoices)
+        db.commit()
+        return invoices
+
+    @staticmethod
+    def create_for_period(
+        db: Session,
+        start_date: date,
+        end_date: date,
+        client_id: Optional[int] = None,
+        consolidate: bool = False,
+    ) -> Dict:
+        """
+        Invoices every uninvoiced session and assessment note dated within
+        [start_date, end_date], optionally for one client.
+
+        With `consolidate`, each client gets a single invoice listing all of
+        their notes in the period (dated and numbered by the last note);
+        otherwise every note gets its own invoice.
+
+        Therapist details are read once, all invoice numbers are allocated in
+        one transaction (in date order), and the PDFs are rendered in the
+        background (in a process pool for larger batches). The invoices are
+        returned PENDING.
+
+        Returns:
+            {"created": [Invoice, ...], "errors": [{"source_type", "source_id", "error"}, ...]}
+
+        Raises:
+            ValueError: If the range is invalid or therapist details are incomplete.
+        """
+        if start_date > end_date:
+            raise ValueError("Start date must be on or before end date.")
+        therapist = InvoiceService._get_therapist_payload(db)
+
+        # Hold the write lock from the uninvoiced-notes query until the numbers
+        # are committed, so a concurrent request cannot invoice the same notes.
+        InvoiceService._begin_immediate(db)
+        errors = []
+        billable = []
+        contexts = InvoiceService._uninvoiced_contexts(db, start_date, end_date, client_id)
+        if consolidate:
+            contexts = InvoiceService._consolidate(contexts)
+        for _, context in contexts:
             try:
-                db.commit()
-                db.refresh(invoice)
-            except IntegrityError:
-                db.rollback()
-                existing = (
-                    db.query(Invoice)
-                    .filter(Invoice.source_type == context.source_type, Invoice.source_id == context.source_id)
-                    .first()
+                amount_text = InvoiceService._format_decimal(InvoiceService._parse_rate(context.client_session_rate_raw))
+            except ValueError as exc:
+                errors.extend(
+                    {"source_type": line.source_type, "source_id": line.source_id, "error": str(exc)}
+                    for line in context.lines
                 )
-                if existing:
-                    InvoiceService._ensure_pdf(existing, context, therapist, display_amount)
-                    return existing, False
                 continue
+            billable.append((context, amount_text))
+        if not billable:
+            db.rollback()
+            return {"created": [], "errors": errors}
 
-            try:
-                InvoiceService._generate_pdf(
-                    invoice=invoice,
-                    context=context,
-                    therapist=therapist,
-                    amount_text=display_amount,
-                )
-            except Exception:
-                db.delete(invoice)
-                db.commit()
-                raise
+        os.makedirs(InvoiceService.INVOICE_DIR, exist_ok=True)
+        invoices = InvoiceService._allocate_invoices(db, billable)
+        InvoiceService._schedule_render(db, [
+            (invoice, context, therapist, amount_text)
+            for invoice, (context, amount_text) in zip(invoices, billable)
+        ])
+        return {"created": invoices, "errors": errors}
 
-            return invoice, True
+    @staticmethod
+    def _get_therapist_payload(db: Session) -> dict:
+        """
+        Returns the validated therapist payload, cached until the details are
+        next saved through TherapistDetailService.upsert_therapist_details.
+
+        Raises:
+            ValueError: If the therapist details are missing or incomplete.
+        """
+        bind = db.get_bind()
+        generation = TherapistDetailService.generation()
+        cached = _therapist_payloads.get(bind)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
 
-        raise ValueError("Unable to allocate a unique invoice number. Please retry.")
+        details = TherapistDetailService.get_therapist_details(db)
+        if not details:
+            raise ValueError("Therapist details are missing. Please complete Therapist Details first.")
+        payload = InvoiceService._build_therapist_payload(details)
+        _therapist_payloads[bind] = (generation, payload)
+        return payload
 
     @staticmethod
     def _build_therapist_payload(details) -> dict:
@@ -221,13 +563,93 @@ class InvoiceService:
         return f"{value.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP):.2f}"
 
     @staticmethod
-    def _ensure_pdf(invoice: Invoice, context: InvoiceContext, therapist: dict, amount_text: str) -> None:
+    def _render_hash(invoice: Invoice, context: InvoiceContext, therapist: dict, amount_text: str) -> str:
+        inputs = {
+            "render_version": InvoiceService.RENDER_VERSION,
+            "invoice_number": invoice.invoice_number,
+            "context": {key: value for key, value in asdict(context).items() if key != "client_id"},
+            "therapist": therapist,
+            "amount": amount_text,
+        }
+        encoded = json.dumps(inputs, sort_keys=True, default=str, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    @staticmethod
+    def refresh_pdfs(db: Session, invoices: Sequence[Invoice]) -> int:
+        """
+        Queues one background render for every invoice whose PDF is missing,
+        failed or out of date, and returns how many were queued. Wait on
+        `get_render_future` before reading their files.
+
+        Invoices whose notes no longer exist, or whose client rate is
+        unusable, are left as they are.
+
+        Raises:
+            ValueError: If the therapist details are missing or incomplete.
+        """
+        therapist = InvoiceService._get_therapist_payload(db)
+        stale = []
+        for invoice in invoices:
+            try:
+                context = InvoiceService._context_for_invoice(db, invoice)
+                amount_text = InvoiceService._format_decimal(InvoiceService._parse_rate(context.client_session_rate_raw))
+            except (LookupError, ValueError):
+                continue
+            if (
+                invoice.status != InvoiceStatus.READY
+                or invoice.content_hash != InvoiceService._render_hash(invoice, context, therapist, amount_text)
+                or not os.path.exists(invoice.pdf_path)
+            ):
+                InvoiceService._set_list_fields(invoice, context, amount_text)
+                stale.append((invoice, context, therapist, amount_text))
+        if stale:
+            os.makedirs(InvoiceService.INVOICE_DIR, exist_ok=True)
+            InvoiceService._schedule_render(db, stale)
+        return len(stale)
+
+    @staticmethod
+    def _set_list_fields(invoice: Invoice, context: InvoiceContext, amount_text: str) -> None:
+        """Copies the listing fields (client, date, total, paid) from the render context onto the invoice."""
+        invoice.client_id = context.client_id
+        invoice.invoice_date = context.session_date
+        invoice.amount_minor = int(Decimal(amount_text) * 100) * len(context.lines)
+        invoice.is_paid = context.paid
+
+    @staticmethod
+    def backfill_list_fields(db: Session) -> int:
+        """
+        Fills the listing fields of invoices created before they existed.
+        Returns the number of invoices updated.
+        """
+        updated = 0
+        for invoice in db.query(Invoice).filter(Invoice.invoice_date.is_(None)).all():
+            try:
+                context = InvoiceService._context_for_invoice(db, invoice)
+                amount_text = InvoiceService._format_decimal(InvoiceService._parse_rate(context.client_session_rate_raw))
+            except (LookupError, ValueError):
+                # Notes deleted or rate unusable; the invoice is listed without these fields.
+                continue
+            InvoiceService._set_list_fields(invoice, context, amount_text)
+            updated += 1
+        db.commit()
+        return updated
+
+    @staticmethod
+    def _ensure_pdf(db: Session, invoice: Invoice, context: InvoiceContext, therapist: dict, amount_text: str) -> None:
         # Refresh existing invoices so the PDF reflects current source data
         # (e.g., updated client session rate) while keeping the same invoice number.
-        os.makedirs(os.path.dirname(invoice.pdf_path), exist_ok=True)
-        temp_path = f"{invoice.pdf_path}.tmp"
-        InvoiceService._generate_pdf(invoice, context, therapist, amount_text, output_path=temp_path)
-        os.replace(temp_path, invoice.pdf_path)
+        # Re-rendering is skipped when the inputs hash matches the stored one.
+        InvoiceService._set_list_fields(invoice, context, amount_text)
+        content_hash = InvoiceService._render_hash(invoice, context, therapist, amount_text)
+        if (
+            invoice.status == InvoiceStatus.READY
+            and invoice.content_hash == content_hash
+            and os.path.exists(invoice.pdf_path)
+        ):
+            db.commit()
+            return
+        os.makedirs(InvoiceService.INVOICE_DIR, exist_ok=True)
+        InvoiceService._schedule_render(db, [(invoice, context, therapist, amount_text)])
 
     @staticmethod
     def _generate_pdf(
@@ -238,34 +660,23 @@ class InvoiceService:
         output_path: str | None = None,
     ) -> None:
         target_path = output_path or invoice.pdf_path
-        c = canvas.Canvas(target_path, pagesize=A4)
+        # Invariant output (no creation timestamp or random document id) keeps the
+        # bytes stable for the same inputs, which the PDF endpoint's strong ETag relies on.
+        c = canvas.Canvas(target_path, pagesize=A4, invariant=1)
         width, height = A4
 
         left = 40
         right = width - 40
-        y = height - 50
+        # The letterhead and payment details depend only on the therapist, so
+        # their text is laid out once per payload and replayed here.
+        letterhead, payment_details = InvoiceService._static_layer(tuple(sorted(therapist.items())))
+        InvoiceService._draw_text_ops(c, letterhead)
 
-        c.setFont("Helvetica-Bold", 20)
-        c.drawString(left, y, therapist["business_name"] or "Therapy Practice")
-        y -= 22
-        c.setFont("Helvetica", 11)
-        c.drawString(left, y, therapist["therapy_type"])
-        y -= 16
-        c.drawString(left, y, therapist["website"])
-        y -= 16
-        c.drawString(left, y, therapist["therapist_header"])
-        y -= 16
-        c.drawString(left, y, therapist["therapist_email"])
-
-        y -= 30
+        y = height - 50 - 70 - 30
         c.setLineWidth(0.5)
         c.setStrokeColor(colors.HexColor("#B0B0B0"))
         c.line(left, y, right, y)
-        y -= 24
-
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(left, y, "BILL TO")
-        y -= 16
+        y -= 24 + 16
         c.setFont("Helvetica", 11)
         c.drawString(left, y, context.client_name)
 
@@ -278,61 +689,165 @@ class InvoiceService:
         y -= 42
 
         table_x = left
-        table_y_top = y
         row_h = 26
         header_h = 24
-
+        bottom_margin = 60
+        # Room needed under the table for the total and payment details.
+        footer_h = 160
         col_w = [250, 70, 80, 70, 80]
         headers = ["DESCRIPTION", "QUANTITY", "PRICE", "DATE", "TOTAL"]
-
-        c.setFillColor(colors.HexColor("#E8E8E8"))
-        c.rect(table_x, table_y_top - header_h, sum(col_w), header_h, fill=1, stroke=0)
-        c.setFillColor(colors.black)
-        c.setFont("Helvetica-Bold", 10)
-        tx = table_x + 6
-        for idx, header in enumerate(headers):
-            c.drawString(tx, table_y_top - 16, header)
-            tx += col_w[idx]
-
-        c.setStrokeColor(colors.HexColor("#9A9A9A"))
-        c.rect(table_x, table_y_top - header_h - row_h, sum(col_w), header_h + row_h, fill=0, stroke=1)
-        tx = table_x
-        for width_col in col_w[:-1]:
-            tx += width_col
-            c.line(tx, table_y_top, tx, table_y_top - header_h - row_h)
-        c.line(table_x, table_y_top - header_h, table_x + sum(col_w), table_y_top - header_h)
-
+        header_fill = colors.HexColor("#E8E8E8")
         line_price = f"{therapist['currency_symbol']}{amount_text}"
-        c.setFont("Helvetica", 10)
-        values = [
-            InvoiceService.DESCRIPTION,
-            "1",
-            line_price,
-            context.session_date.strftime("%d/%m/%Y"),
-            line_price,
-        ]
-        tx = table_x + 6
-        for idx, value in enumerate(values):
-            c.drawString(tx, table_y_top - header_h - 16, value)
-            tx += col_w[idx]
 
-        total_y = table_y_top - header_h - row_h - 24
+        # Rows are drawn one at a time, starting a new page (and repeating the
+        # column headers) whenever the next row would not fit.
+        y = InvoiceService._draw_table_row(c, table_x, y, col_w, header_h, headers, bold=True, fill=header_fill)
+        for line in context.lines:
+            if y - row_h < bottom_margin:
+                c.showPage()
+                y = height - 50
+                c.setFont("Helvetica-Bold", 11)
+                c.drawString(left, y, f"Invoice #: {invoice.invoice_number} (continued)")
+                y = InvoiceService._draw_table_row(c, table_x, y - 24, col_w, header_h, headers, bold=True, fill=header_fill)
+            values = [InvoiceService.DESCRIPTION, "1", line_price, line.line_date.strftime("%d/%m/%Y"), line_price]
+            y = InvoiceService._draw_table_row(c, table_x, y, col_w, row_h, values)
+
+        if y - footer_h < bottom_margin:
+            c.showPage()
+            y = height - 50
+        total = InvoiceService._format_decimal(Decimal(amount_text) * len(context.lines))
+        total_y = y - 24
         c.setFont("Helvetica-Bold", 12)
-        c.drawRightString(right, total_y, f"TOTAL DUE: {line_price}")
-
-        bacs_y = total_y - 44
-        c.setFont("Helvetica-Bold", 11)
-        c.drawString(left, bacs_y, f"Payment by BACS to: {therapist['therapist_name']}")
-        c.setFont("Helvetica", 10)
-        c.drawString(left, bacs_y - 16, f"Bank: {therapist['bank_name']}")
-        c.drawString(left, bacs_y - 30, f"Sort Code: {therapist['sort_code']}")
-        c.drawString(left, bacs_y - 44, f"Account Number: {therapist['account_number']}")
-        c.drawString(left, bacs_y - 58, "For international payments:")
-        c.drawString(left, bacs_y - 72, f"IBAN: {therapist['iban']}")
-        c.drawString(left, bacs_y - 86, f"BIC: {therapist['bic']}")
+        c.drawRightString(right, total_y, f"TOTAL DUE: {therapist['currency_symbol']}{total}")
 
+        InvoiceService._draw_text_ops(c, payment_details, dy=total_y - 44)
         c.setFont("Helvetica-Bold", 12)
         c.drawString(left, 44, "With Thanks")
 
         c.showPage()
         c.save()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _static_layer(therapist_items: Tuple[Tuple[str, str], ...]) -> Tuple[Tuple, Tuple]:
+        """
+        Lays out the therapist-only text of an invoice as (font, size, x, y, text)
+        operations: the letterhead at its page position, and the payment details
+        relative to the top of their block.
+        """
+        therapist = dict(therapist_items)
+        left = 40
+        top = A4[1] - 50
+        letterhead = (
+            ("Helvetica-Bold", 20, left, top, therapist["business_name"] or "Therapy Practice"),
+            ("Helvetica", 11, left, top - 22, therapist["therapy_type"]),
+            ("Helvetica", 11, left, top - 38, therapist["website"]),
+            ("Helvetica", 11, left, top - 54, therapist["therapist_header"]),
+            ("Helvetica", 11, left, top - 70, therapist["therapist_email"]),
+            ("Helvetica-Bold", 12, left, top - 124, "BILL TO"),
+        )
+        payment_details = (
+            ("Helvetica-Bold", 11, left, 0, f"Payment by BACS to: {therapist['therapist_name']}"),
+            ("Helvetica", 10, left, -16, f"Bank: {therapist['bank_name']}"),
+            ("Helvetica", 10, left, -30, f"Sort Code: {therapist['sort_code']}"),
+            ("Helvetica", 10, left, -44, f"Account Number: {therapist['account_number']}"),
+            ("Helvetica", 10, left, -58, "For international payments:"),
+            ("Helvetica", 10, left, -72, f"IBAN: {therapist['iban']}"),
+            ("Helvetica", 10, left, -86, f"BIC: {therapist['bic']}"),
+        )
+        return letterhead, payment_details
+
+    @staticmethod
+    def _draw_text_ops(c, ops, dy: float = 0) -> None:
+        """Draws text operations from `_static_layer` as a single text object, shifted by `dy`."""
+        text = c.beginText()
+        for font, size, x, y, value in ops:
+            text.setFont(font, size)
+            text.setTextOrigin(x, y + dy)
+            text.textOut(value)
+        c.drawText(text)
+
+    @staticmethod
+    def _draw_table_row(c, x, top, col_w, row_h, values, bold=False, fill=None) -> float:
+        """Draws one bordered table row with its top edge at `top`; returns the row's bottom edge."""
+        table_w = sum(col_w)
+        if fill is not None:
+            c.setFillColor(fill)
+            c.rect(x, top - row_h, table_w, row_h, fill=1, stroke=0)
+            c.setFillColor(colors.black)
+        c.setStrokeColor(colors.HexColor("#9A9A9A"))
+        c.rect(x, top - row_h, table_w, row_h, fill=0, stroke=1)
+        tx = x
+        for width_col in col_w[:-1]:
+            tx += width_col
+            c.line(tx, top, tx, top - row_h)
+        c.setFont("Helvetica-Bold" if bold else "Helvetica", 10)
+        tx = x + 6
+        for idx, value in enumerate(values):
+            c.drawString(tx, top - 16, value)
+            tx += col_w[idx]
+        return top - row_h
+
+
+def _render_invoice_job(job) -> Optional[str]:
+    """Process-pool entry point: renders one invoice PDF, returning an error message on failure."""
+    invoice, context, therapist, amount_text = job
+    # Render beside the target and swap it in, so a re-render never serves a partial file.
+    temp_path = f"{invoice.pdf_path}.tmp"
+    try:
+        InvoiceService._generate_pdf(invoice, context, therapist, amount_text, output_path=temp_path)
+        os.replace(temp_path, invoice.pdf_path)
+    except Exception as exc:
+        return str(exc) or type(exc).__name__
+    return None
+
+
+def _release_render_claims(invoice_ids: List[int], future: Future) -> None:
+    with _render_lock:
+        for invoice_id in invoice_ids:
+            if _render_futures.get(invoice_id) is future:
+                del _render_futures[invoice_id]
+
+
+def _settle_render_claim(claim: Future, done: Future) -> None:
+    if done.exception() is not None:
+        claim.set_exception(done.exception())
+    else:
+        claim.set_result(done.result())
+
+
+def _render_in_background(
+    session_factory, invoice_ids: List[int], jobs: List[tuple], hashes: List[str], previous_paths: List[str]
+) -> None:
+    """Background job: renders the PDFs, records each invoice's status and removes superseded files."""
+    try:
+        if len(jobs) >= InvoiceService.POOL_MIN_BATCH:
+            with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as pool:
+                results = list(pool.map(_render_invoice_job, jobs, chunksize=4))
+        else:
+            results = [_render_invoice_job(job) for job in jobs]
+    except Exception as exc:
+        # A broken pool or unpicklable job fails the whole batch; none of it may stay PENDING.
+        logger.exception("Invoice render batch failed")
+        results = [str(exc) or type(exc).__name__] * len(jobs)
+
+    db = session_factory()
+    try:
+        for invoice_id, job, content_hash, error in zip(invoice_ids, jobs, hashes, results):
+            if error:
+                logger.error(f"Failed to render {job[0].invoice_number}: {error}")
+                values = {"status": InvoiceStatus.FAILED, "render_error": error}
+            else:
+                values = {"status": InvoiceStatus.READY, "content_hash": content_hash, "render_error": None}
+            db.execute(update(Invoice).where(Invoice.id == invoice_id).values(**values))
+        db.commit()
+    finally:
+        db.close()
+
+    for job, previous_path in zip(jobs, previous_paths):
+        if previous_path != job[0].pdf_path and os.path.exists(previous_path):
+            try:
+                os.remove(previous_path)
+            except OSError as exc:
+                # e.g. still open in a viewer on Windows; the file is only orphaned.
+                logger.warning(f"Could not remove superseded PDF {previous_path}: {exc}")
@@ -0,0 +1,147 @@
+from datetime import date
+from typing import Dict, List, Optional, Sequence
+
+from pydantic import BaseModel
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from backend.models.assessment_note import AssessmentNote
+from backend.models.client import Client
+from backend.models.session_note import SessionNote
+from backend.services.client_stats_service import ClientStatsService
+from backend.services.invoice_index_service import InvoiceIndexService
+
+
+class NoteBatchService:
+    """
+    Batch writes shared by the session, assessment and supervision note services.
+
+    Each call runs in a single transaction: rows are inserted or updated with
+    one executemany statement, the affected clients' stats are refreshed, and
+    the transaction is committed once.
+    """
+
+    MAX_BATCH_SIZE = 500
+
+    @staticmethod
+    def _check_clients_exist(db: Session, client_ids: Sequence[int]) -> None:
+        wanted = set(client_ids)
+        found = {client_id for (client_id,) in db.query(Client.id).filter(Client.id.in_(wanted))}
+        missing = sorted(wanted - found)
+        if missing:
+            raise ValueError(f"Client(s) not found: {', '.join(str(client_id) for client_id in missing)}")
+
+    @staticmethod
+    def create_many(db: Session, model, notes: Sequence[BaseModel]) -> List:
+        """
+        Inserts all notes and returns the created rows ordered by id (insertion order).
+
+        Raises:
+            ValueError: If any note references a client that does not exist.
+        """
+        # Omitted optional fields fall back to the column defaults.
+        rows = [note.model_dump(exclude_none=True) for note in notes]
+        NoteBatchService._check_clients_exist(db, [row["client_id"] for row in rows])
+        created_ids = db.scalars(insert(model).returning(model.id), rows).all()
+        ClientStatsService.refresh_clients(db, [row["client_id"] for row in rows])
+        db.commit()
+        return db.scalars(select(model).where(model.id.in_(created_ids)).order_by(model.id)).all()
+
+    @staticmethod
+    def update_many(db: Session, model, updates: Sequence[BaseModel]) -> List:
+        """
+        Applies partial updates (each carrying the note `id`) and returns the updated rows.
+
+        Raises:
+            LookupError: If any note does not exist.
+            ValueError: If an update moves a note to a client that does not exist.
+        """
+        rows = [update_data.model_dump(exclude_unset=True) for update_data in updates]
+        note_ids = [row["id"] for row in rows]
+        current = {row.id: row for row in db.query(model.id, model.client_id, model.version).filter(model.id.in_(note_ids))}
+        previous_clients: Dict[int, int] = {note_id: row.client_id for note_id, row in current.items()}
+        missing = [note_id for note_id in note_ids if note_id not in previous_clients]
+        if missing:
+            raise LookupError(f"Note(s) not found: {', '.join(str(note_id) for note_id in missing)}")
+        new_client_ids = [row["client_id"] for row in rows if row.get("client_id") is not None]
+        if new_client_ids:
+            NoteBatchService._check_clients_exist(db, new_client_ids)
+
+        for row in rows:
+            row["version"] = current[row["id"]].version + 1
+        # Bulk UPDATE by primary key; rows with the same set of columns share one executemany.
+        db.execute(update(model), rows)
+        ClientStatsService.refresh_clients(db, [*previous_clients.values(), *new_client_ids])
+        InvoiceIndexService.sync_paid(db, model, [row["id"] for row in rows if "is_paid" in row])
+        db.commit()
+        return (
+            db.query(model)
+            .filter(model.id.in_(note_ids))
+            .order_by(model.id)
+            .populate_existing()
+            .all()
+        )
+
+    @staticmethod
+    def set_paid(db: Session, model, note_ids: Sequence[int], is_paid: bool = True) -> int:
+        """Sets `is_paid` on the given notes with one UPDATE. Returns the number of notes changed."""
+        changed = db.execute(
+            update(model)
+            .where(model.id.in_(set(note_ids)), model.is_paid.is_distinct_from(is_paid))
+            .values(is_paid=is_paid, version=model.version + 1)
+            .returning(model.id, model.client_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        ClientStatsService.refresh_clients(db, [row.client_id for row in changed])
+        InvoiceIndexService.sync_paid(db, model, [row.id for row in changed])
+        db.commit()
+        return len(changed)
+
+    @staticmethod
+    def set_paid_in_range(
+        db: Session,
+        client_ids: Sequence[int],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        is_paid: bool = True,
+    ) -> Dict[str, int]:
+        """
+        Sets `is_paid` on the session and assessment notes of the given clients
+        dated within [start_date, end_date] (either bound may be open).
+
+        Runs one UPDATE per note table and refreshes the affected clients'
+        stats in the same transaction.
+
+        Returns:
+            {"session_notes": <changed>, "assessment_notes": <changed>}
+
+        Raises:
+            ValueError: If start_date is after end_date.
+        """
+        if start_date and end_date and start_date > end_date:
+            raise ValueError("Start date must be on or before end date.")
+
+        counts = {}
+        affected_clients = []
+        for key, model, date_column in (
+            ("session_notes", SessionNote, SessionNote.session_date),
+            ("assessment_notes", AssessmentNote, AssessmentNote.assessment_date),
+        ):
+            conditions = [model.client_id.in_(set(client_ids)), model.is_paid.is_distinct_from(is_paid)]
+            if start_date:
+                conditions.append(date_column >= start_date)
+            if end_date:
+                conditions.append(date_column <= end_date)
+            changed = db.execute(
+                update(model)
+                .where(*conditions)
+                .values(is_paid=is_paid, version=model.version + 1)
+                .returning(model.id, model.client_id)
+                .execution_options(synchronize_session=False)
+            ).all()
+            counts[key] = len(changed)
+            affected_clients.extend(row.client_id for row in changed)
+            InvoiceIndexService.sync_paid(db, model, [row.id for row in changed])
+        ClientStatsService.refresh_clients(db, affected_clients)
+        db.commit()
+        return counts
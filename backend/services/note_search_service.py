@@ -0,0 +1,210 @@
+import html
+import re
+from typing import Dict, List, Optional, Union
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+
+class NoteSearchService:
+    """
+    Full-text search over session, assessment, supervision and CPD notes.
+
+    Notes are mirrored into the `notes_fts` FTS5 table by SQL triggers, so every
+    writer keeps the index in sync. Note bodies are indexed as plain text; the
+    triggers strip the HTML with built-in SQL functions only, so the sqlite3 CLI
+    and other tools can still write to the note tables.
+    Each FTS row uses `note_id * 4 + type code` as its rowid, which lets the
+    triggers replace a note's entry by primary key instead of scanning.
+    """
+
+    FTS_TABLE = "notes_fts"
+    MAX_LIMIT = 100
+    HIGHLIGHT_START = "\x02"
+    HIGHLIGHT_END = "\x03"
+
+    # note_type: (table, type code, date column, title expression, client expression, personal notes expression)
+    SOURCES = {
+        "session": ("session_notes", 0, "session_date", "''", "{row}.client_id", "{row}.personal_notes"),
+        "assessment": ("assessment_notes", 1, "assessment_date", "''", "{row}.client_id", "{row}.personal_notes"),
+        "supervision": ("supervision_notes", 2, "supervision_date", "{row}.summary", "{row}.client_id", "{row}.personal_notes"),
+        "cpd": ("cpd_notes", 3, "cpd_date", "{row}.title", "NULL", "''"),
+    }
+
+    # Entities the editor writes into note bodies; "&amp;" goes last so "&amp;lt;" stays literal.
+    ENTITIES = (("&nbsp;", " "), ("&lt;", "<"), ("&gt;", ">"), ("&quot;", '"'), ("&amp;", "&"))
+
+    _TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+    @staticmethod
+    def _plain_text(expression: str) -> str:
+        """
+        SQL for the text of an HTML value. The value is split on "<" inside its
+        JSON string form, so no character needs escaping, and every piece after
+        the first drops its tag up to ">".
+        """
+        pieces = f"json_each('[' || replace(json_quote({expression}), '<', '\",\"') || ']')"
+        plain = (
+            "(SELECT group_concat(CASE WHEN key = 0 THEN value ELSE substr(value, instr(value, '>') + 1) END, ' ') "
+            f"FROM {pieces})"
+        )
+        for entity, character in NoteSearchService.ENTITIES:
+            plain = f"replace({plain}, '{entity}', '{character}')"
+        return f"trim(replace(replace({plain}, '   ', ' '), '  ', ' '))"
+
+    @staticmethod
+    def _row_values(note_type: str, row: str) -> str:
+        _table, code, date_column, title, client, personal_notes = NoteSearchService.SOURCES[note_type]
+        return (
+            f"{row}.id * 4 + {code}, "
+            f"coalesce({title.format(row=row)}, ''), "
+            f"coalesce({NoteSearchService._plain_text(f'{row}.content')}, ''), "
+            f"coalesce({NoteSearchService._plain_text(personal_notes.format(row=row))}, ''), "
+            f"'{note_type}', {row}.id, {client.format(row=row)}, {row}.{date_column}"
+        )
+
+    @staticmethod
+    def _trigger_statements() -> Dict[str, str]:
+        table = NoteSearchService.FTS_TABLE
+        columns = "rowid, title, content, personal_notes, note_type, note_id, client_id, note_date"
+        statements = {}
+        for note_type, (source_table, code, date_column, title, client, personal_notes) in NoteSearchService.SOURCES.items():
+            indexed = ["content", date_column]
+            for expression in (title, client, personal_notes):
+                if expression.startswith("{row}."):
+                    indexed.append(expression[len("{row}."):])
+            statements[f"{source_table}_fts_insert"] = (
+                f"CREATE TRIGGER {source_table}_fts_insert AFTER INSERT ON {source_table} BEGIN "
+                f"INSERT INTO {table} ({columns}) VALUES ({NoteSearchService._row_values(note_type, 'new')}); END"
+            )
+            statements[f"{source_table}_fts_delete"] = (
+                f"CREATE TRIGGER {source_table}_fts_delete AFTER DELETE ON {source_table} BEGIN "
+                f"DELETE FROM {table} WHERE rowid = old.id * 4 + {code}; END"
+            )
+            statements[f"{source_table}_fts_update"] = (
+                f"CREATE TRIGGER {source_table}_fts_update "
+                f"AFTER UPDATE OF {', '.join(indexed)} ON {source_table} BEGIN "
+                f"DELETE FROM {table} WHERE rowid = old.id * 4 + {code}; "
+                f"INSERT INTO {table} ({columns}) VALUES ({NoteSearchService._row_values(note_type, 'new')}); END"
+            )
+        return statements
+
+    @staticmethod
+    def ensure_index(conn: Connection) -> None:
+        """
+        Create the FTS table and its triggers and backfill existing notes. Runs
+        again whenever the stored triggers differ from the current definitions
+        (for instance older ones that indexed raw HTML), replacing them and
+        rebuilding the index.
+        """
+        table = NoteSearchService.FTS_TABLE
+        statements = NoteSearchService._trigger_statements()
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": table},
+        ).first()
+        current = {
+            name: sql
+            for name, sql in conn.execute(text("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'"))
+            if name in statements
+        }
+        if exists and current == statements:
+            return
+
+        for name in current:
+            conn.execute(text(f"DROP TRIGGER {name}"))
+        if exists:
+            conn.execute(text(f"DELETE FROM {table}"))
+        else:
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE {table} USING fts5("
+                "title, content, personal_notes, "
+                "note_type UNINDEXED, note_id UNINDEXED, client_id UNINDEXED, note_date UNINDEXED, "
+                "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+            ))
+        for statement in statements.values():
+            conn.execute(text(statement))
+        NoteSearchService._backfill(conn)
+
+    @staticmethod
+    def _backfill(conn: Union[Connection, Session]) -> None:
+        columns = "rowid, title, content, personal_notes, note_type, note_id, client_id, note_date"
+        for note_type, source in NoteSearchService.SOURCES.items():
+            conn.execute(text(
+                f"INSERT INTO {NoteSearchService.FTS_TABLE} ({columns}) "
+                f"SELECT {NoteSearchService._row_values(note_type, source[0])} FROM {source[0]}"
+            ))
+
+    @staticmethod
+    def rebuild_index(db: Session) -> None:
+        db.execute(text(f"DELETE FROM {NoteSearchService.FTS_TABLE}"))
+        NoteSearchService._backfill(db)
+        db.commit()
+
+    @staticmethod
+    def build_match_query(raw_query: str) -> str:
+        """Turn free text into an FTS5 query that prefix-matches every word (implicit AND)."""
+        tokens = NoteSearchService._TOKEN_RE.findall(raw_query or "")
+        return " ".join(f'"{token}"*' for token in tokens)
+
+    @staticmethod
+    def _render_snippet(raw_snippet: str) -> str:
+        # The index holds plain text: escape it, then turn markers into <mark>.
+        return (
+            html.escape(raw_snippet or "", quote=False)
+            .replace(NoteSearchService.HIGHLIGHT_START, "<mark>")
+            .replace(NoteSearchService.HIGHLIGHT_END, "</mark>")
+        )
+
+    @staticmethod
+    def search(
+        db: Session,
+        query: str,
+        limit: int = 20,
+        note_type: Optional[str] = None,
+        client_id: Optional[int] = None,
+    ) -> List[Dict]:
+        match = NoteSearchService.build_match_query(query)
+        if not match:
+            return []
+        if note_type is not None and note_type not in NoteSearchService.SOURCES:
+            raise ValueError(f"Unknown note type: {note_type}")
+
+        filters = [f"{NoteSearchService.FTS_TABLE} MATCH :match"]
+        params = {
+            "match": match,
+            "limit": max(1, min(limit, NoteSearchService.MAX_LIMIT)),
+            "start": NoteSearchService.HIGHLIGHT_START,
+            "end": NoteSearchService.HIGHLIGHT_END,
+        }
+        if note_type is not None:
+            filters.append("note_type = :note_type")
+            params["note_type"] = note_type
+        if client_id is not None:
+            filters.append("client_id = :client_id")
+            params["client_id"] = client_id
+
+        rows = db.execute(text(
+            "SELECT hits.*, clients.first_name, clients.last_name FROM ("
+            f"  SELECT note_type, note_id, client_id, note_date, title, "
+            f"         snippet({NoteSearchService.FTS_TABLE}, -1, :start, :end, '…', 16) AS snippet, "
+            f"         bm25({NoteSearchService.FTS_TABLE}, 4.0, 1.0, 1.0) AS score "
+            f"  FROM {NoteSearchService.FTS_TABLE} WHERE {' AND '.join(filters)} "
+            "  ORDER BY score LIMIT :limit"
+            ") AS hits LEFT JOIN clients ON clients.id = hits.client_id ORDER BY hits.score"
+        ), params).all()
+
+        return [
+            {
+                "note_type": row.note_type,
+                "note_id": row.note_id,
+                "client_id": row.client_id,
+                "client_name": f"{row.first_name} {row.last_name}" if row.first_name is not None else None,
+                "date": row.note_date,
+                "title": row.title or "",
+                "snippet": NoteSearchService._render_snippet(row.snippet),
+                "rank": row.score,
+            }
+            for row in rows
+        ]
@@ -0,0 +1,89 @@
+from typing import Dict, Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from backend.services.client_stats_service import ClientStatsService
+from backend.services.invoice_index_service import InvoiceIndexService
+
+
+class StaleNoteError(Exception):
+    """Raised when a note was changed after the version the caller last read."""
+
+
+class NoteUpdateService:
+    """
+    Conditional, change-detecting updates for session, assessment and supervision notes.
+
+    Every note carries a `version` that increases on each write and is exposed
+    as the ETag of the note endpoints. Updates only write the fields whose
+    values differ, skip the write entirely when nothing changed, and are
+    conditional on the version so overlapping autosaves cannot silently
+    overwrite each other.
+    """
+
+    @staticmethod
+    def etag(version: int) -> str:
+        return f'"{version}"'
+
+    @staticmethod
+    def parse_if_match(header: Optional[str]) -> Optional[int]:
+        """
+        Returns the version named by an If-Match header, or None when the
+        header is absent or "*".
+
+        Raises:
+            ValueError: If the header is not a note ETag.
+        """
+        if header is None or header.strip() == "*":
+            return None
+        value = header.strip()
+        if value.startswith("W/"):
+            value = value[2:]
+        try:
+            return int(value.strip('"'))
+        except ValueError:
+            raise ValueError(f"Invalid If-Match header: {header}")
+
+    @staticmethod
+    def apply_update(db: Session, note, changes: Dict, expected_version: Optional[int] = None) -> bool:
+        """
+        Writes the fields of `changes` that differ from `note` and commits.
+
+        Args:
+            db: The database session.
+            note: The loaded note instance.
+            changes: Field values from the update payload.
+            expected_version: Version from If-Match; None skips the check.
+
+        Returns:
+            True if a row was written, False if the update was a no-op.
+
+        Raises:
+            StaleNoteError: If the note's version is not `expected_version`, or
+                another writer updated it between loading and writing.
+        """
+        model = type(note)
+        if expected_version is not None and note.version != expected_version:
+            raise StaleNoteError(f"Note {note.id} has changed (version {note.version}, expected {expected_version}).")
+
+        changed = {field: value for field, value in changes.items() if field != "id" and getattr(note, field) != value}
+        if not changed:
+            return False
+
+        previous_client_id = note.client_id
+        result = db.execute(
+            update(model)
+            .where(model.id == note.id, model.version == note.version)
+            .values(**changed, version=model.version + 1, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            db.rollback()
+            raise StaleNoteError(f"Note {note.id} was modified concurrently.")
+        ClientStatsService.refresh_clients(db, [previous_client_id, changed.get("client_id", previous_client_id)])
+        if "is_paid" in changed:
+            InvoiceIndexService.sync_paid(db, model, [note.id])
+        db.commit()
+        db.refresh(note)
+        return True
@@ -0,0 +1,101 @@
+import functools
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.models.assessment_note import AssessmentNote
+from backend.models.client import Client
+from backend.models.cpd_note import CPDNote
+from backend.models.session_note import SessionNote
+from backend.models.supervision_note import SupervisionNote
+
+
+class ReportCache:
+    """
+    In-process LRU cache for report results.
+
+    Entries are keyed by the report arguments and tagged with the write
+    generation that was current when the report started running. Any
+    committed write to a client or note table bumps the generation, so older
+    entries are never served again and simply age out of the LRU.
+    """
+
+    MAX_ENTRIES = 64
+    TRACKED_MODELS = (Client, SessionNote, AssessmentNote, SupervisionNote, CPDNote)
+
+    _lock = threading.Lock()
+    _entries: "OrderedDict[Hashable, Tuple[int, Any]]" = OrderedDict()
+    _generation = 0
+
+    @staticmethod
+    def generation() -> int:
+        return ReportCache._generation
+
+    @staticmethod
+    def invalidate() -> None:
+        with ReportCache._lock:
+            ReportCache._generation += 1
+            ReportCache._entries.clear()
+
+    @staticmethod
+    def get_or_compute(key: Hashable, compute: Callable[[], Any]) -> Any:
+        # Capture the generation before querying: a write committed while the
+        # report runs bumps it, so the result is stored under a stale tag.
+        generation = ReportCache._generation
+        with ReportCache._lock:
+            entry = ReportCache._entries.get(key)
+            if entry is not None and entry[0] == generation:
+                ReportCache._entries.move_to_end(key)
+                return entry[1]
+
+        value = compute()
+
+        with ReportCache._lock:
+            if generation == ReportCache._generation:
+                ReportCache._entries[key] = (generation, value)
+                ReportCache._entries.move_to_end(key)
+                while len(ReportCache._entries) > ReportCache.MAX_ENTRIES:
+                    ReportCache._entries.popitem(last=False)
+        return value
+
+
+def cached_report(kind: str):
+    """Memoize a ``(db, start_date, end_date, ...)`` report method by its non-session arguments."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(db: Session, *args, **kwargs):
+            key = (kind, args, tuple(sorted(kwargs.items())))
+            return ReportCache.get_or_compute(key, lambda: func(db, *args, **kwargs))
+        return wrapper
+    return decorator
+
+
+@event.listens_for(Session, "before_flush")
+def _track_report_writes(session, flush_context, instances):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, ReportCache.TRACKED_MODELS):
+            session.info["report_cache_dirty"] = True
+            return
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_report_writes(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, ReportCache.TRACKED_MODELS):
+        orm_execute_state.session.info["report_cache_dirty"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    if session.info.pop("report_cache_dirty", False):
+        ReportCache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("report_cache_dirty", None)
@@ -1,12 +1,16 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, case, extract, or_
+from sqlalchemy import func, and_, case, extract, or_, select, union_all
 from backend.models.session_note import SessionNote
 from backend.models.assessment_note import AssessmentNote
 from backend.models.supervision_note import SupervisionNote
 from backend.models.cpd_note import CPDNote
 from backend.models.client import Client, ClientStatus
-from typing import List, Dict, Optional
+from backend.services.report_cache import cached_report
+from typing import List, Dict, Optional, Sequence, Tuple
+from array import array
 from datetime import date
+import calendar
+import functools
 import logging
 import re
 
@@ -31,173 +35,117 @@ class ReportService:
             return plain[:limit] + "..."
         return plain
 
+    @staticmethod
+    def _month_range(start_date: date, end_date: date) -> Tuple[int, int]:
+        """Return the absolute month offset of start_date and the number of months through end_date."""
+        first = start_date.year * 12 + start_date.month - 1
+        last = end_date.year * 12 + end_date.month - 1
+        return first, max(last - first + 1, 0)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _month_labels(first: int, count: int) -> Tuple[Tuple[str, str], ...]:
+        labels = []
+        for offset in range(first, first + count):
+            year, month_index = divmod(offset, 12)
+            labels.append((f"{year}-{month_index + 1:02d}", f"{calendar.month_name[month_index + 1]} {year}"))
+        return tuple(labels)
+
+    @staticmethod
+    def _bucket_by_month(rows, first: int, count: int, fields: Dict[str, Tuple[str, str]]) -> Dict[str, array]:
+        """
+        Scatter grouped (year, month, ...) rows into per-month buffers.
+
+        `fields` maps each output buffer to the row attribute it is read from and
+        its array typecode. Buffers are indexed by month offset from `first`.
+        """
+        buffers = {name: array(typecode, [0]) * count for name, (_, typecode) in fields.items()}
+        for row in rows:
+            index = int(row.year) * 12 + int(row.month) - 1 - first
+            if 0 <= index < count:
+                for name, (attribute, _) in fields.items():
+                    buffers[name][index] = getattr(row, attribute) or 0
+        return buffers
+
+    @staticmethod
+    def _monthly_rows(first: int, count: int, columns: Dict[str, Sequence]) -> List[Dict]:
+        names = tuple(columns)
+        labels = ReportService._month_labels(first, count)
+        return [
+            {"month_key": key, "month_name": name, **dict(zip(names, values))}
+            for (key, name), values in zip(labels, zip(*columns.values()))
+        ]
+
     @staticmethod
     def _build_monthly_shell(start_date: date, end_date: date, include_hours: bool = True) -> List[Dict]:
         months: List[Dict] = []
-        current = start_date.replace(day=1)
-        end_month = end_date.replace(day=1)
-
-        while current <= end_month:
+        for key, name in ReportService._month_labels(*ReportService._month_range(start_date, end_date)):
             month_data: Dict = {
-                "month_key": f"{current.year}-{current.month:02d}",
-                "month_name": current.strftime("%B %Y"),
+                "month_key": key,
+                "month_name": name,
                 "session_count": 0
             }
             if include_hours:
                 month_data["total_hours"] = 0.0
             months.append(month_data)
-
-            if current.month == 12:
-                current = current.replace(year=current.year + 1, month=1)
-            else:
-                current = current.replace(month=current.month + 1)
-
         return months
 
     @staticmethod
+    @cached_report("client_time")
     def get_client_time_report(db: Session, start_date: date, end_date: date, client_id: Optional[int] = None) -> List[Dict]:
         try:
             logger.info(f"Querying client time report from {start_date} to {end_date}, client_id={client_id}")
-            
-            # If filtering by specific client, get that client first
-            if client_id:
-                client = db.query(Client).filter(Client.id == client_id).first()
-                if not client:
-                    return []
-                if client.status == ClientStatus.WAITING_LIST:
-                    return []
-                client_ids_to_process = [client_id]
-            else:
-                # First check if we have any clients
-                client_count = db.query(Client).count()
-                logger.info(f"Found {client_count} total clients in database")
-                
-                if client_count == 0:
-                    return []
-                client_ids_to_process = None  # Process all clients
 
-            # Build base query conditions
-            session_join_conditions = and_(
-                SessionNote.client_id == Client.id,
-                SessionNote.session_date >= start_date,
-                SessionNote.session_date <= end_date
-            )
-            assessment_join_conditions = and_(
-                AssessmentNote.client_id == Client.id,
-                AssessmentNote.assessment_date >= start_date,
-                AssessmentNote.assessment_date <= end_date
-            )
-            
-            # Add client filter if specified
+            session_filter = and_(SessionNote.session_date >= start_date, SessionNote.session_date <= end_date)
+            assessment_filter = and_(AssessmentNote.assessment_date >= start_date, AssessmentNote.assessment_date <= end_date)
             if client_id:
-                session_join_conditions = and_(session_join_conditions, Client.id == client_id)
-                assessment_join_conditions = and_(assessment_join_conditions, Client.id == client_id)
+                session_filter = and_(session_filter, SessionNote.client_id == client_id)
+                assessment_filter = and_(assessment_filter, AssessmentNote.client_id == client_id)
 
-            # Get session notes aggregated by client
-            session_query = db.query(
+            # Aggregate each note table per client, then fold both into a
+            # single grouped statement joined to clients exactly once.
+            note_totals = union_all(
+                select(
+                    SessionNote.client_id.label("client_id"),
+                    func.sum(SessionNote.duration_minutes).label("total_minutes"),
+                    func.count(SessionNote.id).label("session_count"),
+                    func.sum(case((SessionNote.is_paid == True, 1), else_=0)).label("paid_sessions"),
+                    func.sum(case((SessionNote.is_paid == False, 1), else_=0)).label("unpaid_sessions")
+                ).where(session_filter).group_by(SessionNote.client_id),
+                select(
+                    AssessmentNote.client_id.label("client_id"),
+                    func.sum(AssessmentNote.duration_minutes).label("total_minutes"),
+                    func.count(AssessmentNote.id).label("session_count"),
+                    func.sum(case((AssessmentNote.is_paid == True, 1), else_=0)).label("paid_sessions"),
+                    func.sum(case((AssessmentNote.is_paid == False, 1), else_=0)).label("unpaid_sessions")
+                ).where(assessment_filter).group_by(AssessmentNote.client_id)
+            ).subquery("note_totals")
+
+            query = db.query(
                 Client.id,
                 Client.first_name,
                 Client.last_name,
-                func.coalesce(func.sum(SessionNote.duration_minutes), 0).label("total_minutes"),
-                func.coalesce(func.count(SessionNote.id), 0).label("session_count"),
-                func.coalesce(func.sum(case((SessionNote.is_paid == True, 1), else_=0)), 0).label("paid_sessions"),
-                func.coalesce(func.sum(case((SessionNote.is_paid == False, 1), else_=0)), 0).label("unpaid_sessions")
-            ).outerjoin(SessionNote, session_join_conditions)
-            
-            if client_id:
-                session_query = session_query.filter(Client.id == client_id)
-            else:
-                session_query = session_query.filter(Client.status != ClientStatus.WAITING_LIST)
-            
-            session_results = session_query.group_by(Client.id).all()
-            
-            # Get assessment notes aggregated by client
-            assessment_query = db.query(
-                Client.id,
-                func.coalesce(func.sum(AssessmentNote.duration_minutes), 0).label("total_minutes"),
-                func.coalesce(func.count(AssessmentNote.id), 0).label("session_count"),
-                func.coalesce(func.sum(case((AssessmentNote.is_paid == True, 1), else_=0)), 0).label("paid_sessions"),
-                func.coalesce(func.sum(case((AssessmentNote.is_paid == False, 1), else_=0)), 0).label("unpaid_sessions")
-            ).outerjoin(AssessmentNote, assessment_join_conditions)
-            
+                func.coalesce(func.sum(note_totals.c.total_minutes), 0).label("total_minutes"),
+                func.coalesce(func.sum(note_totals.c.session_count), 0).label("session_count"),
+                func.coalesce(func.sum(note_totals.c.paid_sessions), 0).label("paid_sessions"),
+                func.coalesce(func.sum(note_totals.c.unpaid_sessions), 0).label("unpaid_sessions")
+            ).outerjoin(note_totals, note_totals.c.client_id == Client.id)\
+                .filter(Client.status != ClientStatus.WAITING_LIST)
             if client_id:
-                assessment_query = assessment_query.filter(Client.id == client_id)
-            else:
-                assessment_query = assessment_query.filter(Client.status != ClientStatus.WAITING_LIST)
-            
-            assessment_results = assessment_query.group_by(Client.id).all()
-            
-            # Combine results by client
-            session_dict = {r.id: r for r in session_results}
-            assessment_dict = {r.id: r for r in assessment_results}
-            
-            # Get all unique client IDs
-            all_client_ids = set(session_dict.keys()) | set(assessment_dict.keys())
-            
-            # If filtering by client and no results, still return the client with zeros
-            if client_id and len(all_client_ids) == 0:
-                client = db.query(Client).filter(Client.id == client_id).first()
-                if client:
-                    all_client_ids = {client_id}
-                    session_dict[client_id] = type('obj', (object,), {
-                        'id': client_id,
-                        'first_name': client.first_name,
-                        'last_name': client.last_name,
-                        'total_minutes': 0,
-                        'session_count': 0,
-                        'paid_sessions': 0,
-                        'unpaid_sessions': 0
-                    })()
-            
-            # Build combined results
-            results = []
-            for client_id_item in all_client_ids:
-                session = session_dict.get(client_id_item)
-                assessment = assessment_dict.get(client_id_item)
-                
-                if session:
-                    first_name = session.first_name
-                    last_name = session.last_name
-                    total_minutes = (session.total_minutes or 0) + (assessment.total_minutes if assessment else 0)
-                    session_count = (session.session_count or 0) + (assessment.session_count if assessment else 0)
-                    paid_sessions = (session.paid_sessions or 0) + (assessment.paid_sessions if assessment else 0)
-                    unpaid_sessions = (session.unpaid_sessions or 0) + (assessment.unpaid_sessions if assessment else 0)
-                else:
-                    # Only assessment notes for this client - need to get client info
-                    assessment = assessment_dict[client_id_item]
-                    client = db.query(Client).filter(Client.id == client_id_item).first()
-                    if not client:
-                        continue  # Skip if client doesn't exist
-                    first_name = client.first_name
-                    last_name = client.last_name
-                    total_minutes = assessment.total_minutes or 0
-                    session_count = assessment.session_count or 0
-                    paid_sessions = assessment.paid_sessions or 0
-                    unpaid_sessions = assessment.unpaid_sessions or 0
-                
-                results.append({
-                    'id': client_id_item,
-                    'first_name': first_name,
-                    'last_name': last_name,
-                    'total_minutes': total_minutes,
-                    'session_count': session_count,
-                    'paid_sessions': paid_sessions,
-                    'unpaid_sessions': unpaid_sessions
-                })
-            
-            # Sort by name
-            results.sort(key=lambda x: (x['first_name'], x['last_name']))
+                query = query.filter(Client.id == client_id)
+
+            results = query.group_by(Client.id).order_by(Client.first_name, Client.last_name).all()
 
             logger.info(f"Found {len(results)} clients in the date range")
 
             return [
                 {
-                    "client_id": r['id'],
-                    "client_name": f"{r['first_name']} {r['last_name']}",
-                    "total_hours": (r['total_minutes'] or 0) / 60,
-                    "session_count": r['session_count'] or 0,
-                    "paid_sessions": r['paid_sessions'] or 0,
-                    "unpaid_sessions": r['unpaid_sessions'] or 0
+                    "client_id": r.id,
+                    "client_name": f"{r.first_name} {r.last_name}",
+                    "total_hours": (r.total_minutes or 0) / 60,
+                    "session_count": r.session_count or 0,
+                    "paid_sessions": r.paid_sessions or 0,
+                    "unpaid_sessions": r.unpaid_sessions or 0
                 }
                 for r in results
             ]
@@ -206,6 +154,7 @@ class ReportService:
             raise
 
     @staticmethod
+    @cached_report("supervision_time")
     def get_supervision_time_report(db: Session, start_date: date, end_date: date, client_id: Optional[int] = None) -> Dict:
         try:
             logger.info(f"Querying supervision time report from {start_date} to {end_date}, client_id={client_id}")
@@ -249,46 +198,15 @@ class ReportService:
                 extract('month', SupervisionNote.supervision_date)
             ).all()
             
-            # Create a dictionary of month -> data
-            monthly_dict = {}
-            for row in monthly_data:
-                month_key = f"{int(row.year)}-{int(row.month):02d}"
-                monthly_dict[month_key] = {
-                    "year": int(row.year),
-                    "month": int(row.month),
-                    "total_hours": (row.total_minutes or 0) / 60.0,
-                    "session_count": row.session_count or 0
-                }
-            
-            # Generate all months in the date range
-            all_months = []
-            current = start_date.replace(day=1)
-            end_month = end_date.replace(day=1)
-            
-            while current <= end_month:
-                month_key = f"{current.year}-{current.month:02d}"
-                month_name = current.strftime("%B %Y")
-                
-                if month_key in monthly_dict:
-                    all_months.append({
-                        "month_key": month_key,
-                        "month_name": month_name,
-                        "total_hours": monthly_dict[month_key]["total_hours"],
-                        "session_count": monthly_dict[month_key]["session_count"]
-                    })
-                else:
-                    all_months.append({
-                        "month_key": month_key,
-                        "month_name": month_name,
-                        "total_hours": 0.0,
-                        "session_count": 0
-                    })
-                
-                # Move to next month
-                if current.month == 12:
-                    current = current.replace(year=current.year + 1, month=1)
-                else:
-                    current = current.replace(month=current.month + 1)
+            first, count = ReportService._month_range(start_date, end_date)
+            buckets = ReportService._bucket_by_month(monthly_data, first, count, {
+                "minutes": ("total_minutes", "d"),
+                "session_count": ("session_count", "q")
+            })
+            all_months = ReportService._monthly_rows(first, count, {
+                "total_hours": array("d", (minutes / 60.0 for minutes in buckets["minutes"])),
+                "session_count": buckets["session_count"]
+            })
             
             # Get all supervision notes for the table
             supervision_filter = and_(
@@ -336,6 +254,7 @@ class ReportService:
             raise
 
     @staticmethod
+    @cached_report("session_notes")
     def get_session_notes_report(db: Session, start_date: date, end_date: date, client_id: Optional[int] = None) -> Dict:
         try:
             logger.info(f"Querying session notes report from {start_date} to {end_date}, client_id={client_id}")
@@ -411,74 +330,23 @@ class ReportService:
             ).all()
             
             # Combine monthly data
-            monthly_dict = {}
-            
-            # Add session notes
-            for row in session_monthly_data:
-                month_key = f"{int(row.year)}-{int(row.month):02d}"
-                if month_key not in monthly_dict:
-                    monthly_dict[month_key] = {
-                        "year": int(row.year),
-                        "month": int(row.month),
-                        "session_minutes": 0,
-                        "assessment_minutes": 0,
-                        "session_count": 0,
-                        "assessment_count": 0
-                    }
-                monthly_dict[month_key]["session_minutes"] = row.total_minutes or 0
-                monthly_dict[month_key]["session_count"] = row.session_count or 0
-            
-            # Add assessment notes
-            for row in assessment_monthly_data:
-                month_key = f"{int(row.year)}-{int(row.month):02d}"
-                if month_key not in monthly_dict:
-                    monthly_dict[month_key] = {
-                        "year": int(row.year),
-                        "month": int(row.month),
-                        "session_minutes": 0,
-                        "assessment_minutes": 0,
-                        "session_count": 0,
-                        "assessment_count": 0
-                    }
-                monthly_dict[month_key]["assessment_minutes"] = row.total_minutes or 0
-                monthly_dict[month_key]["assessment_count"] = row.session_count or 0
-            
-            # Generate all months in the date range
-            all_months = []
-            current = start_date.replace(day=1)
-            end_month = end_date.replace(day=1)
-            
-            while current <= end_month:
-                month_key = f"{current.year}-{current.month:02d}"
-                month_name = current.strftime("%B %Y")
-                
-                if month_key in monthly_dict:
-                    data = monthly_dict[month_key]
-                    all_months.append({
-                        "month_key": month_key,
-                        "month_name": month_name,
-                        "session_hours": data["session_minutes"] / 60.0,
-                        "assessment_hours": data["assessment_minutes"] / 60.0,
-                        "total_hours": (data["session_minutes"] + data["assessment_minutes"]) / 60.0,
-                        "session_count": data["session_count"],
-                        "assessment_count": data["assessment_count"]
-                    })
-                else:
-                    all_months.append({
-                        "month_key": month_key,
-                        "month_name": month_name,
-                        "session_hours": 0.0,
-                        "assessment_hours": 0.0,
-                        "total_hours": 0.0,
-                        "session_count": 0,
-                        "assessment_count": 0
-                    })
-                
-                # Move to next month
-                if current.month == 12:
-                    current = current.replace(year=current.year + 1, month=1)
-                else:
-                    current = current.replace(month=current.month + 1)
+            first, count = ReportService._month_range(start_date, end_date)
+            sessions = ReportService._bucket_by_month(session_monthly_data, first, count, {
+                "minutes": ("total_minutes", "d"),
+                "count": ("session_count", "q")
+            })
+            assessments = ReportService._bucket_by_month(assessment_monthly_data, first, count, {
+                "minutes": ("total_minutes", "d"),
+                "count": ("session_count", "q")
+            })
+            all_months = ReportService._monthly_rows(first, count, {
+                "session_hours": array("d", (minutes / 60.0 for minutes in sessions["minutes"])),
+                "assessment_hours": array("d", (minutes / 60.0 for minutes in assessments["minutes"])),
+                "total_hours": array("d", ((session_minutes + assessment_minutes) / 60.0
+                                         for session_minutes, assessment_minutes in zip(sessions["minutes"], assessments["minutes"]))),
+                "session_count": sessions["count"],
+                "assessment_count": assessments["count"]
+            })
             
             # Get all session notes for the table with client information
             session_notes_query = db.query(SessionNote, Client).join(Client, SessionNote.client_id == Client.id)
@@ -546,6 +414,7 @@ class ReportService:
             raise
 
     @staticmethod
+    @cached_report("cpd_notes")
     def get_cpd_notes_report(db: Session, start_date: date, end_date: date) -> Dict:
         try:
             logger.info(f"Querying CPD notes report from {start_date} to {end_date}")
@@ -565,35 +434,12 @@ class ReportService:
                 extract('month', CPDNote.cpd_date)
             ).all()
 
-            monthly_dict = {}
-            for row in monthly_data:
-                month_key = f"{int(row.year)}-{int(row.month):02d}"
-                monthly_dict[month_key] = {
-                    "year": int(row.year),
-                    "month": int(row.month),
-                    "total_hours": float(row.total_hours or 0),
-                    "note_count": row.note_count or 0
-                }
-
-            all_months = []
-            current = start_date.replace(day=1)
-            end_month = end_date.replace(day=1)
-
-            while current <= end_month:
-                month_key = f"{current.year}-{current.month:02d}"
-                month_name = current.strftime("%B %Y")
-                month_data = monthly_dict.get(month_key, {})
-                all_months.append({
-                    "month_key": month_key,
-                    "month_name": month_name,
-                    "total_hours": month_data.get("total_hours", 0.0),
-                    "note_count": month_data.get("note_count", 0)
-                })
-
-                if current.month == 12:
-                    current = current.replace(year=current.year + 1, month=1)
-                else:
-                    current = current.replace(month=current.month + 1)
+            first, count = ReportService._month_range(start_date, end_date)
+            buckets = ReportService._bucket_by_month(monthly_data, first, count, {
+                "total_hours": ("total_hours", "d"),
+                "note_count": ("note_count", "q")
+            })
+            all_months = ReportService._monthly_rows(first, count, buckets)
 
             notes = db.query(CPDNote).filter(cpd_filter).order_by(CPDNote.cpd_date.asc()).all()
             total_hours = sum((n.duration_hours or 0) for n in notes)
@@ -1,6 +1,9 @@
 from sqlalchemy.orm import Session
 from backend.models.session_note import SessionNote
-from backend.schemas.session_note import SessionNoteCreate, SessionNoteUpdate
+from backend.services.client_stats_service import ClientStatsService
+from backend.services.note_batch_service import NoteBatchService
+from backend.services.note_update_service import NoteUpdateService
+from backend.schemas.session_note import SessionNoteCreate, SessionNoteUpdate, SessionNoteBatchUpdate
 from typing import List, Optional
 
 class SessionNoteService:
@@ -17,18 +20,23 @@ class SessionNoteService:
     def create_session(db: Session, session: SessionNoteCreate) -> SessionNote:
         db_session = SessionNote(**session.dict())
         db.add(db_session)
+        db.flush()
+        ClientStatsService.refresh_clients(db, [db_session.client_id])
         db.commit()
         db.refresh(db_session)
         return db_session
 
     @staticmethod
-    def update_session(db: Session, session_id: int, update_data: SessionNoteUpdate) -> Optional[SessionNote]:
+    def update_session(db: Session, session_id: int, update_data: SessionNoteUpdate, expected_version: Optional[int] = None) -> Optional[SessionNote]:
+        """
+        Applies a partial update, writing only fields whose values changed.
+
+        Raises:
+            StaleNoteError: If `expected_version` is given and the note has moved on.
+        """
         db_session = db.query(SessionNote).filter(SessionNote.id == session_id).first()
         if db_session:
-            for field, value in update_data.dict(exclude_unset=True).items():
-                setattr(db_session, field, value)
-            db.commit()
-            db.refresh(db_session)
+            NoteUpdateService.apply_update(db, db_session, update_data.dict(exclude_unset=True), expected_version)
         return db_session
 
     @staticmethod
@@ -36,6 +44,20 @@ class SessionNoteService:
         db_session = db.query(SessionNote).filter(SessionNote.id == session_id).first()
         if db_session:
             db.delete(db_session)
+            db.flush()
+            ClientStatsService.refresh_clients(db, [db_session.client_id])
             db.commit()
             return True
         return False
+
+    @staticmethod
+    def create_sessions(db: Session, notes: List[SessionNoteCreate]) -> List[SessionNote]:
+        return NoteBatchService.create_many(db, SessionNote, notes)
+
+    @staticmethod
+    def update_sessions(db: Session, updates: List[SessionNoteBatchUpdate]) -> List[SessionNote]:
+        return NoteBatchService.update_many(db, SessionNote, updates)
+
+    @staticmethod
+    def set_sessions_paid(db: Session, note_ids: List[int], is_paid: bool = True) -> int:
+        return NoteBatchService.set_paid(db, SessionNote, note_ids, is_paid)
@@ -1,6 +1,9 @@
 from sqlalchemy.orm import Session
 from backend.models.supervision_note import SupervisionNote
-from backend.schemas.supervision_note import SupervisionNoteCreate, SupervisionNoteUpdate
+from backend.services.client_stats_service import ClientStatsService
+from backend.services.note_batch_service import NoteBatchService
+from backend.services.note_update_service import NoteUpdateService
+from backend.schemas.supervision_note import SupervisionNoteCreate, SupervisionNoteUpdate, SupervisionNoteBatchUpdate
 from typing import List, Optional
 
 class SupervisionNoteService:
@@ -13,18 +16,23 @@ class SupervisionNoteService:
     def create_supervision_note(db: Session, note: SupervisionNoteCreate) -> SupervisionNote:
         db_note = SupervisionNote(**note.dict())
         db.add(db_note)
+        db.flush()
+        ClientStatsService.refresh_clients(db, [db_note.client_id])
         db.commit()
         db.refresh(db_note)
         return db_note
 
     @staticmethod
-    def update_supervision_note(db: Session, note_id: int, update_data: SupervisionNoteUpdate) -> Optional[SupervisionNote]:
+    def update_supervision_note(db: Session, note_id: int, update_data: SupervisionNoteUpdate, expected_version: Optional[int] = None) -> Optional[SupervisionNote]:
+        """
+        Applies a partial update, writing only fields whose values changed.
+
+        Raises:
+            StaleNoteError: If `expected_version` is given and the note has moved on.
+        """
         db_note = db.query(SupervisionNote).filter(SupervisionNote.id == note_id).first()
         if db_note:
-            for field, value in update_data.dict(exclude_unset=True).items():
-                setattr(db_note, field, value)
-            db.commit()
-            db.refresh(db_note)
+            NoteUpdateService.apply_update(db, db_note, update_data.dict(exclude_unset=True), expected_version)
         return db_note
 
     @staticmethod
@@ -32,6 +40,8 @@ class SupervisionNoteService:
         db_note = db.query(SupervisionNote).filter(SupervisionNote.id == note_id).first()
         if db_note:
             db.delete(db_note)
+            db.flush()
+            ClientStatsService.refresh_clients(db, [db_note.client_id])
             db.commit()
             return True
         return False
@@ -39,3 +49,11 @@ class SupervisionNoteService:
     @staticmethod
     def get_supervision_notes_for_client(db: Session, client_id: int) -> List[SupervisionNote]:
         return db.query(SupervisionNote).filter(SupervisionNote.client_id == client_id).order_by(SupervisionNote.supervision_date.desc()).all()
+
+    @staticmethod
+    def create_supervision_notes(db: Session, notes: List[SupervisionNoteCreate]) -> List[SupervisionNote]:
+        return NoteBatchService.create_many(db, SupervisionNote, notes)
+
+    @staticmethod
+    def update_supervision_notes(db: Session, updates: List[SupervisionNoteBatchUpdate]) -> List[SupervisionNote]:
+        return NoteBatchService.update_many(db, SupervisionNote, updates)
@@ -6,6 +6,13 @@ from backend.models.therapist_detail import TherapistDetail
 
 
 class TherapistDetailService:
+    # Bumped on every upsert so caches derived from the details can tell they are stale.
+    _generation = 0
+
+    @staticmethod
+    def generation() -> int:
+        return TherapistDetailService._generation
+
     @staticmethod
     def get_therapist_details(db: Session) -> Optional[TherapistDetail]:
         return db.query(TherapistDetail).order_by(TherapistDetail.id.asc()).first()
@@ -21,5 +28,6 @@ class TherapistDetailService:
                 setattr(details, field, value)
 
         db.commit()
+        TherapistDetailService._generation += 1
         db.refresh(details)
         return details
@@ -0,0 +1,25 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.models.appointment_exception import AppointmentException  # noqa: F401 - registers mapper for Appointment
+from backend.models.base import Base
+
+
+@pytest.fixture
+def engine():
+    """Fresh in-memory database with every table; StaticPool shares it across threads."""
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -462,3 +462,241 @@ def test_delete_client_not_found(client):
     response = client.delete("/api/clients/99999")
     assert response.status_code == 404
     assert response.json()["detail"] == "Client not found"
+
+def _create_named_client(client, first_name, last_name, code):
+    response = client.post("/api/clients/", json={
+        "first_name": first_name, "last_name": last_name, "phone": "0123456789",
+        "date_of_birth": datetime.date(1990, 1, 1).isoformat(), "client_code": code,
+        "session_hourly_rate": "60"
+    })
+    assert response.status_code == 200
+    return response.json()
+
+def test_get_clients_keyset_pagination(client):
+    for index, name in enumerate(["Cara", "Alex", "Beth", "Alex", "Dora"]):
+        _create_named_client(client, name, f"Last{index}", f"PG{index}")
+
+    first_page = client.get("/api/clients/?limit=2")
+    assert first_page.status_code == 200
+    assert [c["first_name"] for c in first_page.json()] == ["Alex", "Alex"]
+    cursor = first_page.headers["X-Next-Cursor"]
+
+    second_page = client.get(f"/api/clients/?limit=2&after={cursor}")
+    assert [c["first_name"] for c in second_page.json()] == ["Beth", "Cara"]
+
+    third_page = client.get(f"/api/clients/?limit=2&after={second_page.headers['X-Next-Cursor']}")
+    assert [c["first_name"] for c in third_page.json()] == ["Dora"]
+    assert "X-Next-Cursor" not in third_page.headers
+
+def test_get_clients_field_projection(client):
+    _create_named_client(client, "Proj", "Ected", "PRJ1")
+
+    response = client.get("/api/clients/?fields=first_name,client_code,status,full_name")
+    assert response.status_code == 200
+    assert response.json() == [{
+        "id": response.json()[0]["id"], "first_name": "Proj", "client_code": "PRJ1",
+        "status": "active", "full_name": "Proj Ected"
+    }]
+
+def test_get_clients_invalid_projection_and_cursor(client):
+    assert client.get("/api/clients/?fields=first_name,gp_phone").status_code == 400
+    assert client.get("/api/clients/?limit=2&after=not-a-cursor").status_code == 400
+
+def test_get_client_overview(client, db_session):
+    from sqlalchemy import event
+    from backend.models.appointment import Appointment
+    from backend.services.client_stats_service import ClientStatsService
+
+    created = _create_named_client(client, "Over", "View", "OV1")
+    db_session.add_all([
+        SessionNote(client_id=created["id"], session_date=datetime.date(2025, 1, 8), duration_minutes=50,
+                    is_paid=True, content="<p>private body</p>"),
+        AssessmentNote(client_id=created["id"], assessment_date=datetime.date(2025, 1, 1), duration_minutes=70),
+        SupervisionNote(client_id=created["id"], supervision_date=datetime.date(2025, 1, 9), duration_minutes=60),
+        Appointment(client_id=created["id"], title="Weekly",
+                    start_datetime=datetime.datetime.now() + datetime.timedelta(days=1),
+                    end_datetime=datetime.datetime.now() + datetime.timedelta(days=1, minutes=50),
+                    recurrence_rule="FREQ=WEEKLY;INTERVAL=1", is_active=True),
+    ])
+    # The note services keep client_stats current; these notes bypass them.
+    db_session.flush()
+    ClientStatsService.refresh_clients(db_session, [created["id"]])
+    db_session.commit()
+
+    statements = []
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        response = client.get(f"/api/clients/{created['id']}/overview")
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["client"]["client_code"] == "OV1"
+    assert [n["session_date"] for n in data["session_notes"]] == ["2025-01-08"]
+    assert "content" not in data["session_notes"][0]
+    assert len(data["assessment_notes"]) == 1
+    assert data["totals"] == {"session_total": 120, "supervision_total": 60, "session_count": 2, "supervision_count": 1}
+    assert len(data["upcoming_appointments"]) == 4
+    assert len(statements) <= 6
+
+def test_get_client_overview_not_found(client):
+    assert client.get("/api/clients/9999/overview").status_code == 404
+
+def test_import_clients_csv_reports_row_errors(client):
+    _create_named_client(client, "Existing", "Client", "IMP-1")
+    csv_body = (
+        "first_name,last_name,client_code,phone,date_of_birth,session_hourly_rate,email\n"
+        "Ann,Import,IMP-1,0123,1990-01-01,60,\n"
+        "Bob,Import,IMP-2,0123,1990-01-01,60,bob@example.com\n"
+        "Cal,Import,IMP-2,0123,1990-01-01,60,\n"
+        "Dee,Import,IMP-3,0123,not-a-date,60,\n"
+        "Eve,Import,IMP-4,0123,1990-01-01,60,\n"
+    )
+    response = client.post("/api/clients/import", files={"file": ("clients.csv", csv_body, "text/csv")})
+    assert response.status_code == 200
+    result = response.json()
+    assert result["created"] == 2
+    assert [(error["row"], error["client_code"]) for error in result["errors"]] == [(2, "IMP-1"), (4, "IMP-2"), (5, "IMP-3")]
+    assert "date_of_birth" in result["errors"][2]["errors"][0]
+
+    codes = {c["client_code"] for c in client.get("/api/clients/?filter=all").json()}
+    assert {"IMP-2", "IMP-4"} <= codes
+
+def test_export_round_trips_through_import(client):
+    _create_named_client(client, "Round", "Trip", "RT-1")
+    exported = client.get("/api/clients/export?format=jsonl")
+    assert exported.status_code == 200
+    assert exported.headers["content-type"].startswith("application/x-ndjson")
+
+    client.delete(f"/api/clients/{client.get('/api/clients/').json()[0]['id']}")
+    response = client.post("/api/clients/import", files={"file": ("clients.jsonl", exported.content, "application/x-ndjson")})
+    assert response.json() == {"created": 1, "errors": []}
+
+def test_import_rejects_unknown_format(client):
+    response = client.post("/api/clients/import", files={"file": ("clients.xlsx", b"", "application/octet-stream")})
+    assert response.status_code == 400
+
+def test_upsert_client_is_idempotent(client, db_session):
+    payload = {
+        "first_name": "Sync", "last_name": "Client", "phone": "0123456789",
+        "date_of_birth": "1990-01-01", "client_code": "SYNC-1", "session_hourly_rate": "60"
+    }
+    created = client.put("/api/clients/upsert", json=payload)
+    assert created.status_code == 200
+    repeated = client.put("/api/clients/upsert", json=payload)
+    assert repeated.json()["id"] == created.json()["id"]
+    assert repeated.json()["updated_at"] == created.json()["updated_at"]
+
+    archived = client.post(f"/api/clients/{created.json()['id']}/archive", json={"archive": True})
+    assert archived.status_code == 200
+    updated = client.put("/api/clients/upsert", json={**payload, "phone": "0999"})
+    assert updated.json()["id"] == created.json()["id"]
+    assert updated.json()["phone"] == "0999"
+    # Fields absent from the payload, like status, are left alone.
+    assert updated.json()["status"] == "archived"
+    assert db_session.query(ClientModel).filter(ClientModel.client_code == "SYNC-1").count() == 1
+
+def test_duplicate_client_code_maps_to_existing_message(client):
+    first = _create_named_client(client, "Dup", "One", "DUP-1")
+    _create_named_client(client, "Dup", "Two", "DUP-2")
+
+    response = client.post("/api/clients/", json={
+        "first_name": "Dup", "last_name": "Three", "phone": "0123", "date_of_birth": "1990-01-01",
+        "client_code": "DUP-1", "session_hourly_rate": "60"
+    })
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Client code already exists."
+
+    response = client.put(f"/api/clients/{first['id']}", json={"first_name": "Dup", "last_name": "One", "client_code": "DUP-2"})
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Client code already exists."
+
+def test_bulk_archive_deactivates_appointments(client, db_session):
+    from backend.models.appointment import Appointment
+
+    first = _create_named_client(client, "Year", "End", "YE1")
+    second = _create_named_client(client, "Year", "Ender", "YE2")
+    keep = _create_named_client(client, "Still", "Active", "YE3")
+    start = datetime.datetime(2030, 1, 7, 10, 0)
+    db_session.add_all([
+        Appointment(client_id=owner["id"], start_datetime=start, end_datetime=start + datetime.timedelta(minutes=50),
+                    recurrence_rule="FREQ=WEEKLY;INTERVAL=1", is_active=True)
+        for owner in (first, second, second, keep)
+    ])
+    db_session.commit()
+
+    response = client.post("/api/clients/bulk-status", json={
+        "client_ids": [first["id"], second["id"], 99999], "status": "archived"
+    })
+    assert response.status_code == 200
+    assert response.json() == {"updated": 2, "deactivated_appointments": 3, "missing_ids": [99999]}
+
+    db_session.expire_all()
+    active = db_session.query(Appointment.client_id).filter(Appointment.is_active.is_(True)).all()
+    assert active == [(keep["id"],)]
+    archived = {c["id"] for c in client.get("/api/clients/?filter=archived").json()}
+    assert archived == {first["id"], second["id"]}
+
+def test_delete_client_cascades_in_the_database(client, db_session):
+    from sqlalchemy import event
+    from backend.models.appointment import Appointment
+    from backend.models.appointment_exception import AppointmentException
+
+    created = _create_named_client(client, "Gone", "Client", "DEL-1")
+    appointment = Appointment(client_id=created["id"], start_datetime=datetime.datetime(2030, 1, 7, 10),
+                              end_datetime=datetime.datetime(2030, 1, 7, 11), recurrence_rule="FREQ=WEEKLY;INTERVAL=1")
+    db_session.add_all([
+        SessionNote(client_id=created["id"], session_date=datetime.date(2025, 1, day), duration_minutes=50)
+        for day in range(1, 21)
+    ] + [
+        SupervisionNote(client_id=created["id"], supervision_date=datetime.date(2025, 1, 2), duration_minutes=60),
+        appointment,
+    ])
+    db_session.flush()
+    db_session.add(AppointmentException(appointment_id=appointment.id,
+                                        occurrence_start_datetime=datetime.datetime(2030, 1, 14, 10), action="CANCELLED"))
+    db_session.commit()
+
+    statements = []
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        response = client.delete(f"/api/clients/{created['id']}")
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert response.status_code == 200
+    assert not any(statement.lstrip().upper().startswith("DELETE FROM SESSION_NOTES") for statement in statements)
+    assert len(statements) <= 4
+    db_session.expire_all()
+    for model in (SessionNote, SupervisionNote, Appointment, AppointmentException):
+        assert db_session.query(model).count() == 0
+
+def test_mark_paid_by_client_and_date_range(client, db_session):
+    from backend.models.client_stats import ClientStats
+
+    first = _create_named_client(client, "Pay", "One", "PAY-1")
+    second = _create_named_client(client, "Pay", "Two", "PAY-2")
+    for owner in (first, second):
+        client.post("/api/sessions/batch", json=[
+            {"client_id": owner["id"], "session_date": f"2025-0{month}-10", "duration_minutes": 50}
+            for month in (1, 2, 3)
+        ])
+        client.post("/api/assessments/", json={
+            "client_id": owner["id"], "assessment_date": "2025-02-01", "duration_minutes": 60
+        })
+
+    response = client.post(f"/api/clients/{first['id']}/mark-paid?start=2025-02-01&end=2025-03-31")
+    assert response.status_code == 200
+    assert response.json() == {"session_notes": 2, "assessment_notes": 1}
+    db_session.expire_all()
+    assert db_session.query(ClientStats.unpaid_count).filter(ClientStats.client_id == first["id"]).scalar() == 1
+
+    response = client.post("/api/clients/mark-paid", json={"client_ids": [first["id"], second["id"]]})
+    assert response.json() == {"session_notes": 4, "assessment_notes": 1}
+    assert client.post("/api/clients/99999/mark-paid").status_code == 404
+    assert client.post(f"/api/clients/{first['id']}/mark-paid?start=2025-03-01&end=2025-01-01").status_code == 400
@@ -0,0 +1,47 @@
+import pytest
+
+from backend.models.client import Client, ClientStatus
+from backend.services.client_service import ClientService
+
+
+@pytest.fixture
+def engine(engine):
+    with engine.begin() as conn:
+        ClientService.ensure_search_index(conn)
+    return engine
+
+
+@pytest.fixture(autouse=True)
+def clients(db):
+    db.add_all([
+        Client(first_name="Joanna", last_name="Smith", client_code="JS-01", email="jo@example.com",
+               phone="07700 900123", status=ClientStatus.ACTIVE),
+        Client(first_name="John", last_name="Smithers", client_code="JS-02", status=ClientStatus.ARCHIVED),
+        Client(first_name="Mary", last_name="Jones", client_code="MJ-03", phone="07700 900456", status=ClientStatus.ACTIVE),
+    ])
+    db.commit()
+
+
+def test_search_matches_substrings_across_fields(db):
+    assert sorted(c.last_name for c in ClientService.search_clients(db, "smith", "all")) == ["Smith", "Smithers"]
+    assert [c.first_name for c in ClientService.search_clients(db, "900456", "all")] == ["Mary"]
+    assert [c.first_name for c in ClientService.search_clients(db, "example.com", "all")] == ["Joanna"]
+
+
+def test_search_applies_status_filter_and_limit(db):
+    assert [c.first_name for c in ClientService.search_clients(db, "smith")] == ["Joanna"]
+    assert len(ClientService.search_clients(db, "smith", "all", limit=1)) == 1
+
+
+def test_short_terms_use_prefix_match(db):
+    assert [c.first_name for c in ClientService.search_clients(db, "jo", "all")] == ["Joanna", "John", "Mary"]
+    assert [c.first_name for c in ClientService.search_clients(db, "jo smithers", "all")] == ["John"]
+
+
+def test_index_follows_client_updates(db):
+    mary = db.query(Client).filter(Client.first_name == "Mary").one()
+    mary.last_name = "Llewellyn"
+    db.commit()
+
+    assert ClientService.search_clients(db, "jones", "all") == []
+    assert [c.first_name for c in ClientService.search_clients(db, "llew", "all")] == ["Mary"]
@@ -1,6 +1,7 @@
 import pytest
 import datetime # Added for date_of_birth
 from unittest.mock import MagicMock
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from backend.services.client_service import ClientService # Corrected: use ClientService class
 from backend.models.client import Client, ClientStatus # Corrected: import ClientStatus
@@ -125,21 +126,18 @@ def test_update_client_not_found(db_session_mock):
 
 def test_update_client_duplicate_client_code(db_session_mock):
     existing_client = Client(id=1, first_name="Old", last_name="Name", email="old@example.com")
-    duplicate_client = Client(id=2, first_name="Dup", last_name="Code", email="dup@example.com")
-
-    query_for_client = MagicMock()
-    query_for_client.filter.return_value.first.return_value = existing_client
-    query_for_duplicate = MagicMock()
-    query_for_duplicate.filter.return_value.first.return_value = duplicate_client
-
-    db_session_mock.query.side_effect = [query_for_client, query_for_duplicate]
+    db_session_mock.query.return_value.filter.return_value.first.return_value = existing_client
+    # Duplicates are detected by the unique constraint when committing.
+    db_session_mock.commit.side_effect = IntegrityError(
+        "UPDATE clients", {}, Exception("UNIQUE constraint failed: clients.client_code")
+    )
 
     update_data = ClientUpdate(first_name="Old", last_name="Name", client_code="DUP001")
 
-    with pytest.raises(ValueError):
+    with pytest.raises(ValueError, match="Client code already exists."):
         ClientService.update_client(db_session_mock, client_id=1, update_data=update_data)
 
-    db_session_mock.commit.assert_not_called()
+    db_session_mock.rollback.assert_called_once()
     db_session_mock.refresh.assert_not_called()
 
 def test_set_archive_status_archive_client(db_session_mock):
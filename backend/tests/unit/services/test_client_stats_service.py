@@ -0,0 +1,117 @@
+import datetime
+
+import pytest
+from sqlalchemy import text
+
+from backend.models.client import Client, ClientStatus
+from backend.models.client_stats import ClientStats
+from backend.schemas.assessment_note import AssessmentNoteCreate
+from backend.schemas.session_note import SessionNoteCreate, SessionNoteUpdate
+from backend.schemas.supervision_note import SupervisionNoteCreate, SupervisionNoteUpdate
+from backend.services.assessment_note_service import AssessmentNoteService
+from backend.services.client_service import ClientService
+from backend.services.client_stats_service import ClientStatsService
+from backend.services.session_note_service import SessionNoteService
+from backend.services.supervision_note_service import SupervisionNoteService
+
+
+@pytest.fixture
+def clients(db):
+    records = [
+        Client(first_name="Ann", last_name="One", client_code="S1", status=ClientStatus.ACTIVE),
+        Client(first_name="Bob", last_name="Two", client_code="S2", status=ClientStatus.ACTIVE),
+        Client(first_name="Cal", last_name="Three", client_code="S3", status=ClientStatus.ACTIVE),
+    ]
+    db.add_all(records)
+    db.commit()
+    return records
+
+
+def _stats(db, client_id):
+    db.expire_all()
+    return db.query(ClientStats).filter(ClientStats.client_id == client_id).one()
+
+
+def test_note_services_keep_counters_in_sync(db, clients):
+    ann, bob, _ = clients
+    session = SessionNoteService.create_session(db, SessionNoteCreate(
+        client_id=ann.id, session_date=datetime.date(2025, 3, 1), duration_minutes=50, is_paid=False,
+    ))
+    AssessmentNoteService.create_assessment(db, AssessmentNoteCreate(
+        client_id=ann.id, assessment_date=datetime.date(2025, 4, 1), duration_minutes=90, is_paid=True,
+    ))
+    supervision = SupervisionNoteService.create_supervision_note(db, SupervisionNoteCreate(
+        client_id=ann.id, supervision_date=datetime.date(2025, 4, 2), duration_minutes=60,
+    ))
+
+    stats = _stats(db, ann.id)
+    assert (stats.session_minutes, stats.session_count, stats.unpaid_count) == (140, 2, 1)
+    assert stats.last_session_date == datetime.date(2025, 4, 1)
+    assert (stats.supervision_minutes, stats.supervision_count) == (60, 1)
+
+    SessionNoteService.update_session(db, session.id, SessionNoteUpdate(is_paid=True))
+    SupervisionNoteService.update_supervision_note(db, supervision.id, SupervisionNoteUpdate(client_id=bob.id))
+    assert _stats(db, ann.id).unpaid_count == 0
+    assert _stats(db, ann.id).supervision_count == 0
+    assert _stats(db, bob.id).supervision_minutes == 60
+
+    SessionNoteService.delete_session(db, session.id)
+    stats = _stats(db, ann.id)
+    assert (stats.session_minutes, stats.session_count) == (90, 1)
+    assert ClientStatsService.check_consistency(db) == []
+
+
+def test_consistency_check_detects_and_rebuild_repairs_drift(db, clients):
+    ann = clients[0]
+    SessionNoteService.create_session(db, SessionNoteCreate(
+        client_id=ann.id, session_date=datetime.date(2025, 3, 1), duration_minutes=50,
+    ))
+    # Simulate a writer that bypasses the services, like the migration scripts.
+    db.execute(text("UPDATE session_notes SET duration_minutes = 60"))
+    db.commit()
+
+    mismatches = ClientStatsService.check_consistency(db)
+    assert mismatches == [{"client_id": ann.id, "differences": {"session_minutes": {"expected": 60, "stored": 50}}}]
+
+    assert ClientStatsService.rebuild(db) == 3
+    assert ClientStatsService.check_consistency(db) == []
+    assert _stats(db, ann.id).session_minutes == 60
+
+
+def test_client_list_sorts_and_filters_by_counters(db, clients):
+    ann, bob, cal = clients
+    SessionNoteService.create_session(db, SessionNoteCreate(
+        client_id=ann.id, session_date=datetime.date(2025, 1, 1), duration_minutes=50, is_paid=False,
+    ))
+    SessionNoteService.create_session(db, SessionNoteCreate(
+        client_id=bob.id, session_date=datetime.date(2025, 6, 1), duration_minutes=50, is_paid=True,
+    ))
+
+    assert [c.id for c in ClientService.get_clients(db, sort="last_seen")] == [bob.id, ann.id, cal.id]
+    assert [c.id for c in ClientService.get_clients(db, sort="unpaid")] == [ann.id, bob.id, cal.id]
+    assert [c.id for c in ClientService.get_clients(db, has_unpaid=True)] == [ann.id]
+    assert [c.id for c in ClientService.get_clients(db, has_unpaid=False)] == [bob.id, cal.id]
+    with pytest.raises(ValueError):
+        ClientService.get_clients(db, sort="unpaid", after=("Ann", "One", ann.id))
+
+
+def test_totals_are_served_from_the_stats_row(db, clients):
+    ann, bob, cal = clients
+    SessionNoteService.create_session(db, SessionNoteCreate(
+        client_id=ann.id, session_date=datetime.date(2025, 3, 1), duration_minutes=50,
+    ))
+    AssessmentNoteService.create_assessment(db, AssessmentNoteCreate(
+        client_id=ann.id, assessment_date=datetime.date(2025, 2, 1), duration_minutes=90,
+    ))
+    SupervisionNoteService.create_supervision_note(db, SupervisionNoteCreate(
+        client_id=ann.id, supervision_date=datetime.date(2025, 3, 2), duration_minutes=60,
+    ))
+
+    totals = ClientStatsService.get_totals(db, ann.id)
+    assert totals == {"session_total": 140, "supervision_total": 60, "session_count": 2, "supervision_count": 1}
+    ClientStatsService.rebuild(db)
+    assert ClientStatsService.get_totals(db, ann.id) == totals
+    assert ClientService.get_client_overview(db, ann.id)["totals"] == totals
+    assert ClientStatsService.get_totals(db, cal.id) == {
+        "session_total": 0, "supervision_total": 0, "session_count": 0, "supervision_count": 0,
+    }
@@ -0,0 +1,53 @@
+import csv
+import datetime
+import io
+import os
+import zipfile
+
+import pytest
+
+from backend.models.client import Client, ClientStatus
+from backend.models.session_note import SessionNote
+from backend.models.therapist_detail import TherapistDetail
+from backend.services.invoice_archive_service import InvoiceArchiveService
+from backend.services.invoice_service import InvoiceService
+
+
+@pytest.fixture
+def db(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(InvoiceService, "INVOICE_DIR", str(tmp_path))
+    db.add(TherapistDetail(
+        business_name="Practice", therapist_name="Terry", therapy_type="Counselling", email="t@example.com",
+        bank="Bank", session_hourly_rate="60", sort_code="00-00-00", account_number="12345678",
+    ))
+    client = Client(first_name="Zip", last_name="Per", client_code="Z-1", session_hourly_rate="60",
+                    status=ClientStatus.ACTIVE)
+    db.add(client)
+    db.flush()
+    for month in (1, 2, 3):
+        db.add(SessionNote(client_id=client.id, session_date=datetime.date(2025, month, 1), duration_minutes=50))
+    db.add(SessionNote(client_id=client.id, session_date=datetime.date(2024, 12, 1), duration_minutes=50))
+    db.commit()
+    return db
+
+
+def test_archive_streams_year_pdfs_and_regenerates_missing_ones(db):
+    created = InvoiceService.create_for_period(db, datetime.date(2024, 1, 1), datetime.date(2025, 12, 31))["created"]
+    for invoice in created:
+        future = InvoiceService.get_render_future(invoice.id)
+        if future is not None:
+            future.result(timeout=10)
+    missing = next(invoice for invoice in created if invoice.invoice_number == "INV-2025-0002")
+    os.remove(missing.pdf_path)
+
+    chunks = list(InvoiceArchiveService.stream_archive(db, 2025))
+
+    assert len(chunks) > 1
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert sorted(archive.namelist()) == [
+            "INV-2025-0001.pdf", "INV-2025-0002.pdf", "INV-2025-0003.pdf", "manifest.csv",
+        ]
+        assert archive.read("INV-2025-0002.pdf").startswith(b"%PDF")
+        manifest = list(csv.DictReader(io.StringIO(archive.read("manifest.csv").decode())))
+    assert [row["invoice_number"] for row in manifest] == ["INV-2025-0001", "INV-2025-0002", "INV-2025-0003"]
+    assert {(row["client_name"], row["amount"], row["status"]) for row in manifest} == {("Zip Per", "60.00", "ready")}
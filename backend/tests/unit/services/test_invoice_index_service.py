@@ -0,0 +1,71 @@
+import datetime
+
+import pytest
+
+from backend.models.client import Client, ClientStatus
+from backend.models.session_note import SessionNote
+from backend.models.therapist_detail import TherapistDetail
+from backend.services.invoice_index_service import InvoiceIndexService
+from backend.services.invoice_service import InvoiceService
+from backend.services.session_note_service import SessionNoteService
+
+
+@pytest.fixture
+def db(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(InvoiceService, "INVOICE_DIR", str(tmp_path))
+    db.add(TherapistDetail(
+        business_name="Practice", therapist_name="Terry", therapy_type="Counselling", email="t@example.com",
+        bank="Bank", session_hourly_rate="60", sort_code="00-00-00", account_number="12345678",
+    ))
+    db.commit()
+    return db
+
+
+@pytest.fixture
+def invoices(db):
+    clients = [
+        Client(first_name="Ann", last_name="A", client_code="A-1", session_hourly_rate="60", status=ClientStatus.ACTIVE),
+        Client(first_name="Ben", last_name="B", client_code="B-1", session_hourly_rate="45.50", status=ClientStatus.ACTIVE),
+    ]
+    db.add_all(clients)
+    db.flush()
+    for day in (1, 2, 3):
+        for client in clients:
+            db.add(SessionNote(client_id=client.id, session_date=datetime.date(2025, 3, day), duration_minutes=50))
+    db.add(SessionNote(client_id=clients[0].id, session_date=datetime.date(2024, 12, 30), duration_minutes=50))
+    db.commit()
+    created = InvoiceService.create_for_period(db, datetime.date(2024, 1, 1), datetime.date(2025, 12, 31))["created"]
+    for invoice in created:
+        future = InvoiceService.get_render_future(invoice.id)
+        if future is not None:
+            future.result(timeout=10)
+    return clients, created
+
+
+def test_list_filters_and_paginates_from_invoice_columns(db, invoices):
+    clients, created = invoices
+
+    ann = InvoiceIndexService.list_invoices(db, year=2025, client_id=clients[0].id)
+    assert [invoice.invoice_number for invoice in ann] == ["INV-2025-0005", "INV-2025-0003", "INV-2025-0001"]
+    assert {invoice.amount_minor for invoice in ann} == {6000}
+
+    page = InvoiceIndexService.list_invoices(db, limit=4)
+    rest = InvoiceIndexService.list_invoices(db, limit=4, after=page[-1].invoice_number)
+    assert [invoice.invoice_number for invoice in page + rest][-1] == "INV-2024-0001"
+    assert len(page + rest) == len(created) == 7
+
+    ranged = InvoiceIndexService.list_invoices(db, number_from="INV-2025-0002", number_to="inv-2025-0004")
+    assert [invoice.sequence_number for invoice in ranged] == [4, 3, 2]
+    with pytest.raises(ValueError):
+        InvoiceIndexService.list_invoices(db, after="2025-7")
+
+
+def test_marking_notes_paid_updates_the_invoice_flag(db, invoices):
+    clients, _ = invoices
+    ben_notes = [note.id for note in SessionNoteService.get_client_sessions(db, clients[1].id)]
+
+    SessionNoteService.set_sessions_paid(db, ben_notes[:2])
+
+    paid = InvoiceIndexService.list_invoices(db, is_paid=True)
+    assert len(paid) == 2 and {invoice.client_id for invoice in paid} == {clients[1].id}
+    assert len(InvoiceIndexService.list_invoices(db, is_paid=False)) == 5
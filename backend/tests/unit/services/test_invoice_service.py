@@ -0,0 +1,248 @@
+import datetime
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from sqlalchemy import event
+
+from backend.models.client import Client, ClientStatus
+from backend.models.invoice import InvoiceStatus
+from backend.models.invoice_sequence import InvoiceSequence
+from backend.models.assessment_note import AssessmentNote
+from backend.models.session_note import SessionNote
+from backend.models.therapist_detail import TherapistDetail
+from backend.services import invoice_service
+from backend.services.invoice_service import InvoiceService
+from backend.services.therapist_detail_service import TherapistDetailService
+
+
+@pytest.fixture
+def db(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(InvoiceService, "INVOICE_DIR", str(tmp_path))
+    db.add(TherapistDetail(
+        business_name="Practice", therapist_name="Terry", therapy_type="Counselling", email="t@example.com",
+        bank="Bank", session_hourly_rate="60", sort_code="00-00-00", account_number="12345678",
+    ))
+    db.commit()
+    return db
+
+
+@pytest.fixture
+def session_note(db):
+    client = Client(first_name="Inv", last_name="Oice", client_code="I-1", session_hourly_rate="60",
+                    status=ClientStatus.ACTIVE)
+    db.add(client)
+    db.flush()
+    note = SessionNote(client_id=client.id, session_date=datetime.date(2025, 3, 1), duration_minutes=50)
+    db.add(note)
+    db.commit()
+    return note
+
+
+@pytest.fixture
+def render_calls(monkeypatch):
+    calls = []
+    original = InvoiceService._generate_pdf
+
+    def _counting(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(InvoiceService, "_generate_pdf", staticmethod(_counting))
+    return calls
+
+
+def _rendered(db, invoice):
+    future = InvoiceService.get_render_future(invoice.id)
+    if future is not None:
+        future.result(timeout=10)
+    db.refresh(invoice)
+    return invoice
+
+
+def test_reopening_unchanged_invoice_skips_rendering(db, session_note, render_calls):
+    invoice, created = InvoiceService.get_or_create_from_session(db, session_note.id)
+    assert created and invoice.status == InvoiceStatus.PENDING
+    assert _rendered(db, invoice).status == InvoiceStatus.READY and invoice.content_hash
+    assert len(render_calls) == 1
+
+    again, created = InvoiceService.get_or_create_from_session(db, session_note.id)
+    assert not created and again.id == invoice.id
+    assert InvoiceService.get_render_future(invoice.id) is None
+    assert len(render_calls) == 1
+
+
+def test_changed_inputs_or_missing_file_rerender(db, session_note, render_calls):
+    invoice, _ = InvoiceService.get_or_create_from_session(db, session_note.id)
+    first_hash = _rendered(db, invoice).content_hash
+
+    session_note.is_paid = True
+    db.commit()
+    InvoiceService.get_or_create_from_session(db, session_note.id)
+    assert _rendered(db, invoice).content_hash != first_hash
+    assert len(render_calls) == 2
+
+    os.remove(invoice.pdf_path)
+    InvoiceService.get_or_create_from_session(db, session_note.id)
+    _rendered(db, invoice)
+    assert len(render_calls) == 3
+    assert os.path.exists(invoice.pdf_path)
+
+
+def test_create_for_period_numbers_in_date_order_and_skips_invoiced(db, session_note, render_calls, monkeypatch):
+    monkeypatch.setattr(InvoiceService, "POOL_MIN_BATCH", 100)
+    _rendered(db, InvoiceService.get_or_create_from_session(db, session_note.id)[0])
+    for day in (20, 10):
+        db.add(SessionNote(client_id=session_note.client_id, session_date=datetime.date(2025, 3, day), duration_minutes=50))
+    no_rate = Client(first_name="No", last_name="Rate", client_code="I-2", status=ClientStatus.ACTIVE)
+    db.add(no_rate)
+    db.flush()
+    db.add(SessionNote(client_id=no_rate.id, session_date=datetime.date(2025, 3, 15), duration_minutes=50))
+    db.commit()
+
+    result = InvoiceService.create_for_period(db, datetime.date(2025, 3, 1), datetime.date(2025, 3, 31))
+
+    assert [invoice.invoice_number for invoice in result["created"]] == ["INV-2025-0002", "INV-2025-0003"]
+    assert all(
+        _rendered(db, invoice).content_hash and os.path.exists(invoice.pdf_path) for invoice in result["created"]
+    )
+    assert len(result["errors"]) == 1 and result["errors"][0]["source_type"] == "session"
+    assert InvoiceService.create_for_period(db, datetime.date(2025, 3, 1), datetime.date(2025, 3, 31))["created"] == []
+
+
+def test_numbers_come_from_the_year_counter_without_gaps(db, session_note, monkeypatch):
+    db.add(InvoiceSequence(year=2025, last_value=41))
+    db.commit()
+    second = SessionNote(client_id=session_note.client_id, session_date=datetime.date(2025, 3, 8), duration_minutes=50)
+    db.add(second)
+    db.commit()
+
+    def _failing(*args, **kwargs):
+        raise RuntimeError("disk full")
+
+    original = InvoiceService._generate_pdf
+    monkeypatch.setattr(InvoiceService, "_generate_pdf", staticmethod(_failing))
+    first, _ = InvoiceService.get_or_create_from_session(db, session_note.id)
+    assert _rendered(db, first).status == InvoiceStatus.FAILED and first.render_error == "disk full"
+
+    # Reopening a failed invoice renders it again under the same number.
+    monkeypatch.setattr(InvoiceService, "_generate_pdf", staticmethod(original))
+    again, created = InvoiceService.get_or_create_from_session(db, session_note.id)
+    assert not created and _rendered(db, again).status == InvoiceStatus.READY
+    following, _ = InvoiceService.get_or_create_from_session(db, second.id)
+    _rendered(db, following)
+    assert (first.invoice_number, following.invoice_number) == ("INV-2025-0042", "INV-2025-0043")
+    assert db.get(InvoiceSequence, 2025).last_value == 43
+
+
+def test_a_broken_render_pool_fails_the_whole_batch(db, session_note, monkeypatch):
+    class _BrokenPool:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return False
+
+        def map(self, *args, **kwargs):
+            raise BrokenProcessPool("worker died")
+
+    monkeypatch.setattr(invoice_service, "ProcessPoolExecutor", _BrokenPool)
+    monkeypatch.setattr(InvoiceService, "POOL_MIN_BATCH", 1)
+    db.add(SessionNote(client_id=session_note.client_id, session_date=datetime.date(2025, 3, 8), duration_minutes=50))
+    db.commit()
+
+    result = InvoiceService.create_for_period(db, datetime.date(2025, 3, 1), datetime.date(2025, 3, 31))
+
+    assert len(result["created"]) == 2
+    assert all(
+        _rendered(db, invoice).status == InvoiceStatus.FAILED and invoice.render_error == "worker died"
+        for invoice in result["created"]
+    )
+
+
+def test_render_lock_is_not_held_while_committing(db, session_note, monkeypatch):
+    held = []
+    commit = db.commit
+
+    def _recording_commit():
+        held.append(invoice_service._render_lock.locked())
+        commit()
+
+    monkeypatch.setattr(db, "commit", _recording_commit)
+    invoice, _ = InvoiceService.get_or_create_from_session(db, session_note.id)
+
+    assert _rendered(db, invoice).status == InvoiceStatus.READY
+    assert held and not any(held)
+
+
+def test_orphaned_pending_render_is_resumed(db, session_note):
+    invoice = _rendered(db, InvoiceService.get_or_create_from_session(db, session_note.id)[0])
+    assert not InvoiceService.resume_pending_render(db, invoice)
+
+    # A restart mid-render leaves the row PENDING with no job in this process.
+    invoice.status = InvoiceStatus.PENDING
+    db.commit()
+    assert InvoiceService.get_render_future(invoice.id) is None
+
+    assert InvoiceService.resume_pending_render(db, invoice)
+    assert _rendered(db, invoice).status == InvoiceStatus.READY
+
+
+def test_consolidated_invoice_lists_every_note_and_paginates(db, session_note, render_calls):
+    for offset in range(1, 60):
+        db.add(SessionNote(client_id=session_note.client_id, duration_minutes=50,
+                           session_date=datetime.date(2025, 3, 1) + datetime.timedelta(days=offset)))
+    db.add(AssessmentNote(client_id=session_note.client_id, assessment_date=datetime.date(2025, 3, 2), duration_minutes=50))
+    db.commit()
+
+    result = InvoiceService.create_for_period(
+        db, datetime.date(2025, 3, 1), datetime.date(2025, 6, 30), consolidate=True
+    )
+
+    assert result["errors"] == [] and len(result["created"]) == 1
+    invoice = _rendered(db, result["created"][0])
+    assert invoice.status == InvoiceStatus.READY
+    assert len(invoice.lines) == 61 and (invoice.source_type, invoice.source_id) == ("session", session_note.id)
+    assert invoice.lines[1].source_type == "assessment"
+    with open(invoice.pdf_path, "rb") as pdf:
+        assert pdf.read().count(b"/Type /Page\n") > 1
+
+    # Any of its notes opens the consolidated invoice rather than a new one.
+    reopened, created = InvoiceService.get_or_create_from_session(db, invoice.lines[-1].source_id)
+    assert not created and reopened.id == invoice.id
+    assert len(render_calls) == 1
+
+
+def test_therapist_payload_is_cached_until_details_are_saved(db, session_note):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    first = InvoiceService._get_therapist_payload(db)
+    assert InvoiceService._get_therapist_payload(db) is first
+    assert sum("FROM therapist_details" in statement for statement in statements) == 1
+
+    TherapistDetailService.upsert_therapist_details(db, {"business_name": "Renamed Practice"})
+    assert InvoiceService._get_therapist_payload(db)["business_name"] == "Renamed Practice"
+
+
+def test_pdfs_are_stored_under_their_content_hash(db, session_note):
+    invoice, _ = InvoiceService.get_or_create_from_session(db, session_note.id)
+    first_path = _rendered(db, invoice).pdf_path
+    assert os.path.basename(first_path) == f"{invoice.invoice_number}-{invoice.content_hash[:16]}.pdf"
+    with open(first_path, "rb") as pdf:
+        first_bytes = pdf.read()
+
+    # The same inputs render to the same bytes, so the ETag stays valid.
+    os.remove(first_path)
+    InvoiceService.get_or_create_from_session(db, session_note.id)
+    with open(_rendered(db, invoice).pdf_path, "rb") as pdf:
+        assert pdf.read() == first_bytes
+
+    session_note.is_paid = True
+    db.commit()
+    InvoiceService.get_or_create_from_session(db, session_note.id)
+    assert _rendered(db, invoice).pdf_path != first_path
+    assert os.path.exists(invoice.pdf_path) and not os.path.exists(first_path)
@@ -0,0 +1,73 @@
+import datetime
+
+import pytest
+from sqlalchemy import event
+
+from backend.models.client import Client, ClientStatus
+from backend.models.client_stats import ClientStats
+from backend.schemas.session_note import SessionNoteBatchUpdate, SessionNoteCreate
+from backend.schemas.supervision_note import SupervisionNoteCreate
+from backend.services.client_stats_service import ClientStatsService
+from backend.services.session_note_service import SessionNoteService
+from backend.services.supervision_note_service import SupervisionNoteService
+
+
+@pytest.fixture
+def client_record(db):
+    client = Client(first_name="Bat", last_name="Ch", client_code="B-1", status=ClientStatus.ACTIVE)
+    db.add(client)
+    db.commit()
+    return client
+
+
+def _week(client_id):
+    return [
+        SessionNoteCreate(client_id=client_id, session_date=datetime.date(2025, 3, day), duration_minutes=50)
+        for day in range(3, 8)
+    ]
+
+
+def test_create_batch_inserts_in_one_statement_and_keeps_order(db, engine, client_record):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    created = SessionNoteService.create_sessions(db, _week(client_record.id))
+
+    assert [note.session_date.day for note in created] == [3, 4, 5, 6, 7]
+    assert sum(statement.startswith("INSERT INTO session_notes") for statement in statements) == 1
+    stats = db.query(ClientStats).filter(ClientStats.client_id == client_record.id).one()
+    assert (stats.session_count, stats.unpaid_count) == (5, 5)
+
+
+def test_create_batch_rejects_unknown_clients_atomically(db, client_record):
+    notes = _week(client_record.id) + [
+        SessionNoteCreate(client_id=999, session_date=datetime.date(2025, 3, 8), duration_minutes=50)
+    ]
+    with pytest.raises(ValueError, match="999"):
+        SessionNoteService.create_sessions(db, notes)
+    db.rollback()
+    assert SessionNoteService.get_client_sessions(db, client_record.id) == []
+
+
+def test_update_and_mark_paid_batches(db, client_record):
+    created = SessionNoteService.create_sessions(db, _week(client_record.id))
+
+    updated = SessionNoteService.update_sessions(db, [
+        SessionNoteBatchUpdate(id=created[0].id, duration_minutes=90),
+        SessionNoteBatchUpdate(id=created[1].id, content="<p>caught up</p>"),
+    ])
+    assert [(note.duration_minutes, note.content) for note in updated] == [(90, None), (50, "<p>caught up</p>")]
+
+    assert SessionNoteService.set_sessions_paid(db, [note.id for note in created[:3]]) == 3
+    assert SessionNoteService.set_sessions_paid(db, [note.id for note in created[:3]]) == 0
+    assert ClientStatsService.check_consistency(db) == []
+
+    with pytest.raises(LookupError):
+        SessionNoteService.update_sessions(db, [SessionNoteBatchUpdate(id=12345, duration_minutes=1)])
+
+
+def test_supervision_batch_uses_column_defaults(db, client_record):
+    created = SupervisionNoteService.create_supervision_notes(db, [
+        SupervisionNoteCreate(client_id=client_record.id, supervision_date=datetime.date(2025, 3, 3)),
+    ])
+    assert created[0].duration_minutes == 50
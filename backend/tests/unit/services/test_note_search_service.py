@@ -0,0 +1,116 @@
+import datetime
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine
+
+from backend.models.base import Base
+from backend.models.client import Client, ClientStatus
+from backend.models.cpd_note import CPDNote
+from backend.models.session_note import SessionNote
+from backend.models.supervision_note import SupervisionNote
+from backend.services.note_search_service import NoteSearchService
+
+
+@pytest.fixture
+def engine(engine):
+    with engine.begin() as conn:
+        NoteSearchService.ensure_index(conn)
+    return engine
+
+
+@pytest.fixture
+def client_record(db):
+    client = Client(first_name="Sam", last_name="Search", client_code="SS-1", status=ClientStatus.ACTIVE)
+    db.add(client)
+    db.commit()
+    return client
+
+
+def test_search_returns_highlighted_snippets(db, client_record):
+    db.add(SessionNote(
+        client_id=client_record.id,
+        session_date=datetime.date(2025, 5, 1),
+        duration_minutes=50,
+        content="<p>Client described <strong>anxiety</strong> about work &amp; family.</p>",
+    ))
+    db.add(CPDNote(cpd_date=datetime.date(2025, 5, 2), title="Anxiety workshop", content="<p>Notes</p>"))
+    db.commit()
+
+    results = NoteSearchService.search(db, "anxi")
+
+    assert {r["note_type"] for r in results} == {"session", "cpd"}
+    session_hit = next(r for r in results if r["note_type"] == "session")
+    assert session_hit["client_name"] == "Sam Search"
+    assert "<mark>anxiety</mark>" in session_hit["snippet"]
+    assert "&amp; family" in session_hit["snippet"]
+    assert "<strong>" not in session_hit["snippet"]
+
+
+def test_triggers_follow_updates_and_deletes(db, client_record):
+    note = SupervisionNote(
+        client_id=client_record.id,
+        supervision_date=datetime.date(2025, 6, 1),
+        content="Discussed boundaries",
+        personal_notes="private reflection",
+    )
+    db.add(note)
+    db.commit()
+    assert len(NoteSearchService.search(db, "reflection")) == 1
+
+    note.personal_notes = "revised thoughts"
+    db.commit()
+    assert NoteSearchService.search(db, "reflection") == []
+    assert len(NoteSearchService.search(db, "revised", note_type="supervision", client_id=client_record.id)) == 1
+
+    db.delete(note)
+    db.commit()
+    assert NoteSearchService.search(db, "revised") == []
+
+
+def test_query_syntax_is_neutralised(db, client_record):
+    db.add(SessionNote(client_id=client_record.id, session_date=datetime.date(2025, 1, 1), duration_minutes=50, content="grief work"))
+    db.commit()
+
+    assert NoteSearchService.build_match_query('grief" OR (') == '"grief"* "OR"*'
+    assert NoteSearchService.search(db, '"grief') != []
+    assert NoteSearchService.search(db, "  ") == []
+
+
+def test_markup_is_not_indexed(db, client_record):
+    db.add(SessionNote(
+        client_id=client_record.id,
+        session_date=datetime.date(2025, 6, 1),
+        duration_minutes=50,
+        content='<p>Talked about <strong>grief</strong> &amp; loss</p><p><span style="color: rgb(230, 0, 0);">work</span></p>',
+        personal_notes="<p>Follow up &lt;next week&gt;</p>",
+    ))
+    db.commit()
+
+    for markup_term in ("strong", "span", "style", "color", "rgb", "amp", "lt"):
+        assert NoteSearchService.search(db, markup_term) == []
+    assert NoteSearchService.search(db, "grief")[0]["snippet"] == "Talked about <mark>grief</mark> &amp; loss work"
+    assert "&lt;next week&gt;" in NoteSearchService.search(db, "follow")[0]["snippet"]
+
+
+def test_notes_stay_writable_without_the_app(tmp_path):
+    path = tmp_path / "notes.db"
+    file_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=file_engine)
+    with file_engine.begin() as conn:
+        NoteSearchService.ensure_index(conn)
+        NoteSearchService.ensure_index(conn)
+    file_engine.dispose()
+
+    # A bare sqlite3 connection has none of the app's connection setup.
+    with sqlite3.connect(path) as conn:
+        conn.execute("INSERT INTO clients (id, first_name, last_name, client_code, status, session_hourly_rate) "
+                     "VALUES (1, 'Raw', 'Writer', 'RW-1', 'ACTIVE', '')")
+        conn.execute("INSERT INTO session_notes (client_id, session_date, duration_minutes, content, session_type, version) "
+                     "VALUES (1, '2025-07-01', 50, '<p>first <em>draft</em></p>', 'In-Person', 1)")
+        conn.execute("UPDATE session_notes SET content = '<p>Worked on <strong>sleep</strong> &amp; routine</p>'")
+        conn.execute("INSERT INTO cpd_notes (cpd_date, duration_hours, content, link_url, organisation, title, medium) "
+                     "VALUES ('2025-07-02', 1.0, '<p>Trauma course</p>', '', '', 'Course', 'Online')")
+        rows = dict(conn.execute("SELECT note_type, content FROM notes_fts").fetchall())
+
+    assert rows == {"session": "Worked on sleep & routine", "cpd": "Trauma course"}
@@ -0,0 +1,61 @@
+import datetime
+
+import pytest
+from sqlalchemy import event, text
+
+from backend.models.client import Client, ClientStatus
+from backend.schemas.session_note import SessionNoteCreate, SessionNoteUpdate
+from backend.services.note_update_service import NoteUpdateService, StaleNoteError
+from backend.services.session_note_service import SessionNoteService
+
+
+@pytest.fixture
+def note(db):
+    client = Client(first_name="Ver", last_name="Sion", client_code="V-1", status=ClientStatus.ACTIVE)
+    db.add(client)
+    db.commit()
+    return SessionNoteService.create_session(db, SessionNoteCreate(
+        client_id=client.id, session_date=datetime.date(2025, 3, 1), duration_minutes=50, content="<p>draft</p>",
+    ))
+
+
+def test_unchanged_autosave_skips_the_write(db, engine, note):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    SessionNoteService.update_session(db, note.id, SessionNoteUpdate(content="<p>draft</p>", duration_minutes=50), expected_version=1)
+
+    assert not any(statement.startswith("UPDATE") for statement in statements)
+    assert note.version == 1
+
+
+def test_update_bumps_version_and_rejects_stale_versions(db, note):
+    SessionNoteService.update_session(db, note.id, SessionNoteUpdate(content="<p>first</p>"), expected_version=1)
+    assert note.version == 2
+
+    with pytest.raises(StaleNoteError):
+        SessionNoteService.update_session(db, note.id, SessionNoteUpdate(content="<p>overlap</p>"), expected_version=1)
+    db.refresh(note)
+    assert note.content == "<p>first</p>"
+
+    # Without If-Match the update is unconditional but still versioned.
+    SessionNoteService.update_session(db, note.id, SessionNoteUpdate(content="<p>second</p>"))
+    assert note.version == 3
+
+
+def test_concurrent_writer_between_read_and_write_is_detected(db, note):
+    db.execute(text("UPDATE session_notes SET content = 'other', version = version + 1"))
+    db.commit()
+    # Simulate a stale in-memory copy loaded before the other write.
+    note.version = 1
+    with pytest.raises(StaleNoteError):
+        NoteUpdateService.apply_update(db, note, {"content": "mine"})
+
+
+def test_if_match_parsing():
+    assert NoteUpdateService.parse_if_match(None) is None
+    assert NoteUpdateService.parse_if_match("*") is None
+    assert NoteUpdateService.parse_if_match('W/"7"') == 7
+    assert NoteUpdateService.parse_if_match(NoteUpdateService.etag(3)) == 3
+    with pytest.raises(ValueError):
+        NoteUpdateService.parse_if_match('"abc"')
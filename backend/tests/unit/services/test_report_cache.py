@@ -0,0 +1,59 @@
+import datetime
+
+import pytest
+
+from backend.models.client import Client, ClientStatus
+from backend.models.session_note import SessionNote
+from backend.services.report_cache import ReportCache
+from backend.services.report_service import ReportService
+
+
+@pytest.fixture
+def db(db):
+    ReportCache.invalidate()
+    return db
+
+
+def _add_client(db, code="RC-001"):
+    client = Client(first_name="Report", last_name="Client", client_code=code, status=ClientStatus.ACTIVE)
+    db.add(client)
+    db.commit()
+    return client
+
+
+def test_repeated_report_is_served_from_cache(db):
+    client = _add_client(db)
+    db.add(SessionNote(client_id=client.id, session_date=datetime.date(2025, 1, 10), duration_minutes=50))
+    db.commit()
+
+    start, end = datetime.date(2025, 1, 1), datetime.date(2025, 12, 31)
+    first = ReportService.get_session_notes_report(db, start, end, None)
+    second = ReportService.get_session_notes_report(db, start, end, None)
+
+    assert first is second
+    assert first["total_sessions"] == 1
+
+
+def test_note_write_invalidates_cached_report(db):
+    client = _add_client(db)
+    start, end = datetime.date(2025, 1, 1), datetime.date(2025, 12, 31)
+    before = ReportService.get_client_time_report(db, start, end, client.id)
+    assert before[0]["session_count"] == 0
+
+    db.add(SessionNote(client_id=client.id, session_date=datetime.date(2025, 3, 3), duration_minutes=60))
+    db.commit()
+
+    after = ReportService.get_client_time_report(db, start, end, client.id)
+    assert after[0]["session_count"] == 1
+    assert after[0]["total_hours"] == 1.0
+
+
+def test_rolled_back_write_keeps_cache(db):
+    _add_client(db)
+    generation = ReportCache.generation()
+
+    db.add(Client(first_name="Temp", last_name="Client", client_code="RC-TMP"))
+    db.flush()
+    db.rollback()
+
+    assert ReportCache.generation() == generation
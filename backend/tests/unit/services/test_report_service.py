@@ -0,0 +1,89 @@
+import datetime
+
+import pytest
+from sqlalchemy import event
+
+from backend.models.assessment_note import AssessmentNote
+from backend.models.client import Client, ClientStatus
+from backend.models.session_note import SessionNote
+from backend.services.report_cache import ReportCache
+from backend.services.report_service import ReportService
+
+START = datetime.date(2025, 1, 1)
+END = datetime.date(2025, 12, 31)
+
+
+@pytest.fixture
+def db(db):
+    ReportCache.invalidate()
+    return db
+
+
+@pytest.fixture
+def statement_counter(engine):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _record)
+
+
+def _seed(db):
+    clients = [
+        Client(first_name="Amy", last_name="Assess", client_code="C1", status=ClientStatus.ACTIVE),
+        Client(first_name="Ben", last_name="Both", client_code="C2", status=ClientStatus.ACTIVE),
+        Client(first_name="Cat", last_name="Empty", client_code="C3", status=ClientStatus.ARCHIVED),
+        Client(first_name="Dan", last_name="Waiting", client_code="C4", status=ClientStatus.WAITING_LIST),
+        Client(first_name="Eve", last_name="Assess", client_code="C5", status=ClientStatus.ACTIVE),
+    ]
+    db.add_all(clients)
+    db.flush()
+    amy, ben, _, dan, eve = clients
+    db.add_all([
+        AssessmentNote(client_id=amy.id, assessment_date=datetime.date(2025, 2, 1), duration_minutes=90, is_paid=True),
+        AssessmentNote(client_id=eve.id, assessment_date=datetime.date(2025, 2, 2), duration_minutes=60, is_paid=False),
+        SessionNote(client_id=ben.id, session_date=datetime.date(2025, 3, 1), duration_minutes=50, is_paid=True),
+        SessionNote(client_id=ben.id, session_date=datetime.date(2025, 3, 8), duration_minutes=50, is_paid=False),
+        SessionNote(client_id=ben.id, session_date=datetime.date(2024, 3, 8), duration_minutes=50, is_paid=False),
+        AssessmentNote(client_id=ben.id, assessment_date=datetime.date(2025, 1, 5), duration_minutes=80, is_paid=False),
+        SessionNote(client_id=dan.id, session_date=datetime.date(2025, 4, 1), duration_minutes=50),
+    ])
+    db.commit()
+    return clients
+
+
+def test_client_time_report_merges_sessions_and_assessments(db):
+    _seed(db)
+
+    report = ReportService.get_client_time_report(db, START, END, None)
+
+    assert [row["client_name"] for row in report] == ["Amy Assess", "Ben Both", "Cat Empty", "Eve Assess"]
+    by_name = {row["client_name"]: row for row in report}
+    assert by_name["Amy Assess"]["total_hours"] == 1.5
+    assert by_name["Amy Assess"]["paid_sessions"] == 1
+    assert by_name["Ben Both"]["session_count"] == 3
+    assert by_name["Ben Both"]["total_hours"] == 3.0
+    assert by_name["Ben Both"]["unpaid_sessions"] == 2
+    assert by_name["Cat Empty"]["session_count"] == 0
+
+
+def test_client_time_report_single_client_filters(db):
+    amy, _, cat, dan, _ = _seed(db)
+
+    assert ReportService.get_client_time_report(db, START, END, dan.id) == []
+    assert ReportService.get_client_time_report(db, START, END, 9999) == []
+    assert ReportService.get_client_time_report(db, START, END, cat.id)[0]["session_count"] == 0
+    assert ReportService.get_client_time_report(db, START, END, amy.id)[0]["session_count"] == 1
+
+
+def test_client_time_report_uses_a_single_statement(db, statement_counter):
+    _seed(db)
+    db.expire_all()
+    statement_counter.clear()
+
+    ReportService.get_client_time_report(db, START, END, None)
+
+    assert len(statement_counter) == 1
@@ -2,13 +2,19 @@ let quill;
 let personalNotesQuill;
 let currentClientId = null;
 let currentNoteId = null;
+// Version of the open note, sent as If-Match so overlapping saves are detected.
+let currentNoteVersion = null;
 let currentNoteType = "session";
+let noteLoadToken = 0;
 let currentClientDetails = null;
 let allClients = [];
 let isNoteDirty = false;
 let isNewNote = false;
 let isLoadingNote = false;
 let lastClientFilter = "active";
+const CLIENT_SEARCH_DEBOUNCE_MS = 250;
+let clientSearchTimerId = null;
+let clientSearchToken = 0;
 let isPersonalNotesExpanded = false;
 let isCalendarMode = false;
 let calendarView = "week";
@@ -203,13 +209,10 @@ window.addEventListener("load", () => {
   document.getElementById("therapist-details-cancel")?.addEventListener("click", closeTherapistDetailsModal);
   document.getElementById("therapist-details-form")?.addEventListener("submit", submitTherapistDetails);
 
-  document.getElementById("client-search").addEventListener("input", (e) => {
-    const term = e.target.value.toLowerCase();
-    // Filter only clients (CPD is excluded from search and always appears at bottom)
-    const filtered = allClients.filter(c =>
-      c.full_name.toLowerCase().includes(term)
-    );
-    renderClientList(filtered);
+  document.getElementById("client-search").addEventListener("input", () => {
+    // Search only clients (CPD is excluded from search and always appears at bottom)
+    clearTimeout(clientSearchTimerId);
+    clientSearchTimerId = setTimeout(applyClientSearch, CLIENT_SEARCH_DEBOUNCE_MS);
   });
 
   document.getElementById("toggle-archive-btn")?.addEventListener("click", toggleArchiveStatus);
@@ -294,7 +297,26 @@ function resolveClientTherapyModality(clientId) {
 async function fetchClients(filter = "active") {
   const res = await fetch(`/api/clients/?filter=${filter}`);
   allClients = await res.json();
-  renderClientList(allClients);
+  await applyClientSearch();
+}
+
+async function applyClientSearch() {
+  const token = ++clientSearchToken;
+  const term = (document.getElementById("client-search")?.value || "").trim();
+  if (!term) {
+    renderClientList(allClients);
+    return;
+  }
+  const filter = document.getElementById("client-filter")?.value || "active";
+  const res = await fetch(`/api/clients/search?q=${encodeURIComponent(term)}&filter=${filter}`);
+  if (token !== clientSearchToken) return;
+  if (!res.ok) {
+    console.error("Client search failed:", res.status);
+    return;
+  }
+  const clients = await res.json();
+  if (token !== clientSearchToken) return;
+  renderClientList(clients);
 }
 
 function clearClientSelectionUI() {
@@ -419,6 +441,7 @@ function clearEditorPane() {
 
   // Reset note tracking variables
   currentNoteId = null;
+  currentNoteVersion = null;
   currentNoteType = "session";
   resetNoteState();
   
@@ -432,6 +455,7 @@ function clearEditorPane() {
 function clearSelectionAfterFilterChange() {
   currentClientId = null;
   currentNoteId = null;
+  currentNoteVersion = null;
   currentNoteType = "session";
   document.getElementById("client-name-header").textContent = "Select a client";
   const addNoteButton = document.getElementById("add-note");
@@ -513,23 +537,21 @@ async function selectSupervision() {
   syncClientPaneSelection();
 }
 
-async function fetchNotesForClient(clientId) {
+// Client switching costs one request: the overview carries note summaries
+// (without bodies) and totals. loadNote fetches a note's body when it is opened.
+async function fetchClientOverview(clientId) {
   const list = document.getElementById("note-list");
   list.innerHTML = "";
 
-  const [sessionsRes, assessmentsRes] = await Promise.all([
-    fetch(`/api/sessions/client/${clientId}`),
-    fetch(`/api/assessments/client/${clientId}`)
-  ]);
-
-  const [sessions, assessments] = await Promise.all([
-    sessionsRes.json(),
-    assessmentsRes.json()
-  ]);
+  const res = await fetch(`/api/clients/${clientId}/overview`);
+  if (!res.ok) {
+    throw new Error(`Client overview fetch failed: ${res.status}`);
+  }
+  const overview = await res.json();
 
   const combinedNotes = [
-    ...assessments.map(note => ({ type: "assessment", note })),
-    ...sessions.map(note => ({ type: "session", note }))
+    ...overview.assessment_notes.map(note => ({ type: "assessment", note })),
+    ...overview.session_notes.map(note => ({ type: "session", note }))
   ].sort((a, b) => compareNotesByOrder(a, b));
 
   combinedNotes.forEach(({ type, note }) => {
@@ -563,11 +585,36 @@ async function fetchNotesForClient(clientId) {
     });
     list.appendChild(card);
   });
-  
-  return combinedNotes.map(item => item.note);
+
+  return overview;
+}
+
+async function fetchNoteDetail(type, noteId) {
+  const base = type === "assessment" ? "/api/assessments" : "/api/sessions";
+  const res = await fetch(`${base}/${noteId}`);
+  if (!res.ok) {
+    throw new Error(`Note fetch failed: ${res.status}`);
+  }
+  return res.json();
 }
 
 async function loadNote(type, note, options = {}) {
+  const loadToken = ++noteLoadToken;
+  if (["session", "assessment"].includes(type) && !("content" in note)) {
+    // Overview summaries omit the note body; fetch the full note on open.
+    try {
+      note = await fetchNoteDetail(type, note.id);
+    } catch (error) {
+      console.error("Error loading note:", error);
+      showError("Failed to load note");
+      return;
+    }
+    if (loadToken !== noteLoadToken) {
+      // Another note was opened while this one was loading.
+      return;
+    }
+  }
+
   if (isCalendarMode) {
     // Selecting a note should always return Pane 3 to note mode.
     setCalendarMode(false);
@@ -591,6 +638,7 @@ async function loadNote(type, note, options = {}) {
 
   setLoadingNote(true);
   currentNoteId = note.id;
+  currentNoteVersion = note.version ?? null;
   currentNoteType = type;
   resetNoteState({ isNew: Boolean(options.isNew) });
   
@@ -728,21 +776,26 @@ async function generateInvoiceForCurrentNote() {
 
   try {
     const res = await fetch(endpoint, { method: "POST" });
-    const data = await res.json().catch(() => ({}));
+    let data = await res.json().catch(() => ({}));
     if (!res.ok) {
       showError(data.detail || "Failed to generate invoice.");
       return;
     }
 
+    data = await waitForInvoicePdf(data);
+    if (data.status !== "ready") {
+      showError(data.detail || data.render_error || "Failed to generate invoice PDF.");
+      return;
+    }
+
     const pdfUrl = data.pdf_url || (data.id ? `/api/invoices/${data.id}/pdf` : null);
     if (!pdfUrl) {
       showError("Invoice was created, but PDF preview URL is unavailable.");
       return;
     }
 
-    const previewUrlObj = new URL(pdfUrl, window.location.origin);
-    previewUrlObj.searchParams.set("ts", String(Date.now()));
-    const previewUrl = previewUrlObj.href;
+    // pdf_url is versioned by content, so a changed invoice never hits a stale cached copy.
+    const previewUrl = new URL(pdfUrl, window.location.origin).href;
     const isElectronRuntime = /Electron/i.test(navigator.userAgent || "");
 
     if (isElectronRuntime) {
@@ -761,6 +814,20 @@ async function generateInvoiceForCurrentNote() {
   }
 }
 
+// PDFs render in the background; long-poll the invoice until it leaves "pending".
+async function waitForInvoicePdf(invoice, maxPolls = 30) {
+  let current = invoice;
+  for (let poll = 0; current.status === "pending" && poll < maxPolls; poll++) {
+    const res = await fetch(`/api/invoices/${current.id}?wait=10`);
+    const data = await res.json().catch(() => ({}));
+    if (!res.ok) {
+      return { status: "failed", detail: data.detail || "Failed to check invoice status." };
+    }
+    current = data;
+  }
+  return current;
+}
+
 async function submitNoteUpdate(e) {
   e.preventDefault();
   const payload = {
@@ -804,16 +871,25 @@ async function submitNoteUpdate(e) {
     }
   }  
 
+  const headers = { "Content-Type": "application/json" };
+  if (currentNoteType !== "cpd" && currentNoteVersion !== null) {
+    headers["If-Match"] = `"${currentNoteVersion}"`;
+  }
   const res = await fetch(urlMap[currentNoteType], {
     method: "PUT",
-    headers: { "Content-Type": "application/json" },
+    headers,
     body: JSON.stringify(payload)
   });
   
   const data = await res.json();
   console.log("Save response:", res.status, data);
   
+  if (res.status === 409) {
+    showError("This note was changed elsewhere since you opened it. Reopen it to see the latest version before saving.");
+    return;
+  }
   if (res.status === 200) {
+    if (data.version !== undefined) currentNoteVersion = data.version;
     document.getElementById("save-status").textContent = "Saved";
     setTimeout(() => document.getElementById("save-status").textContent = "", 2000);
     resetNoteState({ isNew: false });
@@ -1572,25 +1648,6 @@ async function deleteClient() {
   }
 }
 
-async function fetchClientTotals(clientId) {
-  try {
-    const response = await fetch(`/api/reports/client/${clientId}/totals`);
-    if (!response.ok) {
-      throw new Error('Failed to fetch client totals');
-    }
-    const data = await response.json();
-    return data;
-  } catch (error) {
-    console.error('Error fetching client totals:', error);
-    return { 
-      session_total: 0, 
-      supervision_total: 0,
-      session_count: 0,
-      supervision_count: 0
-    };
-  }
-}
-
 function updateClientTotalsDisplay(totals) {
   const summaryDiv = document.getElementById('client-totals-summary');
   const sessionTotal = document.getElementById('client-session-total');
@@ -1609,12 +1666,8 @@ function updateClientTotalsDisplay(totals) {
 
 async function loadNotes(clientId) {
   try {
-    const [notes, totals] = await Promise.all([
-      fetchNotesForClient(clientId),
-      fetchClientTotals(clientId)
-    ]);
-    
-    updateClientTotalsDisplay(totals);
+    const overview = await fetchClientOverview(clientId);
+    updateClientTotalsDisplay(overview.totals);
   } catch (error) {
     console.error('Error loading notes:', error);
     showError('Failed to load notes');